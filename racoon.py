@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Kommandozeile
+Wrapper für src/racoon_cli.py (ohne Installation: python racoon.py status)
+"""
+
+import sys
+from pathlib import Path
+
+# Füge src-Verzeichnis zu Python Path hinzu
+src_path = Path(__file__).parent / 'src'
+sys.path.insert(0, str(src_path))
+
+# Importiere und starte das Tool
+from racoon_cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
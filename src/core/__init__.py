@@ -1,4 +1,4 @@
-# Core Module für pyRacoonConfluence
-"""
-Kern-Module für RACOON Confluence Integration
+# Core Module für pyRacoonConfluence
+"""
+Kern-Module für RACOON Confluence Integration
 """
\ No newline at end of file
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Speicherschonende Seiten-Bodies
+Der Body liegt genau einmal UTF-8-kodiert in einer per mmap eingeblendeten Temp-Datei;
+Parser und Zeilenmodell arbeiten auf Byte-Offsets, Änderungen entstehen als Folge von
+Abschnitten (BodyRope) und werden beim PUT direkt in den Request gestreamt
+"""
+
+import sys
+import mmap
+import codecs
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core import json_codec
+
+# Größe der Abschnitte beim Kodieren/Schreiben (begrenzt den zusätzlichen Speicher)
+CHUNK_SIZE = 1 << 20
+
+# Verzeichnis der Temp-Dateien (None = Standard-Temp-Verzeichnis)
+SPOOL_DIR = None
+
+
+def _as_bytes(chunk):
+    return chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+
+
+class BodyBuffer:
+    """
+    Storage-Body in einer gemappten Datei (nur lesend)
+
+    Offsets sind Byte-Offsets; Slices liefern dekodierten Text, sodass TableRow.raw
+    und cell_raw unverändert funktionieren. Die Temp-Datei ist schon beim Anlegen
+    gelöscht und verschwindet mit close().
+    """
+
+    def __init__(self, fileobj, size):
+        self._file = fileobj
+        self.size = size
+        # mmap der Länge 0 ist nicht erlaubt
+        self.data = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """Schreibt Text-/Byte-Abschnitte einmal in die Temp-Datei und blendet sie ein"""
+        fileobj = tempfile.TemporaryFile(dir=SPOOL_DIR)
+        size = 0
+        for chunk in chunks:
+            chunk = _as_bytes(chunk)
+            fileobj.write(chunk)
+            size += len(chunk)
+        fileobj.flush()
+        return cls(fileobj, size)
+
+    @classmethod
+    def from_text(cls, text):
+        """Body aus einem String (in CHUNK_SIZE-Stücken kodiert, ohne zweite Gesamtkopie)"""
+        return cls.from_chunks(text[i:i + CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE))
+
+    @classmethod
+    def open(cls, path):
+        """Blendet eine vorhandene Datei (z.B. ein Backup) direkt ein"""
+        fileobj = open(path, 'rb')
+        return cls(fileobj, Path(path).stat().st_size)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        """buffer[start:end] -> Text des Byte-Bereichs"""
+        if not isinstance(key, slice):
+            raise TypeError("BodyBuffer unterstützt nur Slices")
+        return str(self.data[key], 'utf-8', errors='replace')
+
+    def finditer(self, pattern):
+        """Bytes-Regex direkt auf dem Mapping"""
+        return pattern.finditer(self.data)
+
+    def segments(self):
+        """Inhalt als Folge von Byte-Abschnitten (ohne Kopie)"""
+        if self.size:
+            yield memoryview(self.data)
+
+    def text(self):
+        """Kompletter Body als String (Kopie - nur für Altpfade)"""
+        return self[0:self.size]
+
+    def write_to(self, fileobj):
+        for segment in self.segments():
+            fileobj.write(segment)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                return  # Noch Views im Umlauf - wird mit dem letzten Verweis freigegeben
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BodyRope:
+    """
+    Geänderter Body als Folge von Abschnitten
+
+    Unveränderte Teile bleiben Verweise (start, end) in den BodyBuffer, nur neuer
+    Inhalt liegt zusätzlich im Speicher. Abschnittsgrenzen liegen auf Tag-Grenzen
+    (Zeilen-Offsets aus dem Parser), daher kann der Minifier die Abschnitte
+    nacheinander verarbeiten.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.spans = []
+
+    def keep(self, start, end):
+        """Übernimmt buffer[start:end] unverändert"""
+        if end > start:
+            if self.spans and isinstance(self.spans[-1], tuple) and self.spans[-1][1] == start:
+                self.spans[-1] = (self.spans[-1][0], end)
+            else:
+                self.spans.append((start, end))
+        return self
+
+    def insert(self, text):
+        """Fügt neuen Inhalt an"""
+        if text:
+            self.spans.append(_as_bytes(text))
+        return self
+
+    @classmethod
+    def without(cls, buffer, ranges):
+        """Body ohne die Byte-Bereiche ranges [(start, end), ...]"""
+        rope = cls(buffer)
+        position = 0
+        for start, end in sorted(ranges):
+            rope.keep(position, start)
+            position = max(position, end)
+        return rope.keep(position, len(buffer))
+
+    def __len__(self):
+        return sum(span[1] - span[0] if isinstance(span, tuple) else len(span) for span in self.spans)
+
+    @property
+    def unchanged(self):
+        return self.spans == [(0, len(self.buffer))] or (not self.spans and not len(self.buffer))
+
+    def segments(self):
+        view = memoryview(self.buffer.data)
+        for span in self.spans:
+            yield view[span[0]:span[1]] if isinstance(span, tuple) else span
+
+    def text(self):
+        return ''.join(str(segment, 'utf-8', errors='replace') for segment in self.segments())
+
+    def write_to(self, fileobj):
+        for segment in self.segments():
+            fileobj.write(segment)
+
+
+def iter_text(body, chunk_size=CHUNK_SIZE):
+    """Body (str, BodyBuffer oder BodyRope) als Folge von Text-Stücken"""
+    if isinstance(body, str):
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+        return
+
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    for segment in body.segments():
+        for i in range(0, len(segment), chunk_size):
+            text = decoder.decode(segment[i:i + chunk_size])
+            if text:
+                yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+class JsonStringPayload:
+    """
+    Request-Body, dessen einziger großer Wert als JSON-String gestreamt wird
+
+    Durch __len__ setzt requests einen Content-Length-Header (kein Chunked-Encoding);
+    die Länge kostet einen zusätzlichen Escape-Durchlauf, aber keinen Speicher.
+    Wiederholt iterierbar (z.B. für einen zweiten Versuch nach 409).
+
+    Args:
+        head: JSON-Text vor dem String (bis einschließlich des Doppelpunkts)
+        body: str, BodyBuffer oder BodyRope
+        tail: JSON-Text nach dem String
+    """
+
+    def __init__(self, head, body, tail):
+        self.head = head.encode('utf-8')
+        self.body = body
+        self.tail = tail.encode('utf-8')
+        self._length = None
+
+    def _escaped(self):
+        yield b'"'
+        for text in iter_text(self.body):
+            yield json_codec.escape(text)
+        yield b'"'
+
+    def __iter__(self):
+        yield self.head
+        yield from self._escaped()
+        yield self.tail
+
+    def __len__(self):
+        if self._length is None:
+            self._length = len(self.head) + len(self.tail) + sum(len(chunk) for chunk in self._escaped())
+        return self._length
+
+    def __bytes__(self):
+        return b''.join(self)
+
+
+def write_body(body, path):
+    """Schreibt str/BodyBuffer/BodyRope in eine Datei (UTF-8)"""
+    with open(path, 'wb') as f:
+        if isinstance(body, str):
+            for text in iter_text(body):
+                f.write(text.encode('utf-8'))
+        else:
+            body.write_to(f)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sammelabruf vieler Seiten
+Statt eines get_page pro Seite liefern content/search (CQL) bzw. child/page mit
+expand=body.storage,version bis zu BULK_LIMIT Seiten pro Request; die Seiten werden
+geliefert, sobald sie eintreffen, und landen direkt im PageCache
+"""
+
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core.instrumentation import METRICS
+
+SEARCH_PATH = "rest/api/content/search"
+CHILD_PATH = "rest/api/content/{page_id}/child/page"
+
+# Confluence begrenzt Listen mit expandiertem Body serverseitig (meist auf 50)
+BULK_LIMIT = 50
+BULK_EXPAND = "body.storage,version"
+
+
+def _paginate(confluence_sso, path, params, limit):
+    """Alle Ergebnisseiten einer Listen-Abfrage (folgt _links.next)"""
+    start = 0
+    while True:
+        meta = {}
+        count = 0
+        METRICS.count('bulk_fetch.requests')
+        for page in confluence_sso.iter_results(path, dict(params, start=start, limit=limit), meta):
+            count += 1
+            METRICS.count('bulk_fetch.pages')
+            yield page
+        if not meta.get('next') or not count:
+            return
+        start += count
+
+
+def iter_search(confluence_sso, cql, expand=BULK_EXPAND, limit=BULK_LIMIT):
+    """Alle Seiten eines CQL-Selektors inkl. Body (ein Request je limit Seiten)"""
+    params = {'cql': cql}
+    if expand:
+        params['expand'] = expand
+    return _paginate(confluence_sso, SEARCH_PATH, params, limit)
+
+
+def iter_children(confluence_sso, parent_id, expand=BULK_EXPAND, limit=BULK_LIMIT):
+    """Alle direkten Unterseiten inkl. Body (ein Request je limit Seiten)"""
+    params = {'expand': expand} if expand else {}
+    return _paginate(confluence_sso, CHILD_PATH.format(page_id=parent_id), params, limit)
+
+
+def id_cql(page_ids):
+    """['1', '2'] -> 'id in (1,2)'"""
+    return f"id in ({','.join(str(page_id) for page_id in page_ids)})"
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def fetch_into_cache(page_cache, pages):
+    """Legt gestreamte Seiten im PageCache ab und liefert die CachedPage-Einträge"""
+    for page in pages:
+        yield page_cache.put(page)
+
+
+def bulk_load(page_cache, page_ids, max_age=0, limit=BULK_LIMIT):
+    """
+    Bringt viele Seiten mit wenigen Requests auf den aktuellen Stand
+
+    Gecachte Einträge werden gesammelt per Versions-Abfrage (expand=version, ohne Body)
+    geprüft; fehlende und geänderte Seiten kommen gesammelt per CQL id in (...).
+    Seiten, die die Suche nicht liefert (gelöscht, keine Rechte), fehlen im Ergebnis -
+    der Einzelabruf meldet dann den Fehler.
+
+    Args:
+        page_cache: PageCache der Session
+        page_ids: Seiten-IDs
+        max_age: Sekunden, in denen ein Cache-Eintrag ohne Prüfung gilt
+        limit: Seiten pro Request
+
+    Returns:
+        Dict Seiten-ID -> CachedPage
+    """
+    confluence_sso = page_cache.confluence_sso
+    loaded = {}
+    stale = []
+    missing = []
+
+    for page_id in (str(page_id) for page_id in page_ids):
+        cached = page_cache.peek(page_id)
+        if cached is None:
+            missing.append(page_id)
+        elif cached.age <= max_age:
+            METRICS.count('page_cache.hits')
+            loaded[page_id] = cached
+        else:
+            stale.append(page_id)
+
+    for chunk in _chunks(stale, limit):
+        versions = {page['id']: page['version']['number']
+                    for page in iter_search(confluence_sso, id_cql(chunk), expand='version', limit=limit)}
+        for page_id in chunk:
+            cached = page_cache.peek(page_id)
+            if cached is not None and versions.get(page_id) == cached.version:
+                cached.fetched = time.time()
+                METRICS.count('page_cache.hits')
+                loaded[page_id] = cached
+            elif page_id in versions:
+                missing.append(page_id)
+
+    for chunk in _chunks(missing, limit):
+        for cached in fetch_into_cache(page_cache, iter_search(confluence_sso, id_cql(chunk), limit=limit)):
+            METRICS.count('page_cache.fetches')
+            loaded[cached.page_id] = cached
+
+    return loaded
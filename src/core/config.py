@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zentrale Konfiguration für RACOON Confluence Tools
+Werte lassen sich per Umgebungsvariable überschreiben (z.B. für den lokalen Fake-Server)
+"""
+
+import os
+
+# Confluence-Instanz (RACOON_CONFLUENCE_URL=http://127.0.0.1:8090/ für den Fake-Server)
+CONFLUENCE_URL = os.environ.get('RACOON_CONFLUENCE_URL', "https://wms.diz-ag.med.ovgu.de/")
+
+# RACOON Publikationen Seite
+PAGE_ID = os.environ.get('RACOON_PAGE_ID', "165485055")
+PAGE_TITLE = "RACOON Publikationen"
+
+# NCBI E-utilities (RACOON_EUTILS_URL=http://127.0.0.1:8091/entrez/eutils/ für den Fake-Server)
+EUTILS_URL = os.environ.get('RACOON_EUTILS_URL', "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/")
+
+# Mit API-Key erlaubt NCBI 10 statt 3 Requests pro Sekunde
+NCBI_API_KEY = os.environ.get('NCBI_API_KEY')
+
+# Seitenmenge für alle Tools: kommagetrennte IDs (RACOON_PAGE_IDS=165485055,170000001)
+# oder ein CQL-Selektor (RACOON_PAGE_CQL='type = page AND title ~ "Publikationen"')
+PAGE_IDS = [p.strip() for p in os.environ.get('RACOON_PAGE_IDS', PAGE_ID).split(',') if p.strip()]
+PAGE_CQL = os.environ.get('RACOON_PAGE_CQL')
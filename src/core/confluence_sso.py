@@ -1,192 +1,414 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-Confluence SSO Session Authentifizierung
-Verwendet Browser-ähnliche Session-basierte Anmeldung
-"""
-
-import sys
-import requests
-import json
-from pathlib import Path
-from urllib.parse import urljoin, urlparse, parse_qs
-from datetime import datetime
-import re
-
-class ConfluenceSSO:
-    def __init__(self, base_url):
-        self.base_url = base_url.rstrip('/') + '/'
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-    
-    def manual_login_instructions(self):
-        """Anweisungen für manuellen Login"""
-        print("🔐 SSO-Authentifizierung erforderlich!")
-        print("=" * 50)
-        print("Da Ihr Confluence SSO verwendet, müssen Sie sich manuell anmelden:")
-        print()
-        print("1. Öffnen Sie Ihren Browser")
-        print("2. Gehen Sie zu: https://wms.diz-ag.med.ovgu.de")
-        print("3. Loggen Sie sich ein über:")
-        print("   - OpenID SSO OVGU und externe User")
-        print("   - MII-MIRACUM Standortnutzer") 
-        print("   - MIRACUM Universitätsklinikum Erlangen")
-        print("   - Datenintegrationszentrum (DIZ)")
-        print("   - lacknens + Passwort")
-        print()
-        print("4. Nach erfolgreichem Login öffnen Sie die Entwicklertools (F12)")
-        print("5. Gehen Sie zum 'Network' Tab")
-        print("6. Besuchen Sie: https://wms.diz-ag.med.ovgu.de/rest/api/space")
-        print("7. Kopieren Sie die 'Cookie' Header aus dem Request")
-        print()
-        print("Der Cookie-Header sieht etwa so aus:")
-        print("Cookie: JSESSIONID=ABC123...; seraph.confluence=XYZ789...")
-        print()
-        return input("Geben Sie den vollständigen Cookie-Header ein: ").strip()
-    
-    def login_with_cookies(self, cookie_header):
-        """Login mit Browser-Cookies"""
-        try:
-            # Parse Cookie-Header
-            cookies = {}
-            if cookie_header.startswith('Cookie: '):
-                cookie_header = cookie_header[8:]  # Entferne "Cookie: "
-            
-            # Parse Cookies
-            for cookie in cookie_header.split(';'):
-                if '=' in cookie:
-                    name, value = cookie.strip().split('=', 1)
-                    cookies[name] = value
-            
-            # Setze Cookies in Session
-            for name, value in cookies.items():
-                self.session.cookies.set(name, value)
-            
-            print(f"🔑 Cookies gesetzt: {list(cookies.keys())}")
-            
-            # Teste API-Zugriff
-            response = self.session.get(f"{self.base_url}rest/api/space")
-            
-            if response.status_code == 200:
-                print("✅ SSO-Login erfolgreich!")
-                return True
-            else:
-                print(f"❌ API-Test fehlgeschlagen: {response.status_code}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Fehler beim Cookie-Login: {e}")
-            return False
-    
-    def get_spaces(self):
-        """Hole alle Spaces"""
-        response = self.session.get(f"{self.base_url}rest/api/space")
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"API Error: {response.status_code}")
-    
-    def get_page(self, page_id, expand=None):
-        """Hole eine spezifische Seite"""
-        url = f"{self.base_url}rest/api/content/{page_id}"
-        if expand:
-            url += f"?expand={expand}"
-        
-        response = self.session.get(url)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Page API Error: {response.status_code} - {response.text}")
-    
-    def update_page(self, page_id, title, content, version):
-        """Aktualisiere eine Seite"""
-        url = f"{self.base_url}rest/api/content/{page_id}"
-        
-        data = {
-            "version": {"number": version + 1},
-            "title": title,
-            "type": "page",
-            "body": {
-                "storage": {
-                    "value": content,
-                    "representation": "storage"
-                }
-            }
-        }
-        
-        response = self.session.put(
-            url,
-            json=data,
-            headers={"Content-Type": "application/json"}
-        )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Update Error: {response.status_code} - {response.text}")
-    
-    def create_backup(self, content, prefix="confluence_backup"):
-        """Erstellt ein zeitgestempeltes Backup im backups/ Ordner"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_dir = Path("backups")
-        backup_dir.mkdir(exist_ok=True)
-        
-        backup_file = backup_dir / f"{prefix}_{timestamp}.html"
-        
-        with open(backup_file, "w", encoding="utf-8") as f:
-            f.write(content)
-        
-        print(f"💾 Backup gespeichert: {backup_file}")
-        return backup_file
-
-def main():
-    """Hauptfunktion für SSO-basierte Confluence-Nutzung"""
-    print("=== Confluence SSO Session Manager ===")
-    
-    confluence_sso = ConfluenceSSO("https://wms.diz-ag.med.ovgu.de/")
-    
-    if len(sys.argv) > 1 and sys.argv[1] == "--manual-login":
-        # Manueller Login mit Browser-Cookies
-        cookie_header = confluence_sso.manual_login_instructions()
-        
-        if cookie_header:
-            if confluence_sso.login_with_cookies(cookie_header):
-                print("\n📊 Teste API-Zugriff...")
-                
-                try:
-                    spaces = confluence_sso.get_spaces()
-                    print(f"✅ Erfolgreich! {len(spaces.get('results', []))} Spaces gefunden")
-                    
-                    # Teste RACOON Publikationsseite
-                    print(f"\n🎯 Teste RACOON Publikationsseite (ID: 165485055)...")
-                    try:
-                        page = confluence_sso.get_page("165485055", "body.storage,version")
-                        print(f"✅ Seite geladen: {page['title']}")
-                        print(f"Version: {page['version']['number']}")
-                        print(f"Content-Länge: {len(page['body']['storage']['value'])} Zeichen")
-                        
-                        # Backup erstellen
-                        confluence_sso.create_backup(page['body']['storage']['value'], "racoon_publications_sso")
-                        
-                    except Exception as e:
-                        print(f"❌ Seiten-Zugriff fehlgeschlagen: {e}")
-                        
-                except Exception as e:
-                    print(f"❌ API-Zugriff fehlgeschlagen: {e}")
-            else:
-                print("❌ Cookie-basierter Login fehlgeschlagen")
-        else:
-            print("❌ Kein Cookie-Header eingegeben")
-    
-    else:
-        print("📋 Verfügbare Optionen:")
-        print("  python confluence_sso.py --manual-login")
-        print()
-        print("💡 Hinweis: Da Ihr Confluence SSO verwendet, können Sie nicht")
-        print("   direkt mit Username/Passwort auf die API zugreifen.")
-        print("   Verwenden Sie --manual-login für Cookie-basierte Authentifizierung.")
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Confluence SSO Session Authentifizierung
+Verwendet Browser-ähnliche Session-basierte Anmeldung
+"""
+
+import sys
+import requests
+import json
+from urllib3.util import make_headers
+from pathlib import Path
+from urllib.parse import urljoin, urlparse, parse_qs
+from datetime import datetime
+import re
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import CONFLUENCE_URL, PAGE_ID
+from core.instrumentation import METRICS, instrument_session
+from core.body_buffer import BodyBuffer, JsonStringPayload, write_body
+from core import json_codec
+from core.session_store import (
+    SessionStore, SessionExpired, PROBE_PATH, load_saved_cookies, parse_cookie_header, is_login_response
+)
+
+# Komprimierte Antworten, die urllib3 entpacken kann (br nur mit installiertem brotli)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+# Antwort-Header, die als Validatoren für bedingte GETs gemerkt werden -> Request-Header
+VALIDATOR_HEADERS = {'ETag': 'If-None-Match', 'Last-Modified': 'If-Modified-Since'}
+
+class ConfluenceSSO:
+    def __init__(self, base_url, session_store=None):
+        self.base_url = base_url.rstrip('/') + '/'
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': ACCEPT_ENCODING
+        })
+        instrument_session(self.session, 'confluence')
+        
+        # Persistente Session (None = Standard-Datei config/.confluence_session.json)
+        self.session_store = session_store or SessionStore()
+        self._validating = False
+        self.session.hooks['response'].append(self._check_session)
+    
+    def _check_session(self, response, *args, **kwargs):
+        """Response-Hook: abgelaufene Session mitten im Lauf erkennen (401/Login-Redirect)"""
+        if not self._validating and is_login_response(response):
+            METRICS.count('confluence.session_expired')
+            self.session_store.invalidate()
+            raise SessionExpired(
+                f"Confluence-Session abgelaufen ({response.status_code}) - bitte neue Cookies eintragen"
+            )
+        return response
+    
+    def manual_login_instructions(self):
+        """Anweisungen für manuellen Login"""
+        print("🔐 SSO-Authentifizierung erforderlich!")
+        print("=" * 50)
+        print("Da Ihr Confluence SSO verwendet, müssen Sie sich manuell anmelden:")
+        print()
+        print("1. Öffnen Sie Ihren Browser")
+        print("2. Gehen Sie zu: https://wms.diz-ag.med.ovgu.de")
+        print("3. Loggen Sie sich ein über:")
+        print("   - OpenID SSO OVGU und externe User")
+        print("   - MII-MIRACUM Standortnutzer") 
+        print("   - MIRACUM Universitätsklinikum Erlangen")
+        print("   - Datenintegrationszentrum (DIZ)")
+        print("   - lacknens + Passwort")
+        print()
+        print("4. Nach erfolgreichem Login öffnen Sie die Entwicklertools (F12)")
+        print("5. Gehen Sie zum 'Network' Tab")
+        print("6. Besuchen Sie: https://wms.diz-ag.med.ovgu.de/rest/api/space")
+        print("7. Kopieren Sie die 'Cookie' Header aus dem Request")
+        print()
+        print("Der Cookie-Header sieht etwa so aus:")
+        print("Cookie: JSESSIONID=ABC123...; seraph.confluence=XYZ789...")
+        print()
+        return input("Geben Sie den vollständigen Cookie-Header ein: ").strip()
+    
+    def validate_session(self):
+        """
+        Prüft die Cookies mit dem günstigsten Endpunkt (aktueller Benutzer statt Space-Liste)
+        
+        Returns:
+            True bei angemeldetem Benutzer
+        """
+        self._validating = True
+        try:
+            METRICS.count('confluence.session_probes')
+            response = self.session.get(f"{self.base_url}{PROBE_PATH}", allow_redirects=False)
+            if response.status_code == 404:
+                # Ältere Instanzen ohne user/current
+                response = self.session.get(f"{self.base_url}rest/api/space?limit=1", allow_redirects=False)
+                return response.status_code == 200
+            if response.status_code != 200 or is_login_response(response):
+                return False
+            return response.json().get('type') != 'anonymous'
+        except ValueError:
+            return False
+        finally:
+            self._validating = False
+    
+    def login_with_cookies(self, cookie_header):
+        """Login mit Browser-Cookies"""
+        try:
+            cookies = parse_cookie_header(cookie_header)
+            
+            # Setze Cookies in Session
+            for name, value in cookies.items():
+                self.session.cookies.set(name, value)
+            
+            print(f"🔑 Cookies gesetzt: {list(cookies.keys())}")
+            
+            # Teste API-Zugriff
+            if self.validate_session():
+                print("✅ SSO-Login erfolgreich!")
+                self.session_store.save(self.session, self.base_url)
+                return True
+            else:
+                print("❌ API-Test fehlgeschlagen: Cookies ungültig oder abgelaufen")
+                return False
+                
+        except Exception as e:
+            print(f"❌ Fehler beim Cookie-Login: {e}")
+            return False
+    
+    def login(self, interactive=True):
+        """
+        Anmeldung mit möglichst wenig Requests
+        
+        1. Gespeicherte Session, deren letzte Prüfung frisch ist: kein Request
+        2. Gespeicherte, ältere Session: ein Prüf-Request
+        3. Cookies aus confluence_credentials.json (config/ vor ./)
+        4. Interaktiv: Cookie-Header abfragen
+        
+        Returns:
+            True bei gültiger Session
+        """
+        state = self.session_store.load(self.base_url)
+        if state:
+            self.session_store.apply(state, self.session)
+            if self.session_store.is_fresh(state):
+                METRICS.count('confluence.session_reused')
+                print("✅ Gespeicherte Session verwendet")
+                return True
+            if self.validate_session():
+                self.session_store.save(self.session, self.base_url)
+                print("✅ Gespeicherte Session gültig")
+                return True
+            self.session.cookies.clear()
+        
+        cookie_header = load_saved_cookies()
+        if cookie_header and self.login_with_cookies(cookie_header):
+            return True
+        
+        if not interactive:
+            print("❌ Keine gültigen Cookies (config/confluence_credentials.json)")
+            return False
+        
+        cookie_header = input("🔑 Cookies eingeben: ").strip()
+        return bool(cookie_header) and self.login_with_cookies(cookie_header)
+    
+    def get_spaces(self):
+        """Hole alle Spaces"""
+        response = self.session.get(f"{self.base_url}rest/api/space")
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(f"API Error: {response.status_code}")
+    
+    def get_page(self, page_id, expand=None):
+        """Hole eine spezifische Seite"""
+        url = f"{self.base_url}rest/api/content/{page_id}"
+        if expand:
+            url += f"?expand={expand}"
+        
+        response = self.session.get(url)
+        if response.status_code == 200:
+            page = json_codec.loads(response.content)
+            if 'body' in page:
+                METRICS.gauge('confluence.page_size', len(page['body']['storage']['value']), page_id=str(page_id))
+            return page
+        else:
+            raise Exception(f"Page API Error: {response.status_code} - {response.text}")
+
+    def _get_storage_response(self, page_id, validators=None):
+        """Gestreamter GET mit expand=body.storage,version (None bei 304 Not Modified)"""
+        headers = {}
+        for name, value in (validators or {}).items():
+            headers[VALIDATOR_HEADERS[name]] = value
+        # Ein ETag hat Vorrang; If-Modified-Since nur, wenn es keinen gibt (Sekunden-Auflösung)
+        if 'If-None-Match' in headers:
+            headers.pop('If-Modified-Since', None)
+
+        response = self.session.get(
+            f"{self.base_url}rest/api/content/{page_id}",
+            params={'expand': 'body.storage,version'},
+            headers=headers,
+            stream=True
+        )
+        if response.status_code == 304:
+            METRICS.count('confluence.not_modified', page_id=str(page_id))
+            response.close()
+            return None
+        if response.status_code != 200:
+            raise Exception(f"Page API Error: {response.status_code} - {response.text}")
+        return response
+
+    def get_page_storage(self, page_id, validators=None):
+        """
+        Nur id, title, version.number, body.storage.value und _links.webui einer Seite
+
+        Die Antwort wird gestreamt und nur auf diese Felder dekodiert (mit ijson ohne
+        vollständigen JSON-Baum); Struktur wie bei get_page(page_id, "body.storage,version").
+        
+        Args:
+            page_id: Seiten-ID
+            validators: Validatoren einer früheren Antwort ({'ETag': ..., 'Last-Modified': ...})
+                        -> bedingter GET
+        
+        Returns:
+            Seite (mit '_validators', falls die Instanz ETag/Last-Modified liefert)
+            oder None bei 304 Not Modified
+        """
+        response = self._get_storage_response(page_id, validators)
+        if response is None:
+            return None
+
+        received = {name: response.headers[name] for name in VALIDATOR_HEADERS if name in response.headers}
+        page = json_codec.extract_page(response)
+        if received:
+            page['_validators'] = received
+        METRICS.gauge('confluence.page_size', len(page['body']['storage']['value']), page_id=str(page_id))
+        return page
+
+    def get_page_body(self, page_id):
+        """
+        Seite mit dem Body als BodyBuffer statt als String
+
+        Der Body wird beim Eintreffen dekodiert und stückweise in die Temp-Datei des
+        Buffers geschrieben - er liegt zu keinem Zeitpunkt als kompletter String vor.
+
+        Returns:
+            (page ohne body.storage.value, BodyBuffer) - der Buffer muss geschlossen werden
+        """
+        response = self._get_storage_response(page_id)
+        page, body = json_codec.extract_page_body(response, BodyBuffer.from_chunks)
+        METRICS.gauge('confluence.page_size', len(body), page_id=str(page_id))
+        return page, body
+
+    def search_content(self, cql, expand=None, start=0, limit=25):
+        """CQL-Suche (eine Ergebnisseite: results, start, limit, size, _links)"""
+        params = {'cql': cql, 'start': start, 'limit': limit}
+        if expand:
+            params['expand'] = expand
+
+        response = self.session.get(f"{self.base_url}rest/api/content/search", params=params)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(f"Search API Error: {response.status_code} - {response.text}")
+
+    def iter_results(self, path, params, meta=None):
+        """
+        Einträge einer Listen-Antwort (z.B. rest/api/content/search), während sie eintreffen
+
+        Args:
+            path: Pfad relativ zur Basis-URL
+            params: Query-Parameter (cql, expand, start, limit, ...)
+            meta: Optionales Dict für 'next' und 'size' der Antwort
+
+        Yields:
+            Einträge reduziert auf id, title, version.number, body.storage.value, _links.webui
+        """
+        response = self.session.get(f"{self.base_url}{path}", params=params, stream=True)
+        if response.status_code != 200:
+            raise Exception(f"List API Error: {response.status_code} - {response.text}")
+        yield from json_codec.iter_results(response, meta)
+
+    def get_child_pages(self, page_id, expand=None, start=0, limit=25):
+        """Direkte Unterseiten (eine Ergebnisseite: results, start, limit, size, _links)"""
+        params = {'start': start, 'limit': limit}
+        if expand:
+            params['expand'] = expand
+
+        response = self.session.get(f"{self.base_url}rest/api/content/{page_id}/child/page", params=params)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(f"Child API Error: {response.status_code} - {response.text}")
+
+    def create_page(self, space_key, title, content, parent_id=None):
+        """Legt eine neue Seite an (optional als Unterseite von parent_id)"""
+        data = {
+            "type": "page",
+            "title": title,
+            "space": {"key": space_key},
+            "body": {
+                "storage": {
+                    "value": content,
+                    "representation": "storage"
+                }
+            }
+        }
+        if parent_id:
+            data["ancestors"] = [{"id": str(parent_id)}]
+
+        response = self.session.post(
+            f"{self.base_url}rest/api/content",
+            json=data,
+            headers={"Content-Type": "application/json"}
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(f"Create Error: {response.status_code} - {response.text}")
+
+    def update_page(self, page_id, title, content, version):
+        """Aktualisiere eine Seite (Payload wird gestreamt, siehe update_page_stream)"""
+        return self.update_page_stream(page_id, title, content, version)
+
+    def update_page_stream(self, page_id, title, body, version):
+        """
+        Wie update_page, aber der Body (str, BodyBuffer oder BodyRope) wird direkt
+        in den Request gestreamt - ohne JSON-Payload als zweite Kopie im Speicher
+
+        Returns:
+            Antwort reduziert auf id, title, version.number und _links.webui
+        """
+        url = f"{self.base_url}rest/api/content/{page_id}"
+        head = (f'{{"version": {{"number": {version + 1}}}, "title": {json_codec.dumps(title).decode("utf-8")}, '
+                f'"type": "page", "body": {{"storage": {{"representation": "storage", "value": ')
+        payload = JsonStringPayload(head, body, '}}}')
+
+        response = self.session.put(
+            url,
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            stream=True
+        )
+
+        if response.status_code == 200:
+            # Confluence schickt den neuen Body mit - nur Version, Titel und Links übernehmen
+            return json_codec.extract_page(response, json_codec.UPDATE_FIELDS)
+        else:
+            if response.status_code == 409:
+                METRICS.count('confluence.conflicts', page_id=str(page_id))
+            raise Exception(f"Update Error: {response.status_code} - {response.text}")
+
+    def create_backup(self, content, prefix="confluence_backup", backup_dir="backups"):
+        """Erstellt ein zeitgestempeltes Backup im backups/ Ordner (oder backup_dir); content auch als BodyBuffer/BodyRope"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_dir = Path(backup_dir)
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        
+        backup_file = backup_dir / f"{prefix}_{timestamp}.html"
+        
+        # Binär geschrieben: Bytes wie von Confluence geliefert (keine Zeilenende-Umwandlung)
+        write_body(content, backup_file)
+        
+        print(f"💾 Backup gespeichert: {backup_file}")
+        return backup_file
+
+def main():
+    """Hauptfunktion für SSO-basierte Confluence-Nutzung"""
+    print("=== Confluence SSO Session Manager ===")
+    
+    confluence_sso = ConfluenceSSO(CONFLUENCE_URL)
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "--manual-login":
+        # Manueller Login mit Browser-Cookies
+        cookie_header = confluence_sso.manual_login_instructions()
+        
+        if cookie_header:
+            if confluence_sso.login_with_cookies(cookie_header):
+                print("\n📊 Teste API-Zugriff...")
+                
+                try:
+                    spaces = confluence_sso.get_spaces()
+                    print(f"✅ Erfolgreich! {len(spaces.get('results', []))} Spaces gefunden")
+                    
+                    # Teste RACOON Publikationsseite
+                    print(f"\n🎯 Teste RACOON Publikationsseite (ID: {PAGE_ID})...")
+                    try:
+                        page = confluence_sso.get_page(PAGE_ID, "body.storage,version")
+                        print(f"✅ Seite geladen: {page['title']}")
+                        print(f"Version: {page['version']['number']}")
+                        print(f"Content-Länge: {len(page['body']['storage']['value'])} Zeichen")
+                        
+                        # Backup erstellen
+                        confluence_sso.create_backup(page['body']['storage']['value'], "racoon_publications_sso")
+                        
+                    except Exception as e:
+                        print(f"❌ Seiten-Zugriff fehlgeschlagen: {e}")
+                        
+                except Exception as e:
+                    print(f"❌ API-Zugriff fehlgeschlagen: {e}")
+            else:
+                print("❌ Cookie-basierter Login fehlgeschlagen")
+        else:
+            print("❌ Kein Cookie-Header eingegeben")
+    
+    else:
+        print("📋 Verfügbare Optionen:")
+        print("  python confluence_sso.py --manual-login")
+        print()
+        print("💡 Hinweis: Da Ihr Confluence SSO verwendet, können Sie nicht")
+        print("   direkt mit Username/Passwort auf die API zugreifen.")
+        print("   Verwenden Sie --manual-login für Cookie-basierte Authentifizierung.")
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
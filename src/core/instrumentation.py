@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Leichtgewichtige Instrumentierung für RACOON Tools
+Timer (Context-Manager/Decorator), Zähler, Gauges und Cache-Statistiken
+mit Laufzeit-Report (Text/JSON) und optionalem Profiling (cProfile/pyinstrument)
+"""
+
+import re
+import json
+import time
+import threading
+from pathlib import Path
+from functools import wraps
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# Obergrenzen der Latenz-Buckets in Sekunden (Prometheus-Konvention, +Inf implizit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_ID_SEGMENT_RE = re.compile(r'/\d+(?=/|$)')
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def format_key(key):
+    """'http.request{endpoint=...,method=GET}' für Reports"""
+    name, labels = key
+    if not labels:
+        return name
+    return name + '{' + ','.join(f"{k}={v}" for k, v in labels) + '}'
+
+
+class TimerStat:
+    """Aggregierte Messwerte eines Timers (feste Buckets, konstanter Speicher)"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets', 'items', 'size')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.items = 0
+        self.size = 0
+
+    def observe(self, seconds, items=0, size=0):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.items += items
+        self.size += size
+
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_s': round(self.total, 6),
+            'mean_s': round(self.total / self.count, 6) if self.count else 0.0,
+            'min_s': round(self.min or 0.0, 6),
+            'max_s': round(self.max, 6),
+            'items': self.items,
+            'size': self.size,
+            'items_per_s': round(self.items / self.total, 1) if self.total and self.items else None,
+            'mb_per_s': round(self.size / self.total / 1e6, 2) if self.total and self.size else None,
+        }
+
+
+class Span:
+    """Laufende Messung - Menge (items) und Datenvolumen (size) lassen sich nachtragen"""
+
+    __slots__ = ('items', 'size')
+
+    def __init__(self):
+        self.items = 0
+        self.size = 0
+
+    def add(self, items=0, size=0):
+        self.items += items
+        self.size += size
+
+
+class Instrumentation:
+    """Registry aller Messwerte eines Laufs (thread-safe)"""
+
+    def __init__(self):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._caches = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timers = {}
+            self.counters = {}
+            self.gauges = {}
+            self.started = time.time()
+
+    # --- Timer ---
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Misst einen Block: with METRICS.timer('integrator.discover') as span: ..."""
+        span = Span()
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            self.observe(name, time.perf_counter() - start, span.items, span.size, **labels)
+
+    def timed(self, name=None, items=None, size=None, **labels):
+        """
+        Decorator-Variante des Timers
+
+        Args:
+            name: Metrikname (Standard: Modul.Funktion)
+            items: Optional Funktion Ergebnis -> Anzahl verarbeiteter Einheiten
+            size: Optional Funktion Ergebnis -> Datenvolumen (Bytes/Zeichen)
+        """
+        def decorate(func):
+            metric = name or f"{func.__module__}.{func.__qualname__}"
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                result = None
+                try:
+                    result = func(*args, **kwargs)
+                    return result
+                finally:
+                    elapsed = time.perf_counter() - start
+                    n_items = items(result) if items and result is not None else 0
+                    n_size = size(result) if size and result is not None else 0
+                    self.observe(metric, elapsed, n_items, n_size, **labels)
+
+            return wrapper
+        return decorate
+
+    def observe(self, name, seconds, items=0, size=0, **labels):
+        """Trägt eine bereits gemessene Dauer ein"""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            stat = self.timers.get(key)
+            if stat is None:
+                stat = self.timers[key] = TimerStat()
+            stat.observe(seconds, items, size)
+
+    # --- Zähler und Gauges ---
+
+    def count(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(self, name, value, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    # --- Caches ---
+
+    def register_cache(self, name, cached_function):
+        """Registriert eine lru_cache-Funktion, deren cache_info() in den Report einfließt"""
+        self._caches[name] = cached_function
+
+    def cache_stats(self):
+        stats = {}
+        for name, func in self._caches.items():
+            info = func.cache_info()
+            lookups = info.hits + info.misses
+            stats[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'hit_rate': round(info.hits / lookups, 4) if lookups else None
+            }
+        return stats
+
+    # --- Reports ---
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'started': self.started,
+                'duration_s': round(time.time() - self.started, 3),
+                'timers': {format_key(k): v.to_dict() for k, v in self.timers.items()},
+                'counters': {format_key(k): v for k, v in self.counters.items()},
+                'gauges': {format_key(k): v for k, v in self.gauges.items()},
+                'caches': self.cache_stats(),
+            }
+
+    def write_json(self, path):
+        """Schreibt den Report als JSON-Datei"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def report(self, title="Laufzeit-Report"):
+        """Text-Report: Stufen nach Gesamtzeit, Durchsatz, Zähler und Cache-Trefferquoten"""
+        data = self.to_dict()
+        lines = [f"\n⏱️ {title} ({data['duration_s']:.1f}s)", "-" * 94]
+
+        timers = sorted(data['timers'].items(), key=lambda item: -item[1]['total_s'])
+        if timers:
+            lines.append(f"{'Stufe':<60} {'Anzahl':>6} {'Gesamt':>9} {'Mittel':>9}  Durchsatz")
+            for name, stat in timers:
+                throughput = ''
+                if stat['items_per_s']:
+                    throughput = f"{stat['items_per_s']:,.0f}/s"
+                if stat['mb_per_s']:
+                    throughput += f" {stat['mb_per_s']:.1f} MB/s"
+                lines.append(
+                    f"{name[:60]:<60} {stat['count']:>6} {stat['total_s']:>8.3f}s "
+                    f"{stat['mean_s'] * 1000:>7.1f}ms  {throughput.strip()}"
+                )
+
+        if data['counters']:
+            lines.append("")
+            for name, value in sorted(data['counters'].items()):
+                lines.append(f"  {name:<60} {value:>12,}")
+
+        if data['gauges']:
+            lines.append("")
+            for name, value in sorted(data['gauges'].items()):
+                lines.append(f"  {name:<60} {value:>12,}")
+
+        for name, cache in data['caches'].items():
+            if cache['hit_rate'] is not None:
+                lines.append(f"  💾 {name}: {cache['hits']:,} Treffer / {cache['misses']:,} Fehlgriffe "
+                             f"({cache['hit_rate']:.0%})")
+
+        return '\n'.join(lines)
+
+
+# Globale Registry für alle Tools eines Prozesses
+METRICS = Instrumentation()
+timer = METRICS.timer
+timed = METRICS.timed
+count = METRICS.count
+gauge = METRICS.gauge
+
+
+def endpoint_label(url):
+    """Pfad ohne IDs als Endpunkt-Label (/rest/api/content/123 -> /rest/api/content/{id})"""
+    return _ID_SEGMENT_RE.sub('/{id}', urlsplit(url).path) or '/'
+
+
+def instrument_session(session, service, metrics=METRICS):
+    """
+    Misst alle Requests einer requests-Session: Latenz pro Endpunkt, Status, Bytes
+
+    Die Session wird in-place umgehängt; ein zweiter Aufruf ist wirkungslos.
+    """
+    if getattr(session, '_racoon_instrumented', False):
+        return session
+
+    original_request = session.request
+
+    def request(method, url, *args, **kwargs):
+        endpoint = endpoint_label(url)
+        with metrics.timer('http.request', service=service, method=method, endpoint=endpoint) as span:
+            response = original_request(method, url, *args, **kwargs)
+            if kwargs.get('stream'):
+                # Gestreamte Antworten nicht hier einlesen - Größe laut Header
+                received = int(response.headers.get('Content-Length') or 0)
+            else:
+                received = len(response.content)
+            span.add(items=1, size=received)
+
+        sent = response.request.body if response.request is not None else None
+        metrics.count('http.responses', service=service, status=response.status_code)
+        if response.headers.get('Content-Encoding'):
+            metrics.count('http.compressed', service=service, encoding=response.headers['Content-Encoding'])
+        metrics.count('http.bytes_received', received, service=service)
+        metrics.count('http.bytes_sent', len(sent or b''), service=service)
+        return response
+
+    session.request = request
+    session._racoon_instrumented = True
+    return session
+
+
+@contextmanager
+def profiling(mode=None, output=None):
+    """
+    Optionales Profiling eines Blocks
+
+    Args:
+        mode: None (aus), 'cprofile' oder 'pyinstrument' (falls installiert)
+        output: Zieldatei (.prof für cProfile, .html für pyinstrument); ohne Datei Ausgabe auf stdout
+    """
+    if not mode:
+        yield
+        return
+
+    if mode == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ pyinstrument nicht installiert - verwende cProfile")
+            mode = 'cprofile'
+        else:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                if output:
+                    Path(output).write_text(profiler.output_html(), encoding='utf-8')
+                    print(f"🔬 Profil gespeichert: {output}")
+                else:
+                    print(profiler.output_text(unicode=True, color=False))
+            return
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if output:
+            profiler.dump_stats(output)
+            print(f"🔬 Profil gespeichert: {output} (auswerten mit: python -m pstats {output})")
+        else:
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+
+
+def add_instrumentation_arguments(parser):
+    """Gemeinsame CLI-Optionen für Report und Profiling"""
+    parser.add_argument('--metrics', action='store_true', help="Laufzeit-Report am Ende ausgeben")
+    parser.add_argument('--metrics-json', help="Laufzeit-Report als JSON-Datei schreiben")
+    parser.add_argument('--profile', choices=('cprofile', 'pyinstrument'), help="Lauf profilieren")
+    parser.add_argument('--profile-output', help="Zieldatei für das Profil")
+    parser.add_argument('--prometheus-textfile',
+                        help="Metriken im Prometheus-Format schreiben (textfile collector, *.prom)")
+
+
+def finish_run(args, title="Laufzeit-Report", tool=None, success=None):
+    """
+    Gibt den Report gemäß --metrics/--metrics-json/--prometheus-textfile aus
+
+    Args:
+        tool: Wert des tool-Labels im Prometheus-Export
+        success: Optional Erfolg des Laufs (racoon_run_success)
+    """
+    if getattr(args, 'metrics', False):
+        print(METRICS.report(title))
+    if getattr(args, 'metrics_json', None):
+        path = METRICS.write_json(args.metrics_json)
+        print(f"📊 Metriken gespeichert: {path}")
+    if getattr(args, 'prometheus_textfile', None):
+        from core.metrics_export import write_textfile
+        labels = {'tool': tool} if tool else None
+        path = write_textfile(args.prometheus_textfile, METRICS, labels, success)
+        print(f"📈 Prometheus-Metriken geschrieben: {path}")
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON-Codec für Confluence-Payloads
+Nutzt orjson (schnelles Dekodieren/Escapen) und ijson (Streaming-Parser), falls
+installiert - sonst das json-Modul der Standardbibliothek mit gleichem Ergebnis.
+Beide werden erst beim ersten Gebrauch importiert (Kaltstart der CLI).
+"""
+
+import re
+import json
+
+# Felder einer Seite, die für Body-Operationen gebraucht werden (Präfixe im ijson-Format)
+PAGE_FIELDS = {
+    'id': ('id',),
+    'title': ('title',),
+    'version.number': ('version', 'number'),
+    'body.storage.value': ('body', 'storage', 'value'),
+    '_links.webui': ('_links', 'webui'),
+}
+
+# Antwort auf ein Update: der mitgeschickte Body wird nicht gebraucht
+UPDATE_FIELDS = {prefix: path for prefix, path in PAGE_FIELDS.items() if prefix != 'body.storage.value'}
+
+# Lesegröße für den Streaming-Parser
+READ_SIZE = 64 * 1024
+
+# Pfad des Storage-Bodys in einer Content-Antwort
+BODY_PATH = ('body', 'storage', 'value')
+
+# Strukturzeichen außerhalb von Strings und Inhalt eines Strings bis zum schließenden "
+_STRUCTURE_RE = re.compile(rb'[{}\[\]:,"]')
+_STRING_RE = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_HIGH_SURROGATE_RE = re.compile(rb'\\u[dD][89abAB][0-9a-fA-F]{2}')
+
+
+# (orjson, ijson) nach dem ersten Gebrauch; None = nicht installiert
+_BACKENDS = None
+
+
+def _backends():
+    global _BACKENDS
+    if _BACKENDS is None:
+        try:
+            import orjson
+        except ImportError:
+            orjson = None
+        try:
+            import ijson
+        except ImportError:
+            ijson = None
+        _BACKENDS = (orjson, ijson)
+    return _BACKENDS
+
+
+def backend():
+    """Name der aktiven Implementierung (für Reports/Benchmarks)"""
+    orjson, ijson = _backends()
+    if orjson is not None and ijson is not None:
+        return 'orjson+ijson'
+    return 'orjson' if orjson is not None else ('json+ijson' if ijson is not None else 'json')
+
+
+def loads(data):
+    """JSON aus bytes/str dekodieren"""
+    orjson = _backends()[0]
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """JSON als UTF-8 bytes (Nicht-ASCII-Zeichen unverändert)"""
+    orjson = _backends()[0]
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def escape(text):
+    """Inhalt eines JSON-Strings als bytes (ohne Anführungszeichen)"""
+    orjson = _backends()[0]
+    if orjson is not None:
+        return orjson.dumps(text)[1:-1]
+    return json.dumps(text, ensure_ascii=False)[1:-1].encode('utf-8')
+
+
+def _set_path(target, path, value):
+    for key in path[:-1]:
+        target = target.setdefault(key, {})
+    target[path[-1]] = value
+
+
+def _pick_fields(page, fields):
+    """Nur die angegebenen Felder übernehmen (der Rest kann freigegeben werden)"""
+    picked = {}
+    for path in fields.values():
+        value = page
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            _set_path(picked, path, value)
+    return picked
+
+
+class _ChunkReader:
+    """Dateiartige Sicht (read) auf eine Folge von bytes-Stücken"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0 or len(self._buffer) <= size:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def response_stream(response):
+    """
+    Dateiartiger Zugriff auf einen Response-Body
+
+    Über iter_content: mit stream=True angefordert wird beim Lesen gestreamt (gzip/deflate
+    entpackt), sonst der bereits geladene Body in Stücken geliefert.
+    """
+    return _ChunkReader(response.iter_content(READ_SIZE))
+
+
+def extract_page(response, fields=PAGE_FIELDS):
+    """
+    Liest nur id, title, version.number, body.storage.value und _links.webui aus
+    einer Content-Antwort (bzw. die Felder aus fields)
+
+    Mit ijson wird die Antwort gestreamt und nie vollständig als Baum aufgebaut;
+    nur der Body-String selbst entsteht einmal. Ohne ijson wird die Antwort
+    dekodiert und sofort auf diese Felder reduziert.
+
+    Args:
+        response: requests-Response (idealerweise mit stream=True angefordert)
+        fields: Präfix -> Pfad, z.B. UPDATE_FIELDS
+
+    Returns:
+        Dict in der Struktur der REST-Antwort, reduziert auf die Felder oben
+    """
+    ijson = _backends()[1]
+    if ijson is None:
+        try:
+            return _pick_fields(loads(response.content), fields)
+        finally:
+            response.close()
+
+    wanted = dict(fields)
+    picked = {}
+    stream = response_stream(response)
+    try:
+        for prefix, event, value in ijson.parse(stream, buf_size=READ_SIZE, use_float=True):
+            if prefix in wanted and event in ('string', 'number', 'boolean', 'null'):
+                _set_path(picked, wanted.pop(prefix), value)
+                if not wanted:
+                    break
+    finally:
+        response.close()
+    return picked
+
+
+def _safe_cut(raw):
+    """Länge des Anfangs von raw ohne angeschnittenes UTF-8-Zeichen oder Escape am Ende"""
+    end = len(raw)
+
+    # UTF-8: Startbyte eines Zeichens suchen, dessen Folgebytes noch fehlen
+    i = end - 1
+    while i >= 0 and end - i <= 4 and 0x80 <= raw[i] < 0xC0:
+        i -= 1
+    if i >= 0 and raw[i] >= 0xC0:
+        need = 2 if raw[i] < 0xE0 else (3 if raw[i] < 0xF0 else 4)
+        if end - i < need:
+            end = i
+
+    # Escapes: \ am Ende, \u mit weniger als 4 Ziffern, High-Surrogate ohne Partner
+    start = raw.rfind(b'\\', max(0, end - 12), end)
+    if start < 0 or not _escape_starts(raw, start):
+        return end  # kein Escape oder endet auf einem vollständigen \\
+    if start + 2 > end or raw[start + 1] == 0x75 and (
+            start + 6 > end or _HIGH_SURROGATE_RE.fullmatch(raw, start, start + 6)):
+        # Ein davorstehendes High-Surrogate gehört zum angeschnittenen Escape
+        if start >= 6 and _HIGH_SURROGATE_RE.fullmatch(raw, start - 6, start) and _escape_starts(raw, start - 6):
+            return start - 6
+        return start
+    return end
+
+
+def _escape_starts(raw, position):
+    """Beginnt an position (einem Backslash) ein Escape? (ungerade viele Backslashes bis dort)"""
+    run = 1
+    while position - run >= 0 and raw[position - run] == 0x5C:
+        run += 1
+    return run % 2 == 1
+
+
+def _decode_string(raw):
+    """Rohinhalt eines JSON-Strings -> UTF-8 bytes (ohne Escapes unverändert)"""
+    if b'\\' not in raw:
+        return raw
+    return loads(b'"' + raw + b'"').encode('utf-8')
+
+
+def _scan_string(chunks, path, skeleton):
+    """
+    Liefert den String unter path als dekodierte UTF-8-Stücke, während die Antwort eintrifft
+
+    Alles andere wird unverändert nach skeleton kopiert (der String selbst als ""),
+    sodass skeleton danach als kleines JSON-Dokument dekodiert werden kann.
+    """
+    path = tuple(path)
+    stack = []   # je Container: [Zeichen, aktueller Schlüssel, Schlüssel erwartet]
+    state = None  # None (zwischen Tokens), 'key', 'value' oder 'target'
+    key_raw = bytearray()
+    buf = b''
+    pos = 0
+    chunks = iter(chunks)
+
+    while True:
+        if pos >= len(buf):
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        if state is None:
+            match = _STRUCTURE_RE.search(buf, pos)
+            if match is None:
+                skeleton += buf[pos:]
+                pos = len(buf)
+                continue
+            skeleton += buf[pos:match.start()]
+            char = buf[match.start()]
+            pos = match.end()
+            skeleton.append(char)
+
+            if char == 0x22:  # "
+                top = stack[-1] if stack else None
+                if top is not None and top[2]:
+                    state = 'key'
+                    key_raw.clear()
+                elif (len(stack) == len(path) and all(entry[0] == 0x7B for entry in stack)
+                      and tuple(entry[1] for entry in stack) == path):
+                    state = 'target'
+                else:
+                    state = 'value'
+            elif char in b'{[':
+                stack.append([char, None, char == 0x7B])
+            elif char in b'}]':
+                if stack:
+                    stack.pop()
+            elif char == 0x3A:  # :
+                stack[-1][2] = False
+            elif stack and stack[-1][0] == 0x7B:  # , im Objekt
+                stack[-1][2] = True
+            continue
+
+        # Innerhalb eines Strings: bis zum schließenden " oder bis zum Ende des Puffers
+        end = _STRING_RE.match(buf, pos).end()
+        closed = end < len(buf) and buf[end] == 0x22
+        if state == 'target':
+            raw = buf[pos:end]
+            cut = len(raw) if closed else _safe_cut(raw)
+            if cut:
+                yield _decode_string(raw[:cut])
+            pos += cut
+        else:
+            skeleton += buf[pos:end]
+            if state == 'key':
+                key_raw += buf[pos:end]
+            pos = end
+
+        if closed:
+            pos += 1
+            skeleton.append(0x22)
+            if state == 'key':
+                stack[-1][1] = loads(b'"' + bytes(key_raw) + b'"')
+            state = None
+        else:
+            # Rest (angeschnittenes Escape/Zeichen) mit dem nächsten Stück zusammen verarbeiten
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            buf, pos = buf[pos:] + chunk, 0
+
+
+def extract_page_body(response, sink, fields=PAGE_FIELDS):
+    """
+    Wie extract_page, body.storage.value entsteht aber nie als String
+
+    Der Body wird beim Eintreffen in UTF-8-Stücken dekodiert und direkt an sink
+    übergeben (z.B. BodyBuffer.from_chunks); der übrige, kleine Teil der Antwort
+    wird danach dekodiert.
+
+    Args:
+        response: requests-Response (idealerweise mit stream=True angefordert)
+        sink: Funktion, die die Body-Stücke (Iterator von bytes) vollständig verbraucht
+        fields: Präfix -> Pfad der übernommenen Felder
+
+    Returns:
+        (Seite ohne body.storage.value, Rückgabe von sink)
+    """
+    skeleton = bytearray()
+    try:
+        pieces = _scan_string(response.iter_content(READ_SIZE), BODY_PATH, skeleton)
+        result = sink(pieces)
+        for _ in pieces:
+            pass  # Rest der Antwort (nach dem Body) für skeleton lesen
+    finally:
+        response.close()
+
+    page = _pick_fields(loads(bytes(skeleton)), fields)
+    page.get('body', {}).get('storage', {}).pop('value', None)
+    return page, result
+
+
+def iter_results(response, meta=None, fields=PAGE_FIELDS):
+    """
+    Einträge einer Listen-Antwort (search, child/page) einzeln, reduziert auf fields
+
+    Mit ijson wird jeder Eintrag geliefert, sobald er vollständig eingetroffen ist;
+    ohne ijson nach dem Dekodieren der ganzen Antwort.
+
+    Args:
+        response: requests-Response (idealerweise mit stream=True angefordert)
+        meta: Optionales Dict, in das 'next' (_links.next) und 'size' eingetragen werden
+        fields: Präfix -> Pfad der übernommenen Felder je Eintrag
+    """
+    meta = meta if meta is not None else {}
+
+    ijson = _backends()[1]
+    if ijson is None:
+        try:
+            data = loads(response.content)
+        finally:
+            response.close()
+        meta['next'] = data.get('_links', {}).get('next')
+        meta['size'] = data.get('size')
+        for item in data.get('results', []):
+            yield _pick_fields(item, fields)
+        return
+
+    builder = None
+    stream = response_stream(response)
+    try:
+        for prefix, event, value in ijson.parse(stream, buf_size=READ_SIZE, use_float=True):
+            if builder is not None:
+                if prefix == 'results.item' and event == 'end_map':
+                    yield _pick_fields(builder.value, fields)
+                    builder = None
+                else:
+                    builder.event(event, value)
+            elif prefix == 'results.item' and event == 'start_map':
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix == '_links.next' and event == 'string':
+                meta['next'] = value
+            elif prefix == 'size' and event == 'number':
+                meta['size'] = value
+    finally:
+        response.close()
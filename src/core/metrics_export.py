@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prometheus-Export der Laufzeit-Metriken
+Textformat (0.0.4) für den node_exporter textfile collector oder einen kleinen
+lokalen HTTP-Endpunkt - für Trends und Alerts aus Cron-Läufen
+"""
+
+import os
+import re
+import sys
+import time
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(str(Path(__file__).parent.parent))
+from core.instrumentation import METRICS, LATENCY_BUCKETS
+
+PREFIX = "racoon"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_PORT = 9464
+
+# Zähler, die auch ohne Ereignis (mit 0) exportiert werden - sonst greifen Alerts erst nach dem ersten Vorfall
+ALWAYS_EXPORTED_COUNTERS = ('confluence.conflicts', 'ncbi.rate_limited')
+
+HELP = {
+    'http.request': "Latenz der HTTP-Requests pro Dienst und Endpunkt",
+    'http.responses': "HTTP-Antworten pro Dienst und Statuscode",
+    'http.bytes_received': "Empfangene Bytes pro Dienst",
+    'http.bytes_sent': "Gesendete Bytes pro Dienst",
+    'ncbi.rate_limit_wait': "Wartezeit nach NCBI 429-Antworten",
+    'ncbi.rate_limited': "NCBI 429-Antworten (Ratenlimit)",
+    'confluence.page_size': "Größe des Storage-Bodies in Zeichen",
+    'confluence.conflicts': "Versionskonflikte (409) beim Speichern",
+    'table.rows': "Datenzeilen der Publikationstabelle",
+    'table.issues': "Befunde des Health-Checks",
+    'integrator.candidates': "Neue Kandidaten nach dem Duplikat-Abgleich",
+}
+
+_INVALID_CHARS_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def metric_name(name, suffix=''):
+    """'http.request' -> 'racoon_http_request_seconds'"""
+    base = _INVALID_CHARS_RE.sub('_', f"{PREFIX}_{name}")
+    return f"{base}_{suffix}" if suffix else base
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(*label_sets):
+    merged = {}
+    for labels in label_sets:
+        merged.update(labels)
+    if not merged:
+        return ''
+    return '{' + ','.join(f'{_INVALID_CHARS_RE.sub("_", k)}="{_escape(v)}"' for k, v in merged.items()) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float):
+        return repr(round(value, 9))
+    return str(value)
+
+
+def _family(lines, name, kind, help_text):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _grouped(entries):
+    """{(name, labels): value} -> {name: [(labels-dict, value)]} in stabiler Reihenfolge"""
+    groups = {}
+    for (name, labels), value in sorted(entries.items(), key=lambda item: (item[0][0], item[0][1])):
+        groups.setdefault(name, []).append((dict(labels), value))
+    return groups
+
+
+def render_prometheus(metrics=METRICS, labels=None, success=None):
+    """
+    Rendert alle Messwerte im Prometheus-Textformat
+
+    Args:
+        metrics: Instrumentation-Registry
+        labels: Zusätzliche Labels für jede Zeitreihe (z.B. {'tool': 'integration'})
+        success: Optional Erfolg des Laufs (als racoon_run_success 0/1)
+
+    Returns:
+        Text im Exposition-Format
+    """
+    labels = labels or {}
+    lines = []
+
+    with metrics._lock:
+        timers = dict(metrics.timers)
+        counters = dict(metrics.counters)
+        gauges = dict(metrics.gauges)
+        started = metrics.started
+
+    for name in ALWAYS_EXPORTED_COUNTERS:
+        if not any(key[0] == name for key in counters):
+            counters[(name, ())] = 0
+
+    # Timer -> Histogramme (Buckets kumulativ)
+    for name, series in _grouped(timers).items():
+        family = metric_name(name, 'seconds')
+        _family(lines, family, 'histogram', HELP.get(name, f"Dauer von {name}"))
+        for series_labels, stat in series:
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS, stat.buckets):
+                cumulative += bucket_count
+                lines.append(f"{family}_bucket{_labels(labels, series_labels, {'le': _number(bound)})} {cumulative}")
+            lines.append(f"{family}_bucket{_labels(labels, series_labels, {'le': '+Inf'})} {stat.count}")
+            lines.append(f"{family}_sum{_labels(labels, series_labels)} {_number(stat.total)}")
+            lines.append(f"{family}_count{_labels(labels, series_labels)} {stat.count}")
+
+        # Durchsatz-Basis: verarbeitete Einheiten/Bytes der Stufe
+        items = [(series_labels, stat.items) for series_labels, stat in series if stat.items]
+        if items:
+            family = metric_name(name, 'items_total')
+            _family(lines, family, 'counter', f"Verarbeitete Einheiten in {name}")
+            for series_labels, value in items:
+                lines.append(f"{family}{_labels(labels, series_labels)} {value}")
+
+    for name, series in _grouped(counters).items():
+        family = metric_name(name, 'total')
+        _family(lines, family, 'counter', HELP.get(name, name))
+        for series_labels, value in series:
+            lines.append(f"{family}{_labels(labels, series_labels)} {_number(value)}")
+
+    for name, series in _grouped(gauges).items():
+        family = metric_name(name)
+        _family(lines, family, 'gauge', HELP.get(name, name))
+        for series_labels, value in series:
+            lines.append(f"{family}{_labels(labels, series_labels)} {_number(value)}")
+
+    caches = metrics.cache_stats()
+    if caches:
+        family = metric_name('cache_lookups_total')
+        _family(lines, family, 'counter', "Cache-Zugriffe nach Ergebnis")
+        for cache, stat in sorted(caches.items()):
+            lines.append(f"{family}{_labels(labels, {'cache': cache, 'result': 'hit'})} {stat['hits']}")
+            lines.append(f"{family}{_labels(labels, {'cache': cache, 'result': 'miss'})} {stat['misses']}")
+
+    # Lauf-Metadaten: Zeitstempel für "Job läuft nicht mehr"-Alerts
+    family = metric_name('run_timestamp_seconds')
+    _family(lines, family, 'gauge', "Ende des letzten Laufs (Unix-Zeit)")
+    lines.append(f"{family}{_labels(labels)} {_number(round(time.time(), 3))}")
+
+    family = metric_name('run_duration_seconds')
+    _family(lines, family, 'gauge', "Dauer des letzten Laufs")
+    lines.append(f"{family}{_labels(labels)} {_number(round(time.time() - started, 3))}")
+
+    if success is not None:
+        family = metric_name('run_success')
+        _family(lines, family, 'gauge', "1 wenn der letzte Lauf erfolgreich war")
+        lines.append(f"{family}{_labels(labels)} {int(bool(success))}")
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(path, metrics=METRICS, labels=None, success=None):
+    """
+    Schreibt die Metriken atomar (tmp + rename) für den textfile collector
+
+    Der node_exporter liest nur *.prom Dateien - halbe Dateien sieht er dank rename nie.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(render_prometheus(metrics, labels, success))
+    os.replace(tmp, path)
+    return path
+
+
+def merge_textfiles(texts):
+    """
+    Fasst mehrere Exposition-Texte zusammen (jede Metrik-Familie nur einmal mit HELP/TYPE)
+
+    Nötig, weil mehrere Tools dieselben Familien mit unterschiedlichem tool-Label schreiben.
+    """
+    families = {}
+    for text in texts:
+        current = None
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            if line.startswith('# '):
+                parts = line.split(' ', 3)
+                if len(parts) >= 3 and parts[1] in ('HELP', 'TYPE'):
+                    current = families.setdefault(parts[2], {'meta': {}, 'samples': []})
+                    current['meta'].setdefault(parts[1], line)
+                continue
+            if current is None:
+                name = line.split('{', 1)[0].split(' ', 1)[0]
+                current = families.setdefault(name, {'meta': {}, 'samples': []})
+            current['samples'].append(line)
+
+    lines = []
+    for family in families.values():
+        for kind in ('HELP', 'TYPE'):
+            if kind in family['meta']:
+                lines.append(family['meta'][kind])
+        lines.extend(family['samples'])
+    return '\n'.join(lines) + '\n'
+
+
+def _make_handler(source):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            payload = source().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def serve_metrics(source=None, host='127.0.0.1', port=DEFAULT_PORT):
+    """
+    Startet einen /metrics Endpunkt im Hintergrund-Thread
+
+    Args:
+        source: Funktion ohne Argumente -> Exposition-Text (Standard: globale Registry)
+
+    Returns:
+        ThreadingHTTPServer (stoppen mit shutdown())
+    """
+    source = source or render_prometheus
+    httpd = ThreadingHTTPServer((host, port), _make_handler(source))
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def main():
+    """Liefert alle *.prom Dateien eines Verzeichnisses per HTTP aus (ohne node_exporter)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RACOON Metriken per HTTP ausliefern")
+    parser.add_argument('--dir', default="metrics", help="Verzeichnis mit *.prom Dateien der Cron-Läufe")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    directory = Path(args.dir)
+
+    def source():
+        files = sorted(directory.glob("*.prom"))
+        return merge_textfiles(path.read_text(encoding='utf-8') for path in files)
+
+    httpd = serve_metrics(source, args.host, args.port)
+    print(f"📈 Metriken aus {directory}/ unter http://{args.host}:{args.port}/metrics (Strg+C beendet)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print("\n👋 Exporter beendet")
+    finally:
+        httpd.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seiten-Cache für Confluence Storage-Bodies
+Hält Body und geparste Tabelle pro Seite; liefert die Instanz ETag/Last-Modified,
+entscheidet ein bedingter GET (304 ohne Body), sonst ein günstiger Versions-Probe
+(expand=version, ohne Body), ob neu geladen werden muss
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from collections import OrderedDict
+sys.path.append(str(Path(__file__).parent.parent))
+from core.instrumentation import METRICS
+from core.table_parser import parse_table
+
+
+class CachedPage:
+    """Stand einer Seite: Titel, Version, Body, Validatoren (ETag/Last-Modified) und (lazy) das Zeilenmodell"""
+
+    __slots__ = ('page_id', 'title', 'version', 'content', 'validators', 'fetched', '_table')
+
+    def __init__(self, page_id, title, version, content, validators=None):
+        self.page_id = str(page_id)
+        self.title = title
+        self.version = version
+        self.content = content
+        self.validators = validators or {}
+        self.fetched = time.time()
+        self._table = None
+
+    @classmethod
+    def from_page(cls, page):
+        """Aus einer REST-Antwort mit expand=body.storage,version"""
+        return cls(page['id'], page.get('title'), page['version']['number'], page['body']['storage']['value'],
+                   page.get('_validators'))
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = parse_table(self.content)
+        return self._table
+
+    @property
+    def age(self):
+        return time.time() - self.fetched
+
+
+class PageCache:
+    """
+    LRU-Cache für Seiten einer ConfluenceSSO-Session (thread-safe)
+
+    Args:
+        confluence_sso: Angemeldete ConfluenceSSO-Instanz
+        max_pages: Maximale Anzahl gecachter Seiten
+    """
+
+    def __init__(self, confluence_sso, max_pages=64):
+        self.confluence_sso = confluence_sso
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, page_id):
+        return str(page_id) in self._pages
+
+    def peek(self, page_id):
+        """Gecachter Stand ohne Request (oder None)"""
+        with self._lock:
+            return self._pages.get(str(page_id))
+
+    def put(self, page):
+        """Übernimmt eine geladene Seite (REST-Dict oder CachedPage)"""
+        if not isinstance(page, CachedPage):
+            page = CachedPage.from_page(page)
+
+        with self._lock:
+            self._pages[page.page_id] = page
+            self._pages.move_to_end(page.page_id)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def invalidate(self, page_id=None):
+        """Verwirft eine Seite (oder alle)"""
+        with self._lock:
+            if page_id is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(str(page_id), None)
+
+    def probe_version(self, page_id):
+        """Aktuelle Versionsnummer ohne Body (ein kleiner Request)"""
+        METRICS.count('page_cache.probes')
+        page = self.confluence_sso.get_page(page_id, "version")
+        return page['version']['number']
+
+    def fetch(self, page_id):
+        """Lädt Body und Version neu und legt sie im Cache ab"""
+        METRICS.count('page_cache.fetches')
+        return self.put(self.confluence_sso.get_page_storage(page_id))
+
+    def revalidate(self, page_id):
+        """
+        Prüft einen Cache-Eintrag gegen den Server (ein Request, wenn möglich)
+
+        Mit ETag/Last-Modified: bedingter GET - 304 bestätigt den Eintrag, sonst kommt
+        der neue Stand in derselben Antwort. Ohne Validatoren: Versions-Probe und bei
+        Änderung ein zweiter Request für den Body.
+
+        Returns:
+            CachedPage (derselbe Eintrag, falls unverändert)
+        """
+        cached = self.peek(page_id)
+        if cached is None:
+            return self.fetch(page_id)
+
+        if cached.validators:
+            METRICS.count('page_cache.conditional')
+            page = self.confluence_sso.get_page_storage(page_id, cached.validators)
+            if page is not None:
+                METRICS.count('page_cache.fetches')
+                return self.put(page)
+        elif self.probe_version(page_id) != cached.version:
+            return self.fetch(page_id)
+
+        cached.fetched = time.time()
+        METRICS.count('page_cache.hits')
+        return cached
+
+    def get(self, page_id, max_age=0):
+        """
+        Aktueller Stand einer Seite
+
+        Args:
+            page_id: Seiten-ID
+            max_age: Sekunden, in denen ein Cache-Eintrag ohne Prüfung gilt
+
+        Returns:
+            CachedPage
+        """
+        cached = self.peek(page_id)
+        if cached is not None and cached.age <= max_age:
+            METRICS.count('page_cache.hits')
+            return cached
+        return self.revalidate(page_id)
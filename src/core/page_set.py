@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Seitenmengen für mehrere Publikationstabellen
+Die Tools arbeiten auf einer Menge von Seiten (IDs oder CQL-Selektor, z.B. eine
+Tabelle pro Standort) und verarbeiten sie parallel - je Seite mit eigener Sperre,
+eigenem Backup-Präfix und gemeinsamem PageCache; die Ergebnisse werden zusammengeführt
+"""
+
+import os
+import re
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import PAGE_ID, PAGE_IDS, PAGE_CQL
+from core.instrumentation import METRICS
+
+# ThreadPoolExecutor, PageCache und bulk_fetch werden erst bei Bedarf importiert:
+# Tools importieren dieses Modul schon für ihre Argumente (kurzer Kaltstart für --help)
+
+LOCK_DIR = Path('locks')
+
+# Parallele Requests pro Lauf (Confluence drosselt einzelne Sessions ab ~10 gleichzeitigen)
+MAX_WORKERS = 8
+
+# Sperren, deren Prozess seit dieser Zeit nichts mehr getan hat, gelten als verwaist
+STALE_LOCK_SECONDS = 60 * 60
+
+# Vermerk auf der Index-Seite einer aufgeteilten Tabelle (siehe tools/sharding.py)
+SHARD_MODE_RE = re.compile(r'Aufteilung: (nach Jahr|je (\d+) Nummern)')
+
+# Titel der Unterseiten: "<Titel der Hauptseite> – <Teil>" (Titel sind pro Space eindeutig)
+SHARD_TITLE_SEPARATOR = ' – '
+
+
+class PageLocked(Exception):
+    """Die Seite wird gerade von einem anderen Lauf bearbeitet"""
+
+
+class PageLock:
+    """
+    Sperrdatei pro Seite (locks/<page_id>.lock), exklusiv angelegt
+
+    Schützt schreibende Läufe (Cleanup, Restore, Integration) vor parallelen
+    Updates derselben Seite - auch über Prozessgrenzen hinweg.
+
+    Args:
+        page_id: Seiten-ID
+        lock_dir: Verzeichnis der Sperrdateien
+        timeout: Sekunden, die auf eine belegte Sperre gewartet wird
+        stale: Alter, ab dem eine Sperre als verwaist übernommen wird
+    """
+
+    def __init__(self, page_id, lock_dir=LOCK_DIR, timeout=0, stale=STALE_LOCK_SECONDS):
+        self.page_id = str(page_id)
+        self.path = Path(lock_dir) / f"{self.page_id}.lock"
+        self.timeout = timeout
+        self.stale = stale
+        self.locked = False
+
+    def acquire(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.time() + self.timeout
+
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    age = time.time() - self.path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if age > self.stale:
+                    print(f"⚠️ Verwaiste Sperre für Seite {self.page_id} übernommen ({age / 60:.0f} min alt)")
+                    self.path.unlink(missing_ok=True)
+                    continue
+                if time.time() >= deadline:
+                    raise PageLocked(f"Seite {self.page_id} ist gesperrt ({self.path})")
+                time.sleep(0.2)
+                continue
+
+            with os.fdopen(fd, 'w') as f:
+                f.write(f"{os.getpid()} {time.strftime('%Y-%m-%dT%H:%M:%S')}\n")
+            self.locked = True
+            return self
+
+    def release(self):
+        if self.locked:
+            self.path.unlink(missing_ok=True)
+            self.locked = False
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def backup_prefix(prefix, page_id):
+    """Backup-Präfix pro Seite (die Hauptseite behält das bisherige Präfix für emergency_restore)"""
+    return prefix if str(page_id) == str(PAGE_ID) else f"{prefix}_{page_id}"
+
+
+def split_page_ids(values):
+    """['1,2', '3'] -> ['1', '2', '3'] (Reihenfolge bleibt, Duplikate entfallen)"""
+    page_ids = []
+    for value in values or []:
+        for page_id in str(value).split(','):
+            page_id = page_id.strip()
+            if page_id and page_id not in page_ids:
+                page_ids.append(page_id)
+    return page_ids
+
+
+def search_page_ids(confluence_sso, cql, batch_size=50):
+    """Alle Seiten-IDs eines CQL-Selektors (seitenweise abgefragt, ohne Body)"""
+    from core.bulk_fetch import iter_search
+
+    return [str(page['id']) for page in iter_search(confluence_sso, cql, expand=None, limit=batch_size)]
+
+
+def shard_pages(confluence_sso, parent_id, parent_title):
+    """Unterseiten einer aufgeteilten Tabelle: Teil -> {'id', 'title'} (ohne Body)"""
+    from core.bulk_fetch import iter_children
+
+    prefix = parent_title + SHARD_TITLE_SEPARATOR
+    shards = {}
+    for child in iter_children(confluence_sso, parent_id, expand=None, limit=100):
+        if child['title'].startswith(prefix):
+            shards[child['title'][len(prefix):]] = {'id': str(child['id']), 'title': child['title']}
+    return shards
+
+
+def resolve_page_ids(confluence_sso=None, page_ids=None, cql=None):
+    """
+    Seitenmenge eines Laufs
+
+    Explizite IDs und CQL-Treffer werden vereinigt; ohne Angaben gelten
+    RACOON_PAGE_CQL bzw. RACOON_PAGE_IDS (Standard: die RACOON Publikationsseite).
+    """
+    if not page_ids and not cql:
+        page_ids, cql = (None, PAGE_CQL) if PAGE_CQL else (PAGE_IDS, None)
+
+    resolved = split_page_ids(page_ids)
+    if cql:
+        if confluence_sso is None:
+            raise ValueError("CQL-Selektor braucht eine angemeldete ConfluenceSSO-Session")
+        for page_id in search_page_ids(confluence_sso, cql):
+            if page_id not in resolved:
+                resolved.append(page_id)
+    return resolved
+
+
+class PageSet:
+    """
+    Menge von Publikationsseiten einer Session
+
+    Args:
+        confluence_sso: Angemeldete ConfluenceSSO-Instanz
+        page_ids: Seiten-IDs
+        max_workers: Parallele Seiten
+        page_cache: Gemeinsamer PageCache (Standard: neu, groß genug für alle Seiten)
+        lock_dir: Verzeichnis der Sperrdateien
+    """
+
+    def __init__(self, confluence_sso, page_ids, max_workers=MAX_WORKERS, page_cache=None, lock_dir=LOCK_DIR):
+        from core.page_cache import PageCache
+
+        self.confluence_sso = confluence_sso
+        self.page_ids = [str(page_id) for page_id in page_ids]
+        self.requested_ids = list(self.page_ids)
+        self.workers = max_workers
+        self.max_workers = max(1, min(max_workers, len(self.page_ids) or 1))
+        self.pages = page_cache or PageCache(confluence_sso, max_pages=max(64, len(self.page_ids)))
+        self.lock_dir = lock_dir
+        self.shard_indexes = {}  # Index-Seite -> IDs ihrer Unterseiten
+
+    def __len__(self):
+        return len(self.page_ids)
+
+    def __iter__(self):
+        return iter(self.page_ids)
+
+    def _run(self, func, page_id, lock, lock_timeout):
+        started = time.perf_counter()
+        outcome = {'page_id': page_id, 'result': None, 'error': None}
+        try:
+            if lock:
+                with PageLock(page_id, self.lock_dir, lock_timeout):
+                    outcome['result'] = func(page_id)
+            else:
+                outcome['result'] = func(page_id)
+        except Exception as e:
+            outcome['error'] = str(e)
+            METRICS.count('page_set.errors')
+        outcome['seconds'] = time.perf_counter() - started
+        METRICS.observe('page_set.page', outcome['seconds'])
+        return outcome
+
+    def map(self, func, lock=False, lock_timeout=0):
+        """
+        Führt func(page_id) für alle Seiten parallel aus
+
+        Ein Fehler auf einer Seite bricht die anderen nicht ab.
+
+        Args:
+            func: Funktion mit der Seiten-ID als einzigem Argument
+            lock: Seiten während func sperren (für schreibende Läufe)
+            lock_timeout: Sekunden, die auf eine belegte Sperre gewartet wird
+
+        Returns:
+            Liste {page_id, result, error, seconds} in der Reihenfolge der Seitenmenge
+        """
+        if self.max_workers == 1:
+            return [self._run(func, page_id, lock, lock_timeout) for page_id in self.page_ids]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='page') as pool:
+            futures = [pool.submit(self._run, func, page_id, lock, lock_timeout) for page_id in self.page_ids]
+            return [future.result() for future in futures]
+
+    def prefetch(self, max_age=0):
+        """
+        Lädt alle Seiten gesammelt (wenige Such-Requests statt einem pro Seite)
+
+        Bei einer einzelnen Seite ist der bedingte Einzelabruf günstiger - dann leer.
+
+        Returns:
+            Dict Seiten-ID -> CachedPage der gesammelt geladenen/bestätigten Seiten
+        """
+        if len(self.page_ids) < 2:
+            return {}
+        from core.bulk_fetch import bulk_load
+
+        try:
+            return bulk_load(self.pages, self.page_ids, max_age)
+        except Exception as e:
+            # Einzelabruf als Rückfall (z.B. Instanz ohne CQL-Suche)
+            print(f"⚠️ Sammelabruf fehlgeschlagen, lade Seiten einzeln: {e}")
+            METRICS.count('page_set.bulk_errors')
+            return {}
+
+    def expand_shards(self):
+        """
+        Ersetzt Index-Seiten aufgeteilter Tabellen durch ihre Unterseiten
+
+        Nach dem Aufteilen (tools/sharding.py) steht auf der Hauptseite nur noch der
+        Index; Status, Cleanup, Backup und Discovery arbeiten dann auf den Unterseiten.
+        Geht immer von den ursprünglich angegebenen Seiten aus und kann daher erneut
+        aufgerufen werden (z.B. wenn ein neuer Teil angelegt wurde). Die Bodies landen
+        im PageCache und werden vom eigentlichen Lauf wiederverwendet.
+
+        Returns:
+            Dict Index-Seite -> Liste der Unterseiten-IDs
+        """
+        self.page_ids = list(self.requested_ids)
+        loaded = self.prefetch()
+
+        indexes = {}
+        page_ids = []
+        for page_id in self.requested_ids:
+            try:
+                page = loaded.get(page_id) or self.pages.get(page_id)
+            except Exception:
+                page = None  # Fehler meldet der eigentliche Lauf für diese Seite
+            if page is None or not SHARD_MODE_RE.search(page.content):
+                page_ids.append(page_id)
+                continue
+            indexes[page_id] = [shard['id'] for shard in shard_pages(self.confluence_sso, page_id, page.title).values()]
+            page_ids.extend(indexes[page_id])
+            METRICS.count('page_set.shard_indexes')
+
+        self.page_ids = list(dict.fromkeys(page_ids))
+        self.max_workers = max(1, min(self.workers, len(self.page_ids) or 1))
+        self.shard_indexes = indexes
+        return indexes
+
+    def load(self, max_age=0):
+        """Aktueller Stand aller Seiten (CachedPage je Ergebnis)"""
+        loaded = self.prefetch(max_age)
+        return self.map(lambda page_id: loaded.get(page_id) or self.pages.get(page_id, max_age))
+
+    def backup(self, prefix="racoon_publications_backup", backup_dir="backups"):
+        """Backup jeder Seite mit eigenem Präfix; Ergebnis = Pfad der Backup-Datei"""
+        def backup_one(page_id):
+            page = self.pages.get(page_id)
+            name = f"{backup_prefix(prefix, page_id)}_v{page.version}"
+            return self.confluence_sso.create_backup(page.content, name, backup_dir)
+        return self.map(backup_one)
+
+
+def add_page_arguments(parser):
+    """--page/--cql/--workers für Tools, die auf mehreren Seiten arbeiten"""
+    group = parser.add_argument_group("Seiten")
+    group.add_argument('--page', action='append', metavar='ID',
+                       help="Seiten-ID (mehrfach oder kommagetrennt; Standard: RACOON_PAGE_IDS)")
+    group.add_argument('--cql', help="CQL-Selektor, z.B. 'type = page AND title ~ \"Publikationen\"'")
+    group.add_argument('--workers', type=int, default=MAX_WORKERS, help="Parallel verarbeitete Seiten")
+
+
+def page_set_from_args(args, confluence_sso):
+    """PageSet aus --page/--cql/--workers; aufgeteilte Tabellen als ihre Unterseiten (leere Menge -> ValueError)"""
+    page_ids = resolve_page_ids(confluence_sso, args.page, args.cql)
+    if not page_ids:
+        raise ValueError("Keine Seiten gefunden (--page/--cql prüfen)")
+    page_set = PageSet(confluence_sso, page_ids, args.workers)
+    page_set.expand_shards()
+    return page_set
+
+
+def print_page_summary(outcomes, describe):
+    """
+    Eine Zeile pro Seite
+
+    Args:
+        outcomes: Ergebnis von PageSet.map
+        describe: Funktion result -> Text für erfolgreiche Seiten
+    """
+    for outcome in outcomes:
+        if outcome['error']:
+            print(f"   ❌ {outcome['page_id']:<12} {outcome['error']}")
+        else:
+            print(f"   ✅ {outcome['page_id']:<12} {describe(outcome['result'])} ({outcome['seconds']:.1f}s)")
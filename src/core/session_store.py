@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistente Confluence-Session
+Speichert das Cookie-Jar mit Zeitpunkt der letzten Prüfung, damit Tools ohne
+erneuten Test-Request starten; abgelaufene Sessions werden an 401/Login-Redirects erkannt
+"""
+
+import os
+import json
+import time
+from pathlib import Path
+
+# Suchreihenfolge für die Anmeldedaten (erste vorhandene Datei gewinnt)
+CREDENTIAL_PATHS = (
+    Path('config') / 'confluence_credentials.json',
+    Path('confluence_credentials.json'),
+)
+SESSION_FILE = Path('config') / '.confluence_session.json'
+
+# Platzhalter aus der Vorlage config/confluence_credentials.json
+COOKIE_PLACEHOLDER = "Bitte_Cookies_hier_eingeben"
+
+# Innerhalb dieser Zeit gilt eine geprüfte Session ohne neuen Test-Request als gültig
+VALIDATION_TTL = 15 * 60
+
+# Günstigster Endpunkt für die Prüfung (kleine Antwort, keine Space-Liste)
+PROBE_PATH = 'rest/api/user/current'
+
+# Ziele von Login-Redirects (Seraph-Login, SAML/OpenID SSO)
+LOGIN_MARKERS = ('login.action', '/saml', '/openid', '/plugins/servlet/samlsso', 'os_destination=')
+
+
+class SessionExpired(Exception):
+    """Die Confluence-Session ist abgelaufen (401 oder Umleitung auf die Login-Seite)"""
+
+
+def find_credentials_file(base_dir=None):
+    """Erste vorhandene Anmeldedaten-Datei (config/ vor ./) oder None"""
+    base_dir = Path(base_dir) if base_dir else Path.cwd()
+    for relative in CREDENTIAL_PATHS:
+        path = base_dir / relative
+        if path.exists():
+            return path
+    return None
+
+
+def load_saved_cookies(base_dir=None):
+    """
+    Cookie-Header aus confluence_credentials.json (config/ vor ./)
+
+    Returns:
+        Cookie-Header (str) oder None
+    """
+    path = find_credentials_file(base_dir)
+    if path is None:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cookies = json.load(f).get('cookies')
+    except (json.JSONDecodeError, OSError, AttributeError):
+        return None
+    if not cookies or cookies == COOKIE_PLACEHOLDER:
+        return None
+    return cookies
+
+
+def save_cookies(cookie_header, base_dir=None):
+    """Speichert einen Cookie-Header in config/confluence_credentials.json"""
+    base_dir = Path(base_dir) if base_dir else Path.cwd()
+    path = find_credentials_file(base_dir) or base_dir / CREDENTIAL_PATHS[0]
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = {}
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            data = {}
+    data['cookies'] = cookie_header
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+def parse_cookie_header(cookie_header):
+    """'Cookie: a=1; b=2' -> {'a': '1', 'b': '2'}"""
+    if cookie_header.startswith('Cookie: '):
+        cookie_header = cookie_header[8:]
+
+    cookies = {}
+    for cookie in cookie_header.split(';'):
+        if '=' in cookie:
+            name, value = cookie.strip().split('=', 1)
+            cookies[name] = value
+    return cookies
+
+
+def is_login_response(response):
+    """True bei 401 oder einer Umleitung auf eine Login-Seite"""
+    if response.status_code == 401:
+        return True
+    if response.is_redirect:
+        location = response.headers.get('Location', '')
+        return any(marker in location for marker in LOGIN_MARKERS)
+    return any(marker in response.url for marker in LOGIN_MARKERS)
+
+
+class SessionStore:
+    """
+    Cookie-Jar einer Confluence-Instanz auf der Platte
+
+    Args:
+        path: Session-Datei (Standard: config/.confluence_session.json)
+        ttl: Sekunden, die eine Prüfung gültig bleibt
+    """
+
+    def __init__(self, path=SESSION_FILE, ttl=VALIDATION_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+
+    def load(self, base_url):
+        """Gespeicherter Zustand für base_url oder None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return None
+        if state.get('base_url') != base_url:
+            return None
+        return state
+
+    def is_fresh(self, state, now=None):
+        """Prüfung jünger als ttl und kein Cookie abgelaufen"""
+        now = now or time.time()
+        if not state or now - state.get('validated', 0) > self.ttl:
+            return False
+        expires = state.get('expires')
+        return expires is None or expires > now
+
+    def save(self, session, base_url, validated=None):
+        """Speichert das Cookie-Jar einer requests-Session (nur für den Benutzer lesbar)"""
+        cookies = []
+        expiries = []
+        for cookie in session.cookies:
+            cookies.append({
+                'name': cookie.name, 'value': cookie.value,
+                'domain': cookie.domain, 'path': cookie.path, 'expires': cookie.expires
+            })
+            if cookie.expires:
+                expiries.append(cookie.expires)
+
+        state = {
+            'base_url': base_url,
+            'validated': validated or time.time(),
+            'expires': min(expiries) if expiries else None,
+            'cookies': cookies
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, self.path)
+        return state
+
+    def apply(self, state, session):
+        """Setzt die gespeicherten Cookies in eine requests-Session"""
+        for cookie in state.get('cookies', []):
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain') or '', path=cookie.get('path') or '/',
+                expires=cookie.get('expires')
+            )
+
+    def invalidate(self):
+        """Markiert die Session als ungeprüft (nächster Start prüft erneut)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return
+        state['validated'] = 0
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
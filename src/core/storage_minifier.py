@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Confluence Storage-Format Minifier
+Entfernt überflüssigen Whitespace in einem Durchlauf, ohne Code-Makros zu verändern
+"""
+
+import re
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core.body_buffer import BodyBuffer
+
+TOKEN_RE = re.compile(
+    r'(?P<cdata><!\[CDATA\[.*?\]\]>)'
+    r'|(?P<comment><!--.*?-->)'
+    r'|<(?P<closing>/?)(?P<tag>[A-Za-z][\w:.-]*)(?P<attrs>[^>]*)>'
+    r'|(?P<text>[^<]+|<)',
+    re.DOTALL
+)
+# Nur ASCII-Whitespace: geschützte Leerzeichen (U+00A0 u.ä.) sind Inhalt und bleiben erhalten
+WHITESPACE_RE = re.compile(r'\s+', re.ASCII)
+
+# Byte-Varianten für BodyBuffer/BodyRope (\s ist dort ohnehin nur ASCII)
+TOKEN_BYTES_RE = re.compile(TOKEN_RE.pattern.encode('ascii'), re.DOTALL)
+WHITESPACE_BYTES_RE = re.compile(rb'\s+')
+
+# Elemente, deren Inhalt Whitespace-signifikant ist
+PRESERVE_ELEMENTS = {
+    'pre', 'code', 'textarea', 'ac:plain-text-body', 'ac:plain-text-link-body'
+}
+
+# Block-Elemente: Whitespace direkt davor/danach hat keine Bedeutung
+BLOCK_ELEMENTS = {
+    'p', 'div', 'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th', 'colgroup', 'col',
+    'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'br', 'blockquote',
+    'ac:structured-macro', 'ac:parameter', 'ac:rich-text-body', 'ac:layout',
+    'ac:layout-section', 'ac:layout-cell', 'ac:task-list', 'ac:task', 'ac:task-id',
+    'ac:task-status', 'ac:task-body', 'ac:placeholder'
+}
+
+
+def iter_minified(content):
+    """
+    Liefert den minimierten Storage-Format Body als Folge von Abschnitten
+
+    Text außerhalb von Code-Elementen wird auf einzelne Leerzeichen reduziert;
+    Whitespace an Block-Grenzen entfällt ganz. CDATA, Kommentare und Inhalte
+    von <pre>/<ac:plain-text-body> bleiben unverändert.
+
+    content darf auch ein BodyBuffer oder BodyRope sein: die Abschnitte werden dann
+    nacheinander als Bytes verarbeitet (Abschnittsgrenzen liegen auf Tag-Grenzen)
+    und die Ausgabe besteht aus Bytes.
+    """
+    binary = not isinstance(content, str)
+    segments = content.segments() if binary else (content,)
+    token_re, whitespace_re = (TOKEN_BYTES_RE, WHITESPACE_BYTES_RE) if binary else (TOKEN_RE, WHITESPACE_RE)
+    space = b' ' if binary else ' '
+
+    preserve_depth = 0
+    pending = None          # noch nicht ausgegebener Text (wartet auf das nächste Tag)
+    after_block = True      # vorheriges Tag war ein Block-Element (oder Dokumentanfang)
+
+    for match in (match for segment in segments for match in token_re.finditer(segment)):
+        text = match.group('text')
+
+        if text is not None:
+            if preserve_depth:
+                yield text
+            else:
+                text = whitespace_re.sub(space, text)
+                pending = text if pending is None else whitespace_re.sub(space, pending + text)
+            continue
+
+        tag = match.group('tag')
+        if tag is None:
+            # CDATA / Kommentar: unverändert übernehmen
+            if pending is not None:
+                yield pending.lstrip(space) if after_block else pending
+                pending = None
+            after_block = False
+            yield match.group()
+            continue
+
+        name = tag.lower().decode('ascii') if binary else tag.lower()
+        is_block = name in BLOCK_ELEMENTS
+
+        if pending is not None:
+            if after_block:
+                pending = pending.lstrip(space)
+            if is_block:
+                pending = pending.rstrip(space)
+            if pending:
+                yield pending
+            pending = None
+
+        yield match.group()
+
+        if name in PRESERVE_ELEMENTS and not match.group('attrs').endswith(b'/' if binary else '/'):
+            preserve_depth += -1 if match.group('closing') else 1
+            preserve_depth = max(0, preserve_depth)
+
+        after_block = is_block
+
+    if pending:
+        yield pending.strip(space) if after_block else pending.rstrip(space)
+
+
+def minify_storage(content, report=False):
+    """
+    Minimiert einen Storage-Format Body
+
+    Args:
+        content: Storage-Format Body (str, BodyBuffer oder BodyRope)
+        report: True liefert zusätzlich ein Dict mit bytes_before/bytes_after/bytes_saved
+
+    Returns:
+        Minimierter Body - str bzw. ein neuer BodyBuffer
+        (oder Tuple (Body, Report) bei report=True)
+    """
+    if isinstance(content, str):
+        minified = ''.join(iter_minified(content))
+        if not report:
+            return minified
+        bytes_before = len(content.encode('utf-8'))
+        bytes_after = len(minified.encode('utf-8'))
+    else:
+        minified = BodyBuffer.from_chunks(iter_minified(content))
+        if not report:
+            return minified
+        bytes_before, bytes_after = len(content), len(minified)
+
+    return minified, {
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+        'bytes_saved': bytes_before - bytes_after
+    }
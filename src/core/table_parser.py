@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Tabellen-Parser
+Zerlegt den Storage-Format Body in Zeilen und Zellen (ein linearer Durchlauf)
+"""
+
+import re
+import html
+from core.instrumentation import timed
+
+# Nur die Tabellen-Tags sind für das Zeilenmodell relevant (CDATA wird übersprungen)
+TAG_RE = re.compile(
+    r'<!\[CDATA\[.*?\]\]>|<(/?)(table|tr|td|th)\b[^>]*?(/?)>',
+    re.IGNORECASE | re.DOTALL
+)
+# Dasselbe Muster für BodyBuffer (Regex direkt auf dem mmap, Offsets in Bytes)
+TAG_BYTES_RE = re.compile(TAG_RE.pattern.encode('ascii'), re.IGNORECASE | re.DOTALL)
+STRIP_TAGS_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Spalten der RACOON Publikationstabelle
+FIELD_NAMES = ["Nummer", "Jahr/Monat", "Standort", "Personen", "Förderhinweis", "PubMed DOI"]
+
+# Zellinhalte, die als "leer" gelten
+PLACEHOLDERS = {'', 'tbd', 'n/a', '-', '????/??', '?', 'todo'}
+
+YEAR_MONTH_RE = re.compile(r'(\d{4})\s*(?:/\s*(\d{1,2}|\?\?))?')
+FOERDER_RE = re.compile(r'\b(JA|NEIN)\b\s*(\d+)?', re.IGNORECASE)
+DOI_RE = re.compile(r'\b(10\.\d{4,9}/[^\s<>"]+)')
+PMID_RE = re.compile(r'pubmed\.ncbi\.nlm\.nih\.gov/(\d+)')
+
+
+def cell_text(raw):
+    """Klartext einer Zelle (Tags entfernt, Entities aufgelöst, Whitespace normalisiert)"""
+    text = STRIP_TAGS_RE.sub(' ', raw) if '<' in raw else raw
+    if '&' in text:
+        text = html.unescape(text).replace('\xa0', ' ')
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+class TableCell:
+    """Eine Zelle als Offsets in den Body"""
+
+    __slots__ = ('start', 'end', 'inner_start', 'inner_end', 'header')
+
+    def __init__(self, start, inner_start, header):
+        self.start = start
+        self.inner_start = inner_start
+        self.inner_end = inner_start
+        self.end = inner_start
+        self.header = header
+
+
+class TableRow:
+    """Eine Tabellenzeile als Offsets in den Body, Zelltexte werden lazy berechnet"""
+
+    __slots__ = ('index', 'table_index', 'start', 'end', 'cells', '_content', '_texts')
+
+    def __init__(self, content, index, table_index, start):
+        self._content = content
+        self.index = index
+        self.table_index = table_index
+        self.start = start
+        self.end = start
+        self.cells = []
+        self._texts = None
+
+    @property
+    def raw(self):
+        """Storage-Format der kompletten Zeile"""
+        return self._content[self.start:self.end]
+
+    @property
+    def is_header(self):
+        return any(cell.header for cell in self.cells)
+
+    def cell_raw(self, i):
+        cell = self.cells[i]
+        return self._content[cell.inner_start:cell.inner_end]
+
+    @property
+    def texts(self):
+        """Klartexte aller Zellen"""
+        if self._texts is None:
+            self._texts = [cell_text(self.cell_raw(i)) for i in range(len(self.cells))]
+        return self._texts
+
+    def text(self, i, default=''):
+        texts = self.texts
+        return texts[i] if i < len(texts) else default
+
+
+class PublicationTable:
+    """Zeilenmodell eines Storage-Format Bodys"""
+
+    def __init__(self, content, rows):
+        self.content = content
+        self.rows = rows
+
+    @property
+    def header_rows(self):
+        return [row for row in self.rows if row.is_header]
+
+    @property
+    def data_rows(self):
+        return [row for row in self.rows if not row.is_header]
+
+    @property
+    def headers(self):
+        """Spaltenüberschriften der ersten Header-Zeile"""
+        header_rows = self.header_rows
+        return header_rows[0].texts if header_rows else []
+
+    def __len__(self):
+        return len(self.rows)
+
+
+@timed('parse.table', items=lambda table: len(table.rows), size=lambda table: len(table.content))
+def parse_table(content):
+    """
+    Zerlegt alle Zeilen der äußeren Tabellen eines Storage-Format Bodys
+
+    Verschachtelte Tabellen innerhalb von Zellen werden als Zellinhalt behandelt.
+    Nicht geschlossene Zeilen/Zellen werden am nächsten passenden Tag beendet.
+    content darf auch ein BodyBuffer sein: dann sind alle Offsets Byte-Offsets in
+    den gemappten Body und Zelltexte werden erst beim Zugriff dekodiert.
+    """
+    from core.body_buffer import BodyBuffer  # erst hier: mmap/tempfile/Codec nicht beim Import laden
+
+    rows = []
+    depth = 0
+    table_index = -1
+    row = None
+    cell = None
+
+    binary = isinstance(content, BodyBuffer)
+    matches = content.finditer(TAG_BYTES_RE) if binary else TAG_RE.finditer(content)
+
+    for match in matches:
+        if match.group(2) is None:
+            continue  # CDATA-Abschnitt (z.B. Code-Makro)
+        
+        closing, tag, self_closing = match.group(1), match.group(2).lower(), match.group(3)
+        if binary:
+            tag = tag.decode('ascii')
+
+        if tag == 'table':
+            if self_closing:
+                continue
+            if not closing:
+                depth += 1
+                if depth == 1:
+                    table_index += 1
+            else:
+                if depth == 1:
+                    # Offene Zeile/Zelle am Tabellenende abschließen
+                    if cell is not None:
+                        cell.inner_end = cell.end = match.start()
+                        cell = None
+                    if row is not None:
+                        row.end = match.start()
+                        row = None
+                depth = max(0, depth - 1)
+            continue
+
+        if depth != 1:
+            continue
+
+        if tag == 'tr':
+            if cell is not None:
+                cell.inner_end = cell.end = match.start()
+                cell = None
+            if not closing:
+                if row is not None:
+                    row.end = match.start()
+                row = TableRow(content, len(rows), table_index, match.start())
+                rows.append(row)
+            elif row is not None:
+                row.end = match.end()
+                row = None
+        else:
+            if row is None:
+                continue
+            if not closing:
+                if cell is not None:
+                    cell.inner_end = cell.end = match.start()
+                cell = TableCell(match.start(), match.end(), tag == 'th')
+                if self_closing:
+                    row.cells.append(cell)
+                    cell = None
+                    continue
+                row.cells.append(cell)
+            elif cell is not None:
+                cell.inner_end = match.start()
+                cell.end = match.end()
+                cell = None
+
+    return PublicationTable(content, rows)
+
+
+def _as_int(text):
+    return int(text) if text and text.isdigit() else None
+
+
+def publication_fields(row):
+    """
+    Extrahiert die typisierten Felder einer Datenzeile
+
+    Returns:
+        Dict mit nummer, year, month, standort, personen, foerder_flag,
+        foerder_nummer, doi, pmid, title (fehlende Werte als None)
+    """
+    # DOI/PMID auch aus Links (href) lesen, nicht nur aus dem Klartext
+    raw_doi_cell = row.cell_raw(5) if len(row.cells) > 5 else ''
+    return fields_from_texts([row.text(i) for i in range(len(FIELD_NAMES))], raw_doi_cell)
+
+
+def fields_from_texts(texts, raw_doi_cell=''):
+    """
+    Wie publication_fields, aber aus den Zelltexten (z.B. aus einem Zeilen-Diff)
+
+    Args:
+        texts: Zelltexte in Spaltenreihenfolge (fehlende Spalten als '')
+        raw_doi_cell: Storage-Format der DOI-Zelle (für DOI/PMID aus Links)
+    """
+    texts = list(texts) + [''] * (len(FIELD_NAMES) - len(texts))
+    nummer_text, jahr_monat, standort, personen, foerder, pubmed_doi = texts[:len(FIELD_NAMES)]
+
+    year = month = None
+    match = YEAR_MONTH_RE.search(jahr_monat)
+    if match:
+        year = int(match.group(1))
+        month = _as_int(match.group(2))
+
+    foerder_flag = foerder_nummer = None
+    match = FOERDER_RE.search(foerder)
+    if match:
+        foerder_flag = match.group(1).upper()
+        foerder_nummer = _as_int(match.group(2))
+
+    match = DOI_RE.search(pubmed_doi) or DOI_RE.search(raw_doi_cell)
+    doi = match.group(1).rstrip('.,;') if match else None
+
+    match = PMID_RE.search(pubmed_doi) or PMID_RE.search(raw_doi_cell)
+    pmid = int(match.group(1)) if match else None
+
+    title = pubmed_doi.split('. DOI:', 1)[0].split(' DOI:', 1)[0].strip() or None
+
+    return {
+        'nummer': _as_int(nummer_text),
+        'year': year,
+        'month': month,
+        'standort': standort if standort.lower() not in PLACEHOLDERS else None,
+        'personen': personen or None,
+        'foerder_flag': foerder_flag,
+        'foerder_nummer': foerder_nummer,
+        'doi': doi,
+        'pmid': pmid,
+        'title': title,
+    }
+
+
+def publication_identifiers(table):
+    """
+    Sammelt DOIs (kleingeschrieben) und PMIDs aller Datenzeilen für den Duplikat-Abgleich
+
+    Returns:
+        Tuple (Set DOIs, Set PMIDs als int)
+    """
+    dois = set()
+    pmids = set()
+
+    for row in table.data_rows:
+        if len(row.cells) <= 5:
+            continue
+
+        # Rohzelle statt Klartext: DOI/PMID stehen auch in Links (href)
+        raw = row.cell_raw(5)
+        for match in DOI_RE.finditer(raw):
+            dois.add(match.group(1).rstrip('.,;').lower())
+        for match in PMID_RE.finditer(raw):
+            pmids.add(int(match.group(1)))
+
+    return dois, pmids
@@ -0,0 +1,4 @@
+# Fakes für Offline-Tests und Benchmarks
+"""
+Lokale Nachbildungen externer Dienste (Confluence REST API)
+"""
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemeinsame Transport-Schicht der Fakes
+Ein Fake implementiert handle(method, path, query, headers, body) -> (status, headers, body);
+ausgeliefert wird er per HTTP-Server oder in-process über einen requests-Adapter
+"""
+
+import gzip
+import threading
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from requests.adapters import BaseAdapter
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+except ImportError:
+    BaseAdapter = object
+
+
+def _make_handler(fake):
+    """Request-Handler-Klasse, die an einen Fake delegiert"""
+
+    class FakeHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True  # Header und Body gehen getrennt raus
+
+        def _dispatch(self):
+            url = urlsplit(self.path)
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else None
+
+            status, headers, payload = fake.handle(
+                self.command, url.path, parse_qs(url.query), dict(self.headers), body
+            )
+
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_PUT = do_POST = do_DELETE = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeHandler
+
+
+class FakeServer:
+    """HTTP-Server für einen Fake (Hintergrund-Thread, Port 0 = frei wählen)"""
+
+    def __init__(self, fake, host='127.0.0.1', port=0):
+        self.fake = fake
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(fake))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FakeAdapter(BaseAdapter):
+    """requests-Adapter: beantwortet Session-Requests direkt aus einem Fake (ohne Sockets)"""
+
+    def __init__(self, fake):
+        super().__init__()
+        self.fake = fake
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        elif body is not None and not isinstance(body, bytes):
+            body = b''.join(body)  # gestreamter Body (z.B. JsonStringPayload)
+
+        status, headers, payload = self.fake.handle(
+            request.method, url.path, parse_qs(url.query), dict(request.headers), body
+        )
+
+        headers = dict(headers)
+        headers['Content-Length'] = str(len(payload))  # wie über HTTP: Bytes auf der Leitung
+        if headers.get('Content-Encoding') == 'gzip':
+            payload = gzip.decompress(payload)  # wie urllib3: transparent entpackt, Header bleibt
+
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = payload
+        response._content_consumed = True  # Body liegt schon vor; close() hat nichts zu schließen
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.reason = HTTPStatus(status).phrase
+        return response
+
+    def close(self):
+        pass
+
+
+def attach_fake(session, fake, base_url):
+    """Leitet alle Requests einer requests-Session auf base_url in den Fake um"""
+    session.mount(base_url, FakeAdapter(fake))
+    return session
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lokaler Confluence REST Fake
+Bildet /rest/api/space, /rest/api/content/{id} (GET/PUT mit Versionierung),
+POST /rest/api/content, /rest/api/content/{id}/child/page und
+/rest/api/content/search (einfache CQL) nach - mit ETag/Last-Modified, 304 und gzip,
+wahlweise als HTTP-Server oder in-process als requests-Adapter (siehe fakes.base)
+"""
+
+import re
+import sys
+import gzip
+import json
+import time
+import random
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import PAGE_ID, PAGE_TITLE
+from fakes.base import FakeServer
+from fakes.table_generator import generate_table
+
+CONTENT_PATH_RE = re.compile(r'^/rest/api/content/(\d+)/?$')
+SPACE_PATH = '/rest/api/space'
+SEARCH_PATH = '/rest/api/content/search'
+CREATE_PATH = '/rest/api/content'
+CHILD_PATH_RE = re.compile(r'^/rest/api/content/(\d+)/child/page/?$')
+USER_PATH = '/rest/api/user/current'
+LOGIN_PATH = '/login.action'
+
+# Unterstützte CQL-Klauseln (mit AND verknüpft): type = page, space = X, space in (X, Y),
+# id = N, id in (N, M), parent = N, title = "x", title ~ "x"
+CQL_CLAUSE_RE = re.compile(r'^\s*(type|space|id|parent|title)\s*(=|~|in)\s*(.+?)\s*$', re.IGNORECASE)
+CQL_AND_RE = re.compile(r'\s+and\s+', re.IGNORECASE)
+
+# Antworten ab dieser Größe werden komprimiert (wie ein gzip-Filter vor Confluence)
+COMPRESS_MIN_SIZE = 1024
+
+
+class FakeConfluence:
+    """
+    Zustand und Request-Verarbeitung des Fakes (ohne Netzwerk)
+
+    Args:
+        latency: Feste Verzögerung pro Request (Sekunden)
+        jitter: Zusätzliche zufällige Verzögerung (0..jitter Sekunden)
+        bytes_per_second: Simulierte Bandbreite für Antwort- und Request-Bodies (None = unbegrenzt)
+        error_rate: Wahrscheinlichkeit für einen injizierten Fehler pro Request
+        error_status: HTTP-Status der injizierten Fehler
+        require_cookie: Cookie-Name, ohne den 401 geliefert wird (None = keine Prüfung)
+        login_redirect: Ohne gültige Session auf /login.action umleiten (302, wie SSO) statt 401
+        seed: Seed für Jitter und Fehlerinjektion (reproduzierbare Läufe)
+        validators: ETag/Last-Modified für Seiten liefern und 304 beantworten
+        compression: Antworten gzip-komprimieren, wenn der Client es anbietet
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, bytes_per_second=None, error_rate=0.0,
+                 error_status=503, require_cookie=None, login_redirect=False, seed=0,
+                 validators=True, compression=True):
+        self.latency = latency
+        self.jitter = jitter
+        self.bytes_per_second = bytes_per_second
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.require_cookie = require_cookie
+        self.login_redirect = login_redirect
+        self.validators = validators
+        self.compression = compression
+        self.session_valid = True
+
+        self.pages = {}
+        self.spaces = [{'key': 'RACOON', 'name': 'RACOON', 'type': 'global'}]
+        self.stats = {'requests': 0, 'errors_injected': 0, 'conflicts': 0, 'not_modified': 0,
+                      'bytes_sent': 0, 'by_endpoint': {}}
+
+        self._random = random.Random(seed)
+        self._forced_errors = []
+        self._lock = threading.Lock()
+
+    # --- Seiten verwalten ---
+
+    def add_page(self, page_id, title, body, version=1, space_key='RACOON', parent_id=None):
+        """Legt eine Seite an (oder ersetzt sie)"""
+        with self._lock:
+            if not any(space['key'] == space_key for space in self.spaces):
+                self.spaces.append({'key': space_key, 'name': space_key, 'type': 'global'})
+            self.pages[str(page_id)] = {
+                'id': str(page_id),
+                'title': title,
+                'space': space_key,
+                'parent': str(parent_id) if parent_id else None,
+                'body': body,
+                'version': version,
+                'when': datetime.now().isoformat(timespec='seconds'),
+                'history': [(version, body)]
+            }
+        return self.pages[str(page_id)]
+
+    def add_generated_page(self, page_id=PAGE_ID, rows=100, title=PAGE_TITLE, seed=0, space_key='RACOON'):
+        """Legt eine Publikationsseite mit synthetischer Tabelle an (siehe fakes.table_generator)"""
+        return self.add_page(page_id, title, generate_table(rows, seed), space_key=space_key)
+
+    def page_body(self, page_id, version=None):
+        """Aktueller (oder historischer) Body einer Seite"""
+        page = self.pages[str(page_id)]
+        if version is None:
+            return page['body']
+        return dict(page['history'])[version]
+
+    def expire_session(self):
+        """Simuliert eine abgelaufene Session (nur mit require_cookie wirksam)"""
+        self.session_valid = False
+
+    def fail_next(self, status=500, count=1):
+        """Die nächsten count Requests schlagen mit status fehl"""
+        with self._lock:
+            self._forced_errors.extend([status] * count)
+
+    # --- Request-Verarbeitung ---
+
+    def handle(self, method, path, query=None, headers=None, body=None):
+        """
+        Verarbeitet einen Request
+
+        Args:
+            method: HTTP-Methode
+            path: URL-Pfad (z.B. /rest/api/content/165485055)
+            query: Dict Parameter -> Liste von Werten (wie parse_qs)
+            headers: Request-Header (Dict)
+            body: Request-Body (bytes)
+
+        Returns:
+            Tuple (status, headers, body bytes)
+        """
+        query = query or {}
+        headers = headers or {}
+        route = path.rstrip('/') or '/'
+        route = CHILD_PATH_RE.sub('/rest/api/content/{id}/child/page', route)
+        endpoint = f"{method} {CONTENT_PATH_RE.sub('/rest/api/content/{id}', route)}"
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['by_endpoint'][endpoint] = self.stats['by_endpoint'].get(endpoint, 0) + 1
+            forced = self._forced_errors.pop(0) if self._forced_errors else None
+            if forced is None and self.error_rate and self._random.random() < self.error_rate:
+                forced = self.error_status
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+        if body and self.bytes_per_second:
+            delay += len(body) / self.bytes_per_second
+
+        if forced is not None:
+            with self._lock:
+                self.stats['errors_injected'] += 1
+            self._sleep(delay)
+            return self._error(forced, "Injected error")
+
+        authenticated = not self.require_cookie or (
+            self.session_valid and f"{self.require_cookie}=" in headers.get('Cookie', '')
+        )
+        route = path.rstrip('/') or '/'
+        if not authenticated and route not in (USER_PATH, LOGIN_PATH):
+            self._sleep(delay)
+            if self.login_redirect:
+                return 302, {'Location': f"{LOGIN_PATH}?os_destination={path}"}, b''
+            return self._error(401, "Not authenticated")
+
+        if route == USER_PATH and method == 'GET':
+            # Wie Confluence: ohne Session 200 mit anonymem Benutzer
+            user = {'type': 'known', 'username': 'racoon-fake', 'displayName': 'RACOON Fake'}
+            payload = user if authenticated else {'type': 'anonymous'}
+            self._sleep(delay)
+            return 200, {'Content-Type': 'application/json;charset=UTF-8'}, json.dumps(payload).encode('utf-8')
+
+        if route == LOGIN_PATH:
+            self._sleep(delay)
+            return 200, {'Content-Type': 'text/html;charset=UTF-8'}, b'<html><body>Login</body></html>'
+
+        status, payload = self._route(method, path.rstrip('/') or '/', query, body)
+        response_body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        response_headers = {'Content-Type': 'application/json;charset=UTF-8'}
+
+        match = CONTENT_PATH_RE.match(route)
+        if self.validators and method == 'GET' and status == 200 and match:
+            status, response_headers, response_body = self._conditional(
+                self.pages[match.group(1)], headers, response_headers, response_body
+            )
+
+        if self.compression and len(response_body) >= COMPRESS_MIN_SIZE \
+                and 'gzip' in headers.get('Accept-Encoding', ''):
+            response_body = gzip.compress(response_body, compresslevel=6)
+            response_headers['Content-Encoding'] = 'gzip'
+
+        with self._lock:
+            self.stats['bytes_sent'] += len(response_body)
+        if self.bytes_per_second:
+            delay += len(response_body) / self.bytes_per_second
+        self._sleep(delay)
+
+        return status, response_headers, response_body
+
+    def _conditional(self, page, headers, response_headers, response_body):
+        """ETag (pro Repräsentation) und Last-Modified setzen; 304, wenn der Client aktuell ist"""
+        etag = '"' + hashlib.sha1(response_body).hexdigest()[:16] + '"'
+        modified = datetime.fromisoformat(page['when']).astimezone()
+        response_headers['ETag'] = etag
+        response_headers['Last-Modified'] = format_datetime(modified, usegmt=True)
+
+        if_none_match = headers.get('If-None-Match')
+        if if_none_match is not None:
+            fresh = etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        else:
+            fresh = False
+            since = headers.get('If-Modified-Since')
+            if since:
+                try:
+                    fresh = modified.replace(microsecond=0) <= parsedate_to_datetime(since)
+                except (TypeError, ValueError):
+                    fresh = False
+
+        if not fresh:
+            return 200, response_headers, response_body
+        with self._lock:
+            self.stats['not_modified'] += 1
+        del response_headers['Content-Type']
+        return 304, response_headers, b''
+
+    def _route(self, method, path, query, body):
+        if path == SPACE_PATH and method == 'GET':
+            return 200, {'results': list(self.spaces), 'start': 0, 'limit': 25, 'size': len(self.spaces)}
+
+        if path == SEARCH_PATH and method == 'GET':
+            return self._search(query)
+
+        if path == CREATE_PATH and method == 'POST':
+            return self._create_content(body)
+
+        match = CHILD_PATH_RE.match(path)
+        if match and method == 'GET':
+            return self._children(match.group(1), query)
+
+        match = CONTENT_PATH_RE.match(path)
+        if match:
+            if method == 'GET':
+                return self._get_content(match.group(1), query)
+            if method == 'PUT':
+                return self._put_content(match.group(1), body)
+            return 405, self._message(405, f"Method {method} not allowed")
+
+        return 404, self._message(404, f"No endpoint for {path}")
+
+    def _get_content(self, page_id, query):
+        page = self.pages.get(page_id)
+        if page is None:
+            return 404, self._message(404, f"No content found with id: {page_id}")
+
+        expand = set()
+        for value in query.get('expand', []):
+            expand.update(value.split(','))
+
+        return 200, self._content_json(page, expand)
+
+    def _search(self, query):
+        cql = (query.get('cql') or [''])[0]
+        try:
+            matches = self._cql_filter(cql)
+        except ValueError as e:
+            return 400, self._message(400, f"Could not parse cql : {cql} ({e})")
+
+        start = int((query.get('start') or [0])[0])
+        limit = int((query.get('limit') or [25])[0])
+        expand = set()
+        for value in query.get('expand', []):
+            expand.update(value.split(','))
+
+        results = [self._content_json(page, expand) for page in matches[start:start + limit]]
+        payload = {'results': results, 'start': start, 'limit': limit, 'size': len(results), '_links': {}}
+        if start + limit < len(matches):
+            payload['_links']['next'] = f"{SEARCH_PATH}?cql={cql}&start={start + limit}&limit={limit}"
+        return 200, payload
+
+    def _children(self, page_id, query):
+        if page_id not in self.pages:
+            return 404, self._message(404, f"No content found with id: {page_id}")
+
+        start = int((query.get('start') or [0])[0])
+        limit = int((query.get('limit') or [25])[0])
+        expand = set()
+        for value in query.get('expand', []):
+            expand.update(value.split(','))
+
+        with self._lock:
+            children = sorted((page for page in self.pages.values() if page['parent'] == page_id),
+                              key=lambda page: int(page['id']))
+        results = [self._content_json(page, expand) for page in children[start:start + limit]]
+        payload = {'results': results, 'start': start, 'limit': limit, 'size': len(results), '_links': {}}
+        if start + limit < len(children):
+            payload['_links']['next'] = f"/rest/api/content/{page_id}/child/page?start={start + limit}&limit={limit}"
+        return 200, payload
+
+    def _create_content(self, body):
+        try:
+            data = json.loads(body or b'{}')
+            title = data['title']
+            space_key = data['space']['key']
+            new_body = data['body']['storage']['value']
+        except (ValueError, KeyError, TypeError):
+            return 400, self._message(400, "Invalid content create payload")
+
+        ancestors = data.get('ancestors') or []
+        parent_id = str(ancestors[-1]['id']) if ancestors else None
+
+        with self._lock:
+            if parent_id and parent_id not in self.pages:
+                return 404, self._message(404, f"No content found with id: {parent_id}")
+            # Confluence: Titel sind pro Space eindeutig
+            if any(page['space'] == space_key and page['title'] == title for page in self.pages.values()):
+                return 400, self._message(400, f"A page with this title already exists: {title}")
+            page_id = str(max((int(pid) for pid in self.pages), default=100000) + 1)
+
+        page = self.add_page(page_id, title, new_body, space_key=space_key, parent_id=parent_id)
+        return 200, self._content_json(page, {'body.storage', 'version'})
+
+    def _cql_filter(self, cql):
+        """Seiten, die alle Klauseln erfüllen (sortiert nach ID)"""
+        tests = []
+        for clause in CQL_AND_RE.split(cql.strip()):
+            match = CQL_CLAUSE_RE.match(clause)
+            if not match:
+                raise ValueError(f"unsupported clause '{clause}'")
+            field, operator, value = match.group(1).lower(), match.group(2).lower(), match.group(3)
+            if operator == 'in':
+                values = {v.strip().strip('"\'') for v in value.strip('()').split(',')}
+            else:
+                values = {value.strip('"\'')}
+            tests.append((field, operator, values))
+
+        fields = {'type': lambda page: 'page', 'space': lambda page: page['space'],
+                  'id': lambda page: page['id'], 'parent': lambda page: page['parent'] or '',
+                  'title': lambda page: page['title']}
+        matches = []
+        with self._lock:
+            for page in self.pages.values():
+                for field, operator, values in tests:
+                    actual = fields[field](page)
+                    if operator == '~':
+                        if not any(v.lower() in actual.lower() for v in values):
+                            break
+                    elif actual not in values:
+                        break
+                else:
+                    matches.append(page)
+        return sorted(matches, key=lambda page: int(page['id']))
+
+    def _put_content(self, page_id, body):
+        try:
+            data = json.loads(body or b'{}')
+            new_version = int(data['version']['number'])
+            new_body = data['body']['storage']['value']
+        except (ValueError, KeyError, TypeError):
+            return 400, self._message(400, "Invalid content update payload")
+
+        with self._lock:
+            page = self.pages.get(page_id)
+            if page is None:
+                return 404, self._message(404, f"No content found with id: {page_id}")
+
+            # Confluence-Semantik: neue Version muss genau aktuelle Version + 1 sein
+            if new_version != page['version'] + 1:
+                self.stats['conflicts'] += 1
+                return 409, self._message(
+                    409, f"Version must be incremented on update. Current version is: {page['version']}"
+                )
+
+            page['version'] = new_version
+            page['body'] = new_body
+            page['title'] = data.get('title') or page['title']
+            page['when'] = datetime.now().isoformat(timespec='seconds')
+            page['history'].append((new_version, new_body))
+
+        return 200, self._content_json(page, {'body.storage', 'version'})
+
+    def _content_json(self, page, expand):
+        result = {
+            'id': page['id'],
+            'type': 'page',
+            'status': 'current',
+            'title': page['title'],
+            'space': {'key': page['space']},
+            'version': {'number': page['version'], 'when': page['when']},
+            '_links': {'webui': f"/pages/viewpage.action?pageId={page['id']}"}
+        }
+        if 'body.storage' in expand:
+            result['body'] = {'storage': {'value': page['body'], 'representation': 'storage'}}
+        if 'ancestors' in expand:
+            result['ancestors'] = [{'id': page['parent'], 'type': 'page'}] if page['parent'] else []
+        return result
+
+    def _error(self, status, message):
+        body = json.dumps(self._message(status, message)).encode('utf-8')
+        return status, {'Content-Type': 'application/json;charset=UTF-8'}, body
+
+    @staticmethod
+    def _message(status, message):
+        return {'statusCode': status, 'message': message}
+
+    @staticmethod
+    def _sleep(delay):
+        if delay > 0:
+            time.sleep(delay)
+
+
+def main():
+    """Startet den Fake als lokalen HTTP-Server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Lokaler Confluence REST Fake")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--page-id', default=PAGE_ID)
+    parser.add_argument('--rows', type=int, default=500, help="Zeilen der generierten Publikationstabelle")
+    parser.add_argument('--site-pages', type=int, default=0,
+                        help="Zusätzliche Standort-Seiten (IDs page-id+1.., Spaces SITE1..)")
+    parser.add_argument('--file', help="Storage-Format Datei als Seiteninhalt (statt generierter Tabelle)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Verzögerung pro Request in Sekunden")
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--bandwidth', type=int, help="Simulierte Bandbreite in Bytes/s")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--require-cookie', help="Cookie-Name, ohne den 401 geliefert wird (z.B. JSESSIONID)")
+    parser.add_argument('--login-redirect', action='store_true', help="Statt 401 auf /login.action umleiten")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-validators', action='store_true',
+                        help="Keine ETag/Last-Modified-Header (Instanz ohne bedingte Requests)")
+    parser.add_argument('--no-compression', action='store_true', help="Antworten nicht komprimieren")
+    args = parser.parse_args()
+
+    fake = FakeConfluence(
+        latency=args.latency, jitter=args.jitter, bytes_per_second=args.bandwidth,
+        error_rate=args.error_rate, error_status=args.error_status, require_cookie=args.require_cookie,
+        login_redirect=args.login_redirect, seed=args.seed,
+        validators=not args.no_validators, compression=not args.no_compression
+    )
+
+    if args.file:
+        fake.add_page(args.page_id, PAGE_TITLE, Path(args.file).read_text(encoding='utf-8'))
+    else:
+        fake.add_generated_page(args.page_id, args.rows, seed=args.seed)
+    for n in range(1, args.site_pages + 1):
+        fake.add_generated_page(str(int(args.page_id) + n), args.rows, f"Publikationen Standort {n}",
+                                seed=args.seed + n, space_key=f"SITE{n}")
+
+    server = FakeServer(fake, args.host, args.port)
+    size = len(fake.page_body(args.page_id))
+
+    print("🧪 Confluence Fake-Server")
+    print("=" * 50)
+    print(f"🌐 URL: {server.url}")
+    print(f"📄 Seite {args.page_id}: {size:,} Zeichen")
+    if args.site_pages:
+        print(f"📄 {args.site_pages} Standort-Seiten (CQL: type = page AND space in (SITE1, ...))")
+    print(f"💡 Tools umleiten mit: RACOON_CONFLUENCE_URL={server.url}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Beendet")
+        print(f"📊 Requests: {fake.stats['requests']} (Konflikte: {fake.stats['conflicts']}, "
+              f"injizierte Fehler: {fake.stats['errors_injected']}, 304: {fake.stats['not_modified']}, "
+              f"gesendet: {fake.stats['bytes_sent']:,} Bytes)")
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
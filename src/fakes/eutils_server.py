@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lokaler NCBI E-utilities Fake
+esearch/efetch/esummary/epost über einem synthetischen oder aufgezeichneten PubMed-XML Korpus,
+mit NCBI-Ratenlimit (429 über 3 bzw. 10 Requests/s) und WebEnv-History
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import threading
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from collections import deque
+from urllib.parse import parse_qs
+sys.path.append(str(Path(__file__).parent.parent))
+from fakes.base import FakeServer
+
+EUTILS_PATH = '/entrez/eutils/'
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Synthetischer Korpus: RACOON-Autoren/-Institutionen mischen sich mit fremden Publikationen
+RACOON_AUTHORS = [
+    ("Surov", "Alexey", "A"), ("Pech", "Maciej", "M"), ("Haag", "Florian", "F"),
+    ("Teichräber", "Ulf", "U"), ("Thormann", "Markus", "M"), ("Kardas", "Hakan", "H"),
+    ("Meyer", "Hans-Jonas", "HJ"), ("Güttler", "Felix", "F"), ("Lassen-Schmidt", "Bianca", "B"),
+    ("Krämer", "Martin", "M"), ("Renz", "Diane", "D")
+]
+OTHER_AUTHORS = [
+    ("Smith", "John", "J"), ("Garcia", "Maria", "M"), ("Chen", "Wei", "W"), ("Rossi", "Luca", "L"),
+    ("Müller", "Katrin", "K"), ("Schmidt", "Michael", "M"), ("Nguyen", "Anh", "A"),
+    ("Kowalski", "Piotr", "P"), ("Johansson", "Erik", "E"), ("Dubois", "Claire", "C"),
+    ("van der Berg", "Jan", "J"), ("O'Brien", "Sean", "S"), ("Tanaka", "Yuki", "Y")
+]
+RACOON_AFFILIATIONS = [
+    "Department of Radiology and Nuclear Medicine, University Hospital Magdeburg, Magdeburg, Germany",
+    "Otto-von-Guericke University Magdeburg, Magdeburg, Germany",
+    "Institute of Diagnostic and Interventional Radiology, Jena University Hospital, "
+    "Friedrich Schiller University, Jena, Germany",
+    "Department of Radiology, Charité - Universitätsmedizin Berlin, Berlin, Germany",
+    "Department of Radiology, University Hospital Leipzig, Leipzig, Germany"
+]
+OTHER_AFFILIATIONS = [
+    "Department of Radiology, Massachusetts General Hospital, Boston, MA, USA",
+    "Department of Medicine, University of Milan, Milan, Italy",
+    "School of Public Health, Peking University, Beijing, China",
+    "Karolinska Institutet, Stockholm, Sweden",
+    "Department of Cardiology, Hôpital Européen Georges-Pompidou, Paris, France"
+]
+TOPICS = [
+    "COVID-19", "SARS-CoV-2", "coronavirus", "chest CT", "chest X-ray", "lung imaging",
+    "pneumonia", "radiology", "artificial intelligence", "deep learning", "pulmonary embolism",
+    "myocarditis", "vaccination", "long COVID", "structured reporting", "RACOON"
+]
+STUDY_TYPES = [
+    "A retrospective multicenter study", "A prospective cohort analysis", "A systematic review",
+    "Results from a nationwide registry", "A deep learning approach", "A case-control study"
+]
+JOURNALS = [
+    "European radiology", "Radiology", "RoFo : Fortschritte auf dem Gebiete der Rontgenstrahlen "
+    "und der Nuklearmedizin", "Scientific reports", "PloS one", "Diagnostics (Basel, Switzerland)",
+    "European journal of radiology", "Insights into imaging"
+]
+
+_WORD_RE = re.compile(r'[^\w\-]+')
+QUERY_TOKEN_RE = re.compile(
+    r'\s*(?:(?P<paren>[()])|(?P<colon>:)'
+    r'|"(?P<phrase>[^"]*)"(?:\[(?P<ptag>[^\]]*)\])?'
+    r'|(?P<word>[^\s()":\[]+)(?:\[(?P<wtag>[^\]]*)\])?)'
+)
+OPERATORS = {'AND', 'OR', 'NOT'}
+
+FIELD_ALIASES = {
+    'author': 'author', 'au': 'author', 'full author name': 'author', 'fau': 'author',
+    'affiliation': 'affiliation', 'ad': 'affiliation',
+    'title': 'title', 'ti': 'title', 'title/abstract': 'tiab', 'tiab': 'tiab',
+    'journal': 'journal', 'ta': 'journal',
+    'date - publication': 'date', 'dp': 'date', 'pdat': 'date', 'publication date': 'date',
+    # Kein eigenes Eingangsdatum im Korpus: Entrez-Datum = Publikationsdatum
+    'date - entrez': 'date', 'edat': 'date', 'entrez date': 'date',
+}
+
+
+def _normalize(text):
+    """Kleinschreibung, Satzzeichen zu Leerzeichen, gepolstert für Wortgrenzen-Suche"""
+    return ' ' + ' '.join(_WORD_RE.sub(' ', text.casefold()).split()) + ' '
+
+
+# --- Korpus ---
+
+def generate_corpus_xml(size=2000, seed=0, racoon_share=0.15, first_pmid=33000000):
+    """Erzeugt einen synthetischen Korpus als PubmedArticleSet-XML (deterministisch)"""
+    rng = random.Random(seed)
+    root = ET.Element('PubmedArticleSet')
+
+    for i in range(size):
+        pmid = str(first_pmid + i)
+        is_racoon = rng.random() < racoon_share
+        year = rng.randint(2019, 2025)
+        month = rng.randint(1, 12)
+        topics = rng.sample(TOPICS[:-1], 3) + (["RACOON"] if is_racoon and rng.random() < 0.3 else [])
+        title = f"{topics[0]} and {topics[1]} in {topics[2]}: {rng.choice(STUDY_TYPES)}"
+
+        article_node = ET.SubElement(root, 'PubmedArticle')
+        citation = ET.SubElement(article_node, 'MedlineCitation', Status='MEDLINE', Owner='NLM')
+        ET.SubElement(citation, 'PMID', Version='1').text = pmid
+        article = ET.SubElement(citation, 'Article', PubModel='Print-Electronic')
+
+        journal = ET.SubElement(article, 'Journal')
+        issue = ET.SubElement(journal, 'JournalIssue', CitedMedium='Internet')
+        pub_date = ET.SubElement(issue, 'PubDate')
+        ET.SubElement(pub_date, 'Year').text = str(year)
+        ET.SubElement(pub_date, 'Month').text = MONTHS[month - 1]
+        ET.SubElement(journal, 'Title').text = rng.choice(JOURNALS)
+
+        ET.SubElement(article, 'ArticleTitle').text = title
+        abstract = ET.SubElement(article, 'Abstract')
+        ET.SubElement(abstract, 'AbstractText').text = (
+            f"We investigated {', '.join(topics)} in {rng.randint(40, 4000)} patients. "
+            f"{rng.choice(STUDY_TYPES)} showed significant differences (p<0.05)."
+        )
+
+        author_list = ET.SubElement(article, 'AuthorList', CompleteYN='Y')
+        n_authors = rng.randint(2, 12)
+        racoon_count = rng.randint(1, min(4, n_authors)) if is_racoon else 0
+        other_count = min(n_authors - racoon_count, len(OTHER_AUTHORS))
+        authors = rng.sample(RACOON_AUTHORS, racoon_count) + rng.sample(OTHER_AUTHORS, other_count)
+        rng.shuffle(authors)
+
+        for lastname, forename, initials in authors:
+            author = ET.SubElement(author_list, 'Author', ValidYN='Y')
+            ET.SubElement(author, 'LastName').text = lastname
+            ET.SubElement(author, 'ForeName').text = forename
+            ET.SubElement(author, 'Initials').text = initials
+            pool = RACOON_AFFILIATIONS if (lastname, forename, initials) in RACOON_AUTHORS else OTHER_AFFILIATIONS
+            ET.SubElement(ET.SubElement(author, 'AffiliationInfo'), 'Affiliation').text = rng.choice(pool)
+
+        if is_racoon and rng.random() < 0.2:
+            collective = ET.SubElement(author_list, 'Author', ValidYN='Y')
+            ET.SubElement(collective, 'CollectiveName').text = "RACOON Study Group"
+
+        pubmed_data = ET.SubElement(article_node, 'PubmedData')
+        id_list = ET.SubElement(pubmed_data, 'ArticleIdList')
+        ET.SubElement(id_list, 'ArticleId', IdType='pubmed').text = pmid
+        ET.SubElement(id_list, 'ArticleId', IdType='doi').text = f"10.{rng.randint(1000, 9999)}/fake.{pmid}"
+
+    return ET.tostring(root, encoding='unicode')
+
+
+class CorpusArticle:
+    """Ein Artikel des Korpus: Original-XML plus vorberechnete Suchfelder"""
+
+    __slots__ = ('pmid', 'xml', 'fields', 'date', 'summary')
+
+    def __init__(self, element):
+        self.pmid = element.findtext('.//PMID')
+        self.xml = ET.tostring(element, encoding='unicode')
+
+        title = element.findtext('.//ArticleTitle') or ''
+        abstract = ' '.join(t.text or '' for t in element.findall('.//Abstract/AbstractText'))
+        journal = element.findtext('.//Journal/Title') or ''
+
+        authors = []
+        affiliations = []
+        for author in element.findall('.//Author'):
+            lastname = author.findtext('LastName')
+            if lastname:
+                initials = author.findtext('Initials') or (author.findtext('ForeName') or ' ')[0]
+                authors.append(f"{lastname} {initials}".strip())
+            elif author.findtext('CollectiveName'):
+                authors.append(author.findtext('CollectiveName').strip())
+            affiliations.extend(a.text or '' for a in author.findall('AffiliationInfo/Affiliation'))
+
+        year = element.findtext('.//PubDate/Year') or element.findtext('.//PubDate/MedlineDate', '')[:4] or '0'
+        month_text = element.findtext('.//PubDate/Month') or ''
+        month = MONTHS.index(month_text[:3]) + 1 if month_text[:3] in MONTHS else (int(month_text) if month_text.isdigit() else 0)
+        self.date = (int(year) if year.isdigit() else 0, month)
+
+        self.fields = {
+            'title': _normalize(title),
+            'tiab': _normalize(f"{title} {abstract}"),
+            'journal': _normalize(journal),
+            'affiliation': _normalize(' '.join(affiliations)),
+            'author': [_normalize(a) for a in authors],
+        }
+        self.fields['all'] = _normalize(f"{title} {abstract} {journal} {' '.join(affiliations)} {' '.join(authors)}")
+
+        doi = next((i.text for i in element.findall('.//ArticleId') if i.get('IdType') == 'doi'), '')
+        self.summary = {
+            'uid': self.pmid,
+            'pubdate': f"{year} {month_text}".strip(),
+            'fulljournalname': journal,
+            'title': title,
+            'authors': [{'name': a, 'authtype': 'Author'} for a in authors],
+            'elocationid': f"doi: {doi}" if doi else '',
+            'articleids': [{'idtype': 'pubmed', 'value': self.pmid}] + ([{'idtype': 'doi', 'value': doi}] if doi else [])
+        }
+
+
+def load_corpus(xml_text):
+    """Liest einen PubmedArticleSet-XML Korpus (z.B. eine aufgezeichnete efetch-Antwort)"""
+    root = ET.fromstring(xml_text)
+    return [CorpusArticle(element) for element in root.iter('PubmedArticle')]
+
+
+# --- Query-Auswertung ---
+
+class QueryParser:
+    """
+    Wertet PubMed-Queries über dem Korpus aus
+
+    Unterstützt AND/OR/NOT, Klammern, Phrasen, Feld-Tags ([Author], [Affiliation],
+    [Title], [Title/Abstract], [Journal]) und Datumsbereiche ("2020"[DP] : "2025/12"[DP]).
+    Wörter ohne Operator werden wie bei PubMed per AND verknüpft.
+    """
+
+    def __init__(self, articles):
+        self.articles = articles
+        self._term_cache = {}
+        self._lock = threading.Lock()  # Parser-Zustand (tokens/position) ist pro Suche
+
+    def search(self, query):
+        with self._lock:
+            self.tokens = self._tokenize(query)
+            self.position = 0
+            if not self.tokens:
+                return set()
+            return self._expression()
+
+    def _tokenize(self, query):
+        tokens = []
+        for match in QUERY_TOKEN_RE.finditer(query):
+            if match.group('paren'):
+                tokens.append(('paren', match.group('paren')))
+            elif match.group('colon'):
+                tokens.append(('colon', ':'))
+            elif match.group('phrase') is not None:
+                tokens.append(('term', match.group('phrase'), match.group('ptag')))
+            elif match.group('word'):
+                word = match.group('word')
+                if word in OPERATORS and not match.group('wtag'):
+                    tokens.append(('op', word))
+                else:
+                    tokens.append(('term', word, match.group('wtag')))
+        return tokens
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _expression(self):
+        result = self._conjunction()
+        while self._peek() == ('op', 'OR'):
+            self._next()
+            result = result | self._conjunction()
+        return result
+
+    def _conjunction(self):
+        result = self._primary()
+        while True:
+            token = self._peek()
+            if token is None or token == ('paren', ')') or token == ('op', 'OR'):
+                return result
+            if token == ('op', 'NOT'):
+                self._next()
+                result = result - self._primary()
+            else:
+                if token == ('op', 'AND'):
+                    self._next()
+                result = result & self._primary()
+
+    def _primary(self):
+        token = self._next()
+        if token is None:
+            return set()
+        if token == ('paren', '('):
+            result = self._expression()
+            if self._peek() == ('paren', ')'):
+                self._next()
+            return result
+        if token[0] != 'term':
+            return self._primary()
+
+        _, text, tag = token
+        field = FIELD_ALIASES.get((tag or '').strip().lower(), 'all')
+
+        if field == 'date':
+            upper = text
+            if self._peek() and self._peek()[0] == 'colon':
+                self._next()
+                upper_token = self._next()
+                upper = upper_token[1] if upper_token and upper_token[0] == 'term' else text
+            return self._date_range(text, upper)
+
+        return self._term(text, field)
+
+    def _term(self, text, field):
+        key = (text.casefold(), field)
+        cached = self._term_cache.get(key)
+        if cached is not None:
+            return set(cached)
+
+        needle = _normalize(text)
+        matches = set()
+
+        if field == 'author':
+            # Autorensuche mit Initialen-Trunkierung ("Meyer H" findet "Meyer HJ")
+            prefix = needle.rstrip()
+            for index, article in enumerate(self.articles):
+                if any(a.startswith(prefix) for a in article.fields['author']):
+                    matches.add(index)
+        else:
+            for index, article in enumerate(self.articles):
+                if needle in article.fields[field]:
+                    matches.add(index)
+
+        self._term_cache[key] = frozenset(matches)
+        return matches
+
+    def _date_range(self, lower, upper):
+        low = self._parse_date(lower, 0)
+        high = self._parse_date(upper, 99)
+        return {i for i, a in enumerate(self.articles) if low <= a.date <= high}
+
+    @staticmethod
+    def _parse_date(text, default_month):
+        parts = re.split(r'[/\-\s]', text.strip())
+        year = int(parts[0]) if parts and parts[0].isdigit() else 0
+        month = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else default_month
+        return (year, month)
+
+
+# --- Fake-Server ---
+
+class FakeEutils:
+    """
+    Zustand und Request-Verarbeitung des E-utilities Fakes
+
+    Args:
+        articles: Korpus (Liste von CorpusArticle, Standard: synthetisch mit corpus_size Artikeln)
+        corpus_size: Größe des synthetischen Korpus
+        rate_limit: Requests pro Sekunde ohne API-Key (NCBI: 3)
+        api_key_rate_limit: Requests pro Sekunde mit API-Key (NCBI: 10)
+        latency: Feste Verzögerung pro Request (Sekunden)
+        seed: Seed des synthetischen Korpus
+    """
+
+    def __init__(self, articles=None, corpus_size=2000, rate_limit=3, api_key_rate_limit=10,
+                 latency=0.0, seed=0):
+        if articles is None:
+            articles = load_corpus(generate_corpus_xml(corpus_size, seed))
+
+        # Neueste zuerst (wie die PubMed-Standardsortierung)
+        self.articles = sorted(articles, key=lambda a: int(a.pmid), reverse=True)
+        self.by_pmid = {a.pmid: a for a in self.articles}
+        self.parser = QueryParser(self.articles)
+
+        self.rate_limit = rate_limit
+        self.api_key_rate_limit = api_key_rate_limit
+        self.latency = latency
+
+        self.histories = {}  # WebEnv -> [PMID-Listen je query_key]
+        self.stats = {'requests': 0, 'rate_limited': 0, 'by_endpoint': {}}
+        self._windows = {}   # Client -> Zeitstempel der letzten Sekunde
+        self._lock = threading.Lock()
+        self._webenv_counter = 0
+
+    def handle(self, method, path, query=None, headers=None, body=None):
+        """Verarbeitet einen Request (Signatur wie FakeConfluence.handle)"""
+        params = {key: values[-1] for key, values in (query or {}).items()}
+
+        # POST-Parameter (epost/efetch mit langen ID-Listen)
+        if body:
+            params.update({k: v[-1] for k, v in parse_qs(body.decode('utf-8')).items()})
+
+        endpoint = path.rsplit('/', 1)[-1].replace('.fcgi', '')
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['by_endpoint'][endpoint] = self.stats['by_endpoint'].get(endpoint, 0) + 1
+            limited = self._rate_limited(params.get('api_key'))
+            if limited:
+                self.stats['rate_limited'] += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if limited:
+            limit = self.api_key_rate_limit if params.get('api_key') else self.rate_limit
+            payload = json.dumps({
+                'error': 'API rate limit exceeded',
+                'api-key': params.get('api_key', ''),
+                'count': str(limit + 1),
+                'limit': str(limit)
+            }).encode('utf-8')
+            return 429, {'Content-Type': 'application/json', 'Retry-After': '1'}, payload
+
+        handlers = {
+            'esearch': self._esearch,
+            'efetch': self._efetch,
+            'esummary': self._esummary,
+            'epost': self._epost,
+        }
+        if not path.startswith(EUTILS_PATH) or endpoint not in handlers:
+            return 404, {'Content-Type': 'text/plain'}, b'Not Found'
+
+        if params.get('db', 'pubmed') != 'pubmed':
+            return self._error(params, f"Database '{params.get('db')}' not available in fake")
+
+        return handlers[endpoint](params)
+
+    def _rate_limited(self, api_key):
+        """Gleitendes Fenster von einer Sekunde pro Client (API-Key oder anonym)"""
+        limit = self.api_key_rate_limit if api_key else self.rate_limit
+        if not limit:
+            return False
+
+        now = time.monotonic()
+        window = self._windows.setdefault(api_key or '', deque())
+        while window and now - window[0] >= 1.0:
+            window.popleft()
+
+        if len(window) >= limit:
+            return True
+        window.append(now)
+        return False
+
+    # --- History ---
+
+    def _store_history(self, webenv, pmids):
+        with self._lock:
+            if not webenv or webenv not in self.histories:
+                self._webenv_counter += 1
+                webenv = f"MCID_FAKE{self._webenv_counter:08d}"
+                self.histories[webenv] = []
+            self.histories[webenv].append(list(pmids))
+            return webenv, str(len(self.histories[webenv]))
+
+    def _history_ids(self, params):
+        webenv = params.get('WebEnv')
+        if not webenv:
+            return None
+        try:
+            return self.histories[webenv][int(params.get('query_key', 1)) - 1]
+        except (KeyError, IndexError, ValueError):
+            return []
+
+    def _requested_ids(self, params):
+        """IDs aus id=... oder aus WebEnv/query_key (mit retstart/retmax)"""
+        if params.get('id'):
+            return [pmid.strip() for pmid in params['id'].split(',') if pmid.strip()]
+
+        ids = self._history_ids(params) or []
+        start = int(params.get('retstart', 0))
+        count = int(params.get('retmax', 10000))
+        return ids[start:start + count]
+
+    # --- Endpunkte ---
+
+    def _esearch(self, params):
+        term = params.get('term', '')
+        indexes = sorted(self.parser.search(term))
+        pmids = [self.articles[i].pmid for i in indexes]
+
+        start = int(params.get('retstart', 0))
+        count = int(params.get('retmax', 20))
+        result = {
+            'count': str(len(pmids)),
+            'retmax': str(len(pmids[start:start + count])),
+            'retstart': str(start),
+            'idlist': pmids[start:start + count],
+            'translationset': [],
+            'querytranslation': term
+        }
+
+        if params.get('usehistory') == 'y':
+            webenv, query_key = self._store_history(params.get('WebEnv'), pmids)
+            result['webenv'] = webenv
+            result['querykey'] = query_key
+
+        if params.get('retmode') == 'json':
+            payload = json.dumps({'header': {'type': 'esearch', 'version': '0.3'}, 'esearchresult': result})
+            return 200, {'Content-Type': 'application/json'}, payload.encode('utf-8')
+
+        root = ET.Element('eSearchResult')
+        for name in ('count', 'retmax', 'retstart', 'querykey', 'webenv'):
+            if name in result:
+                tag = {'querykey': 'QueryKey', 'webenv': 'WebEnv'}.get(name, name.capitalize())
+                ET.SubElement(root, tag).text = result[name]
+        id_list = ET.SubElement(root, 'IdList')
+        for pmid in result['idlist']:
+            ET.SubElement(id_list, 'Id').text = pmid
+        ET.SubElement(root, 'QueryTranslation').text = term
+        return self._xml(root)
+
+    def _efetch(self, params):
+        ids = self._requested_ids(params)
+        parts = ['<?xml version="1.0" ?>\n<PubmedArticleSet>']
+        parts.extend(self.by_pmid[pmid].xml for pmid in ids if pmid in self.by_pmid)
+        parts.append('</PubmedArticleSet>')
+        return 200, {'Content-Type': 'text/xml; charset=UTF-8'}, ''.join(parts).encode('utf-8')
+
+    def _esummary(self, params):
+        ids = [pmid for pmid in self._requested_ids(params) if pmid in self.by_pmid]
+
+        if params.get('retmode') == 'json':
+            result = {'uids': ids}
+            for pmid in ids:
+                result[pmid] = self.by_pmid[pmid].summary
+            payload = json.dumps({'header': {'type': 'esummary', 'version': '0.3'}, 'result': result})
+            return 200, {'Content-Type': 'application/json'}, payload.encode('utf-8')
+
+        root = ET.Element('eSummaryResult')
+        for pmid in ids:
+            summary = self.by_pmid[pmid].summary
+            doc = ET.SubElement(root, 'DocSum')
+            ET.SubElement(doc, 'Id').text = pmid
+            ET.SubElement(doc, 'Item', Name='PubDate', Type='Date').text = summary['pubdate']
+            ET.SubElement(doc, 'Item', Name='FullJournalName', Type='String').text = summary['fulljournalname']
+            author_list = ET.SubElement(doc, 'Item', Name='AuthorList', Type='List')
+            for author in summary['authors']:
+                ET.SubElement(author_list, 'Item', Name='Author', Type='String').text = author['name']
+            ET.SubElement(doc, 'Item', Name='Title', Type='String').text = summary['title']
+        return self._xml(root)
+
+    def _epost(self, params):
+        ids = [pmid.strip() for pmid in params.get('id', '').split(',') if pmid.strip()]
+        webenv, query_key = self._store_history(params.get('WebEnv'), ids)
+
+        root = ET.Element('ePostResult')
+        ET.SubElement(root, 'QueryKey').text = query_key
+        ET.SubElement(root, 'WebEnv').text = webenv
+        return self._xml(root)
+
+    def _error(self, params, message):
+        if params.get('retmode') == 'json':
+            return 200, {'Content-Type': 'application/json'}, json.dumps({'error': message}).encode('utf-8')
+        root = ET.Element('eSearchResult')
+        ET.SubElement(root, 'ERROR').text = message
+        return self._xml(root)
+
+    @staticmethod
+    def _xml(root):
+        payload = '<?xml version="1.0" encoding="UTF-8" ?>\n' + ET.tostring(root, encoding='unicode')
+        return 200, {'Content-Type': 'text/xml; charset=UTF-8'}, payload.encode('utf-8')
+
+
+def main():
+    """Startet den E-utilities Fake als lokalen HTTP-Server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Lokaler NCBI E-utilities Fake")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8091)
+    parser.add_argument('--corpus', help="PubmedArticleSet-XML (z.B. aufgezeichnete efetch-Antwort)")
+    parser.add_argument('--size', type=int, default=2000, help="Größe des synthetischen Korpus")
+    parser.add_argument('--save-corpus', help="Synthetischen Korpus als XML speichern und beenden")
+    parser.add_argument('--rate-limit', type=int, default=3, help="Requests/s ohne API-Key (0 = aus)")
+    parser.add_argument('--api-key-rate-limit', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.save_corpus:
+        Path(args.save_corpus).write_text(generate_corpus_xml(args.size, args.seed), encoding='utf-8')
+        print(f"💾 Korpus gespeichert: {args.save_corpus} ({args.size} Artikel)")
+        return
+
+    articles = load_corpus(Path(args.corpus).read_text(encoding='utf-8')) if args.corpus else None
+    fake = FakeEutils(
+        articles, corpus_size=args.size, rate_limit=args.rate_limit,
+        api_key_rate_limit=args.api_key_rate_limit, latency=args.latency, seed=args.seed
+    )
+    server = FakeServer(fake, args.host, args.port)
+    eutils_url = f"{server.url.rstrip('/')}{EUTILS_PATH}"
+
+    print("🧪 NCBI E-utilities Fake-Server")
+    print("=" * 50)
+    print(f"🌐 URL: {eutils_url}")
+    print(f"📚 Korpus: {len(fake.articles)} Artikel")
+    print(f"⏱️ Ratenlimit: {args.rate_limit}/s (mit API-Key {args.api_key_rate_limit}/s)")
+    print(f"💡 Tools umleiten mit: RACOON_EUTILS_URL={eutils_url}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Beendet")
+        print(f"📊 Requests: {fake.stats['requests']} (429: {fake.stats['rate_limited']})")
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synthetische RACOON-Publikationstabellen
+Erzeugt realistische Storage-Format Seiten (Makros, content-wrapper, Leer- und TEST-Zeilen)
+von 100 bis 100k Zeilen für Fakes und Benchmarks
+"""
+
+import random
+import uuid
+
+SITES = [
+    "UK Magdeburg", "Charité Berlin", "UK Leipzig", "UK Jena", "UK Frankfurt", "LMU München",
+    "TUM München", "UK Essen", "UK Freiburg", "UK Köln", "MHH Hannover", "UK Düsseldorf",
+    "UK Heidelberg", "UK Tübingen", "UK Würzburg", "UK Erlangen", "UK Mainz", "UK Greifswald",
+    "UK Kiel", "UK Hamburg-Eppendorf", "TBD", "N/A"
+]
+LASTNAMES = [
+    "Schmidt", "Müller", "Weber", "Fischer", "Meyer", "Wagner", "Becker", "Hoffmann", "Schulz",
+    "Koch", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann", "Braun",
+    "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt", "Werner", "Krause", "Meier", "Lehmann",
+    "Surov", "Pech", "Haag", "Thormann", "Kardas", "Güttler", "Lassen-Schmidt", "Renz", "Krämer"
+]
+INITIALS = ["A", "B", "C", "D", "F", "H", "HJ", "J", "K", "L", "M", "MA", "P", "R", "S", "T", "U"]
+TITLE_WORDS = [
+    "COVID-19", "chest CT", "pneumonia", "deep learning", "radiology", "structured reporting",
+    "lung imaging", "SARS-CoV-2", "multicenter", "federated learning", "segmentation",
+    "outcome prediction", "pulmonary embolism", "long COVID", "myocarditis", "vaccination"
+]
+JOURNALS = ["Eur Radiol", "Radiology", "Rofo", "Sci Rep", "PLoS One", "Diagnostics (Basel)", "Insights Imaging"]
+
+HEADER_ROW = (
+    '<tr><th><p><strong>Nr.</strong></p></th><th><p><strong>Jahr/Monat</strong></p></th>'
+    '<th><p><strong>Standort</strong></p></th><th><p><strong>Personen</strong></p></th>'
+    '<th><p><strong>Förderhinweis</strong></p></th><th><p><strong>PubMed / DOI</strong></p></th></tr>'
+)
+
+STATUS_MACRO = (
+    '<div class="content-wrapper"><p>'
+    '<ac:structured-macro ac:name="status-handy" ac:schema-version="1" ac:macro-id="%s">'
+    '<ac:parameter ac:name="Status">%s</ac:parameter>'
+    '</ac:structured-macro></p></div>'
+)
+
+LEAD_IN = (
+    '<p>Liste aller Publikationen mit RACOON-Bezug. Bitte neue Einträge oben ergänzen.</p>'
+    '<ac:structured-macro ac:name="info" ac:schema-version="1" ac:macro-id="%s">'
+    '<ac:rich-text-body><p>Förderhinweis: &quot;JA&quot; plus Fördernummer, sonst &quot;NEIN&quot;.</p>'
+    '</ac:rich-text-body></ac:structured-macro>'
+)
+
+TRAILER = (
+    '<p><br /></p><h2>Hinweise</h2>'
+    '<ac:structured-macro ac:name="code" ac:schema-version="1" ac:macro-id="%s">'
+    '<ac:parameter ac:name="language">text</ac:parameter>'
+    '<ac:plain-text-body><![CDATA[Nr. | Jahr/Monat | Standort\n  <tr> wird hier nicht geparst]]>'
+    '</ac:plain-text-body></ac:structured-macro>'
+)
+
+
+def publication_ids(number):
+    """DOI und PMID der Publikation mit laufender Nummer (deterministisch, auch für Kandidaten)"""
+    return 32000000 + number, f"10.{1000 + number % 9000}/racoon.{number}"
+
+
+def _macro_id(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128)))
+
+
+def _authors(rng):
+    count = rng.choice((1, 2, 3, 3, 4, 5, 6, 8, 12))
+    names = [f"{rng.choice(LASTNAMES)} {rng.choice(INITIALS)}" for _ in range(count)]
+    if rng.random() < 0.05:
+        names.append("RACOON Study Group")
+    return ', '.join(names)
+
+
+def _doi_cell(rng, pmid, doi):
+    title = ' '.join(rng.sample(TITLE_WORDS, rng.randint(3, 6))).capitalize()
+    journal = rng.choice(JOURNALS)
+
+    style = rng.random()
+    if style < 0.6:
+        # Klartext-Variante wie vom Mapper erzeugt
+        text = f"{title}. {journal}. DOI: {doi} &lt;https://pubmed.ncbi.nlm.nih.gov/{pmid}/&gt;"
+        return f'<div class="content-wrapper"><p>{text}</p></div>'
+    if style < 0.9:
+        # Manuell gepflegt: Links statt Klartext
+        return (
+            f'<p>{title}&nbsp;&ndash; <em>{journal}</em><br />'
+            f'<a href="https://doi.org/{doi}">https://doi.org/{doi}</a> '
+            f'<a href="https://pubmed.ncbi.nlm.nih.gov/{pmid}/">PMID {pmid}</a></p>'
+        )
+    # Ältere Einträge ohne PMID
+    return f'<p>{title}. DOI: {doi}</p>'
+
+
+def _data_row(rng, number, pmid, doi):
+    year = rng.randint(2020, 2025)
+    month = f"{rng.randint(1, 12):02d}" if rng.random() < 0.95 else "??"
+
+    status = f"JA {rng.randint(10000, 99999)}" if rng.random() < 0.8 else "NEIN"
+
+    site = rng.choice(SITES)
+    site_cell = f'<p>{site}</p>' if rng.random() < 0.7 else site
+
+    return (
+        f'<tr><td><p>{number}</p></td><td><p>{year}/{month}</p></td><td>{site_cell}</td>'
+        f'<td><p>{_authors(rng)}</p></td>'
+        f'<td>{STATUS_MACRO % (_macro_id(rng), status)}</td>'
+        f'<td>{_doi_cell(rng, pmid, doi)}</td></tr>'
+    )
+
+
+def _empty_row(rng):
+    cell = rng.choice(('<td><p><br /></p></td>', '<td>&nbsp;</td>', '<td></td>', '<td><p> </p></td>'))
+    return '<tr>' + cell * 6 + '</tr>'
+
+
+def _test_row(rng):
+    return '<tr>' + '<td><p>TEST</p></td>' * 6 + '</tr>'
+
+
+def generate_table(rows=1000, seed=0, empty_share=0.01, test_share=0.005, duplicate_share=0.01):
+    """
+    Erzeugt einen Storage-Format Body mit einer Publikationstabelle
+
+    Args:
+        rows: Anzahl Datenzeilen (inkl. Leer-/TEST-Zeilen)
+        seed: Seed für reproduzierbare Tabellen
+        empty_share: Anteil leerer Zeilen
+        test_share: Anteil TEST-Zeilen
+        duplicate_share: Anteil Zeilen, die DOI/PMID einer früheren Zeile wiederholen
+
+    Returns:
+        Storage-Format Body (str)
+    """
+    rng = random.Random(seed)
+    parts = [LEAD_IN % _macro_id(rng), '<table class="wrapped"><colgroup>', '<col />' * 6,
+             '</colgroup><tbody>', HEADER_ROW]
+
+    issued = []
+    number = rows
+    for _ in range(rows):
+        roll = rng.random()
+        if roll < empty_share:
+            parts.append(_empty_row(rng))
+            continue
+        if roll < empty_share + test_share:
+            parts.append(_test_row(rng))
+            continue
+
+        if issued and rng.random() < duplicate_share:
+            pmid, doi = rng.choice(issued)
+        else:
+            pmid, doi = publication_ids(number)
+            issued.append((pmid, doi))
+
+        parts.append(_data_row(rng, number, pmid, doi))
+        number -= 1
+
+    parts.append('</tbody></table>')
+    parts.append(TRAILER % _macro_id(rng))
+    return ''.join(parts)
+
+
+def generate_candidates(count=100, seed=0, known_share=0.3, table_rows=1000):
+    """
+    Erzeugt PubMed-Kandidaten (Dicts wie PubMedExplorer.parse_article), teils bereits in der Tabelle
+
+    known_share: Anteil Kandidaten mit DOI/PMID aus generate_table(table_rows, seed)
+    """
+    rng = random.Random(seed + 1)
+    candidates = []
+
+    for i in range(count):
+        if rng.random() < known_share:
+            pmid, doi = publication_ids(rng.randint(1, table_rows))
+            pmid = str(pmid) if rng.random() < 0.5 else None  # teils nur über DOI erkennbar
+        else:
+            pmid, doi = str(40000000 + i), f"10.5555/new.{i}"
+
+        authors = _authors(rng).split(', ')
+        candidates.append({
+            'pmid': pmid or 'N/A',
+            'title': ' '.join(rng.sample(TITLE_WORDS, 4)).capitalize(),
+            'authors': authors,
+            'journal': rng.choice(JOURNALS),
+            'year': str(rng.randint(2020, 2025)),
+            'month': rng.choice(['Jan', 'Mar', 'Jun', 'Sep', 'Dec', 'N/A']),
+            'doi': doi,
+            'abstract': "N/A",
+            'author_affiliations': [{'author': a, 'affiliations': []} for a in authors]
+        })
+
+    return candidates
+
+
+def main():
+    """Schreibt eine generierte Tabelle in eine Datei"""
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Synthetische RACOON-Publikationstabelle erzeugen")
+    parser.add_argument('rows', type=int, nargs='?', default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default="racoon_table_synthetic.html")
+    args = parser.parse_args()
+
+    content = generate_table(args.rows, args.seed)
+    Path(args.output).write_text(content, encoding='utf-8')
+    print(f"💾 {args.rows} Zeilen ({len(content):,} Zeichen) nach {args.output} geschrieben")
+
+if __name__ == "__main__":
+    main()
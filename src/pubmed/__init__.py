@@ -1,4 +1,4 @@
-# PubMed Integration Module
-"""
-PubMed API Integration für RACOON
+# PubMed Integration Module
+"""
+PubMed API Integration für RACOON
 """
\ No newline at end of file
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Autoren-Normalisierung
+Kanonische Autorennamen für Abgleich, Formatierung und Autoren-Index
+"""
+
+import re
+import sys
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+# Namenszusätze, die für den Abgleich ignoriert werden ("van der Berg" == "Berg")
+PARTICLES = {
+    'van', 'von', 'der', 'den', 'de', 'del', 'della', 'di', 'da', 'dos', 'du',
+    'la', 'le', 'ten', 'ter', 'vom', 'zu', 'zum', 'zur', 'af', 'al', 'el', 'bin'
+}
+
+# Begriffe, an denen Kollektiv-Autoren (Studiengruppen, Konsortien) erkannt werden
+COLLECTIVE_MARKERS = {
+    'group', 'consortium', 'collaborators', 'collaboration', 'investigators',
+    'study', 'network', 'team', 'initiative', 'committee', 'society', 'racoon'
+}
+
+# Wendungen, die ebenfalls nur in Kollektiv-Namen vorkommen ("... for the RACOON Consortium")
+COLLECTIVE_PHRASES = ('for the', 'on behalf of')
+
+CanonicalAuthor = namedtuple(
+    'CanonicalAuthor', ['key', 'lastname', 'initials', 'display', 'collective']
+)
+
+_TRANSLIT = str.maketrans({'ß': 'ss', 'æ': 'ae', 'ø': 'o', 'ł': 'l', 'đ': 'd'})
+# Deutsche Umschrift - nur für Aliase: ae/oe/ue in Bauer, Lauer oder Noel sind keine Umlaute
+_UMLAUT_TRANSLIT = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue'})
+_UMLAUT_RE = re.compile(r'[äöüÄÖÜ]')
+_INITIALS_RE = re.compile(r'^[A-ZÄÖÜ](?:-?[A-ZÄÖÜ])*$')
+_NON_ALNUM = re.compile(r'[^a-z0-9 ]+')
+
+
+def _fold(text, transliterate=False):
+    """
+    Faltet Schreibvarianten auf eine gemeinsame Form
+
+    Müller und Muller ergeben 'muller' (Diakritika entfallen). Mit transliterate
+    werden Umlaute wie in der deutschen Umschrift ersetzt: Müller -> 'mueller'.
+    """
+    text = text.casefold()
+    if transliterate:
+        text = text.translate(_UMLAUT_TRANSLIT)
+    text = text.translate(_TRANSLIT)
+    return ''.join(
+        c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c)
+    )
+
+
+def _lastname_key(lastname, transliterate=False):
+    """Vergleichsschlüssel für Nachnamen (ohne Namenszusätze, ohne Bindestriche)"""
+    tokens = _NON_ALNUM.sub(' ', _fold(lastname, transliterate).replace('-', '')).split()
+
+    # Führende Namenszusätze entfernen, aber nie den ganzen Namen
+    while len(tokens) > 1 and tokens[0] in PARTICLES:
+        tokens.pop(0)
+
+    return ''.join(tokens)
+
+
+def _is_collective(tokens):
+    """
+    Erkennt Kollektiv-Autoren wie 'RACOON Study Group'
+
+    Nur an expliziten Markern - mehrteilige Nachnamen wie 'van der Berg' bleiben Personen.
+    """
+    folded = _NON_ALNUM.sub(' ', _fold(' '.join(tokens))).split()
+    if COLLECTIVE_MARKERS.intersection(folded):
+        return True
+    text = f" {' '.join(folded)} "
+    return any(f" {phrase} " in text for phrase in COLLECTIVE_PHRASES)
+
+
+@lru_cache(maxsize=16384)
+def parse_author(name):
+    """
+    Zerlegt einen Autorennamen in seine kanonische Form
+
+    Unterstützte Formate:
+        "Meyer HJ", "Meyer H.J.", "Meyer, Hans-Jonas", "van der Berg J",
+        "Teichräber U", "RACOON Study Group"
+    """
+    name = ' '.join(name.split())
+
+    if ',' in name:
+        # "Nachname, Vorname(n)" -> Initialen aus den Vornamen
+        lastname, forenames = [part.strip() for part in name.split(',', 1)]
+        initials = ''.join(
+            part[0].upper() for part in re.split(r'[\s\-.]+', forenames) if part
+        )
+    else:
+        tokens = name.split(' ')
+        last = tokens[-1].replace('.', '')
+
+        if _is_collective(tokens):
+            key = sys.intern('#' + ' '.join(_NON_ALNUM.sub(' ', _fold(name)).split()))
+            return CanonicalAuthor(key, name, '', name, True)
+        elif len(tokens) > 1 and _INITIALS_RE.match(last) and len(last.replace('-', '')) <= 4:
+            lastname = ' '.join(tokens[:-1])
+            initials = last.replace('-', '')
+        else:
+            lastname = name
+            initials = ''
+
+    key = _lastname_key(lastname)
+    if initials:
+        key += ' ' + _fold(initials[0])
+
+    display = f"{lastname} {initials}" if initials else lastname
+    return CanonicalAuthor(sys.intern(key), lastname, initials, display, False)
+
+
+def normalize(name):
+    """Kanonischer Schlüssel eines Autors ('Meyer HJ' -> 'meyer h')"""
+    return parse_author(name).key
+
+
+@lru_cache(maxsize=16384)
+def match_keys(name):
+    """
+    Schlüssel, unter denen ein Autor gefunden wird
+
+    Kanonischer Schlüssel plus - nur bei echten Umlauten im Nachnamen - die deutsche
+    Umschrift als Alias: 'Müller H' -> ('muller h', 'mueller h'), damit 'Mueller H'
+    denselben Autor findet. 'Bauer' und 'Baur' bleiben verschieden.
+    """
+    author = parse_author(name)
+    if author.collective or not _UMLAUT_RE.search(author.lastname):
+        return (author.key,)
+    alias = _lastname_key(author.lastname, transliterate=True)
+    if author.initials:
+        alias += ' ' + _fold(author.initials[0])
+    return (author.key, sys.intern(alias))
+
+
+class AuthorIndex:
+    """Internierte Autoren-Tabelle mit Rückwärts-Index Autor -> PMIDs"""
+
+    def __init__(self):
+        self._authors = {}
+        self._pmids = {}
+        self._aliases = {}  # Umschrift ('mueller h') -> Schlüssel der Umlaut-Schreibweise
+
+    def _lookup(self, name):
+        """Schlüssel eines bekannten Autors (auch über die Umschrift) oder None"""
+        keys = match_keys(name)
+        for key in keys:
+            if key in self._authors:
+                return key
+        return self._aliases.get(keys[0])
+
+    def canonical(self, name):
+        """Liefert die internierte kanonische Form eines Autors"""
+        author = parse_author(name)
+        key = self._lookup(name)
+
+        # Umlaut-Schreibweise und Umschrift führen auf denselben Eintrag
+        for alias in match_keys(name):
+            if alias != (key or author.key):
+                self._aliases.setdefault(alias, key or author.key)
+
+        if key is None:
+            self._authors[author.key] = author
+            return author
+
+        existing = self._authors[key]
+        # Die Variante mit den meisten Initialen ist die aussagekräftigste
+        if len(author.initials) > len(existing.initials):
+            self._authors[key] = author._replace(key=key)
+            return self._authors[key]
+
+        return existing
+
+    def register(self, publication):
+        """Nimmt alle Autoren einer Publikation in den Index auf"""
+        pmid = publication.get('pmid', 'N/A')
+
+        for name in publication.get('authors', []):
+            key = self.canonical(name).key
+            if pmid != 'N/A':
+                self._pmids.setdefault(key, set()).add(pmid)
+
+    def register_many(self, publications):
+        """Nimmt einen ganzen Batch von Publikationen auf"""
+        for publication in publications:
+            self.register(publication)
+
+    def papers_by(self, name):
+        """Alle bekannten PMIDs eines Autors (Hash-Lookup)"""
+        return self._pmids.get(self._lookup(name), set())
+
+    def __contains__(self, name):
+        return self._lookup(name) is not None
+
+    def __len__(self):
+        return len(self._authors)
+
+
+def demo_normalizer():
+    """Demo der Autoren-Normalisierung"""
+    print("🧪 RACOON Autoren-Normalisierung Demo")
+    print("=" * 50)
+
+    examples = [
+        "Meyer HJ", "Meyer H", "Meyer, Hans-Jonas", "Teichräber U", "Teichraeber U",
+        "Bauer K", "Baur K", "van der Berg J", "Berg J", "van der Berg",
+        "RACOON Study Group", "on behalf of NAKO"
+    ]
+
+    for name in examples:
+        author = parse_author(name)
+        kind = "Kollektiv" if author.collective else "Person"
+        print(f"  {name:<22} -> {author.key:<22} ({kind}, Anzeige: {author.display})")
+
+    print(f"\n💾 Cache: {parse_author.cache_info()}")
+
+
+if __name__ == "__main__":
+    demo_normalizer()
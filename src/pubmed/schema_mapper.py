@@ -1,229 +1,323 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-RACOON-PubMed Schema Mapping
-Definiert die Konvertierung zwischen PubMed-Daten und RACOON-Tabellenformat
-"""
-
-class RacoonPubMedMapper:
-    """Mapping zwischen PubMed und RACOON Publikationsformat"""
-    
-    def __init__(self):
-        self.month_mapping = {
-            'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-            'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-            'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12',
-            'January': '01', 'February': '02', 'March': '03', 'April': '04',
-            'May': '05', 'June': '06', 'July': '07', 'August': '08',
-            'September': '09', 'October': '10', 'November': '11', 'December': '12'
-        }
-        
-        # RACOON-spezifische Standorte
-        self.racoon_standorte = [
-            "UK Jena", "UK Magdeburg", "UK Dresden", "UK Leipzig",
-            "UK Berlin", "UK Hamburg", "UK München", "UK Köln",
-            "UK Düsseldorf", "UK Frankfurt", "UK Heidelberg"
-        ]
-    
-    def pubmed_to_racoon(self, pubmed_data, nummer, standort="TBD", foerder_num="AUTO"):
-        """
-        Konvertiert PubMed-Publikationsdaten in RACOON-Tabellenformat
-        
-        Args:
-            pubmed_data: Dict mit PubMed-Daten
-            nummer: Fortlaufende Nummer für RACOON-Tabelle
-            standort: RACOON-Standort (falls bekannt)
-            foerder_num: Fördernummer (AUTO für automatische Generierung)
-        
-        Returns:
-            Dict mit RACOON-formatierten Daten
-        """
-        
-        # 1. Nummer (fortlaufend)
-        racoon_nummer = str(nummer)
-        
-        # 2. Jahr/Monat formatieren
-        racoon_jahr_monat = self._format_year_month(
-            pubmed_data.get('year', 'N/A'),
-            pubmed_data.get('month', 'N/A')
-        )
-        
-        # 3. Standort (manuell oder aus Affiliation ableiten)
-        racoon_standort = self._determine_standort(pubmed_data, standort)
-        
-        # 4. Personen (Autoren formatieren)
-        racoon_personen = self._format_authors(pubmed_data.get('authors', []))
-        
-        # 5. Förderhinweis
-        racoon_foerderhinweis = self._format_foerderhinweis(foerder_num, nummer)
-        
-        # 6. PubMed DOI (Titel + Links)
-        racoon_pubmed_doi = self._format_pubmed_doi_field(pubmed_data)
-        
-        return {
-            'nummer': racoon_nummer,
-            'jahr_monat': racoon_jahr_monat,
-            'standort': racoon_standort,
-            'personen': racoon_personen,
-            'foerderhinweis': racoon_foerderhinweis,
-            'pubmed_doi': racoon_pubmed_doi,
-            '_metadata': {
-                'original_pmid': pubmed_data.get('pmid', 'N/A'),
-                'original_doi': pubmed_data.get('doi', 'N/A'),
-                'journal': pubmed_data.get('journal', 'N/A')
-            }
-        }
-    
-    def _format_year_month(self, year, month):
-        """Formatiert Jahr/Monat im RACOON-Format (YYYY/MM)"""
-        if year == 'N/A':
-            return "????/??"
-        
-        if month == 'N/A':
-            return f"{year}/??"
-        
-        # Monat konvertieren
-        month_num = self.month_mapping.get(month, month)
-        
-        # Falls schon numerisch
-        if month_num.isdigit() and len(month_num) <= 2:
-            month_num = month_num.zfill(2)
-        else:
-            month_num = "??"
-        
-        return f"{year}/{month_num}"
-    
-    def _determine_standort(self, pubmed_data, provided_standort):
-        """Bestimmt RACOON-Standort aus Daten oder nutzt vorgegebenen"""
-        if provided_standort != "TBD":
-            return provided_standort
-        
-        # TODO: Affiliation-basierte Standort-Erkennung
-        # Hier könnte man aus den Autor-Affiliationen den Standort ableiten
-        return "TBD"
-    
-    def _format_authors(self, authors):
-        """Formatiert Autorenliste im RACOON-Format"""
-        if not authors:
-            return "N/A"
-        
-        # RACOON nutzt: "Nachname Initialen, Nachname Initialen, ..."
-        formatted_authors = []
-        for author in authors:
-            # Author ist bereits im Format "Lastname F" 
-            formatted_authors.append(author)
-        
-        return ", ".join(formatted_authors)
-    
-    def _format_foerderhinweis(self, foerder_num, nummer):
-        """Formatiert Förderhinweis"""
-        if foerder_num == "AUTO":
-            # Automatische Generierung basierend auf Nummer
-            auto_num = 70000 + int(nummer)  # Basierend auf beobachtetes Muster
-            return f"JA {auto_num}"
-        
-        return f"JA {foerder_num}"
-    
-    def _format_pubmed_doi_field(self, pubmed_data):
-        """Formatiert die PubMed DOI Spalte mit Titel und Links"""
-        title = pubmed_data.get('title', 'N/A')
-        doi = pubmed_data.get('doi', 'N/A')
-        pmid = pubmed_data.get('pmid', 'N/A')
-        
-        # Basis: Titel
-        result = title
-        
-        # DOI hinzufügen (wenn vorhanden)
-        if doi != 'N/A':
-            result += f". DOI: {doi}"
-        
-        # PubMed Link hinzufügen
-        if pmid != 'N/A':
-            result += f" &lt;https://pubmed.ncbi.nlm.nih.gov/{pmid}/&gt;"
-        
-        return result
-    
-    def validate_racoon_entry(self, racoon_data):
-        """Validiert RACOON-Eintrag auf Vollständigkeit"""
-        required_fields = ['nummer', 'jahr_monat', 'standort', 'personen', 'foerderhinweis', 'pubmed_doi']
-        
-        validation_result = {
-            'valid': True,
-            'warnings': [],
-            'errors': []
-        }
-        
-        # Pflichtfelder prüfen
-        for field in required_fields:
-            if field not in racoon_data or not racoon_data[field]:
-                validation_result['errors'].append(f"Fehlendes Feld: {field}")
-                validation_result['valid'] = False
-        
-        # Spezifische Validierungen
-        if racoon_data.get('standort') == 'TBD':
-            validation_result['warnings'].append("Standort muss manuell gesetzt werden")
-        
-        if '????' in racoon_data.get('jahr_monat', ''):
-            validation_result['warnings'].append("Unvollständiges Datum")
-        
-        if racoon_data.get('personen') == 'N/A':
-            validation_result['warnings'].append("Keine Autoren gefunden")
-        
-        return validation_result
-
-def demo_mapping():
-    """Demo der Mapping-Funktionalität"""
-    print("🧪 RACOON-PubMed Schema Mapping Demo")
-    print("=" * 50)
-    
-    # Beispiel PubMed-Daten
-    example_pubmed = {
-        'pmid': '12345678',
-        'title': 'COVID-19 chest CT findings in pediatric patients',
-        'authors': ['Schmidt M', 'Müller K', 'Wagner S'],
-        'journal': 'European Radiology',
-        'year': '2023',
-        'month': 'Mar',
-        'doi': '10.1007/s00330-023-09234-x',
-        'abstract': 'This study analyzes chest CT findings...'
-    }
-    
-    # Mapper erstellen
-    mapper = RacoonPubMedMapper()
-    
-    # Konvertierung
-    racoon_entry = mapper.pubmed_to_racoon(
-        example_pubmed, 
-        nummer=63,  # Nächste Nummer in RACOON-Tabelle
-        standort="UK Magdeburg"
-    )
-    
-    print("📊 Konvertierungs-Beispiel:")
-    print("-" * 30)
-    print(f"📚 PMID: {example_pubmed['pmid']}")
-    print(f"📖 Titel: {example_pubmed['title']}")
-    print(f"👥 Autoren: {example_pubmed['authors']}")
-    print(f"📅 Datum: {example_pubmed['year']}/{example_pubmed['month']}")
-    
-    print("\n➡️ RACOON Format:")
-    print("-" * 30)
-    for field, value in racoon_entry.items():
-        if not field.startswith('_'):
-            print(f"  {field}: {value}")
-    
-    # Validierung
-    validation = mapper.validate_racoon_entry(racoon_entry)
-    print(f"\n✅ Validierung: {'Erfolgreich' if validation['valid'] else 'Fehlgeschlagen'}")
-    
-    if validation['warnings']:
-        print("⚠️ Warnungen:")
-        for warning in validation['warnings']:
-            print(f"  - {warning}")
-    
-    if validation['errors']:
-        print("❌ Fehler:")
-        for error in validation['errors']:
-            print(f"  - {error}")
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON-PubMed Schema Mapping
+Definiert die Konvertierung zwischen PubMed-Daten und RACOON-Tabellenformat
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from pubmed.standort_resolver import StandortResolver
+from pubmed.author_normalizer import parse_author
+
+# Zeilen-Template entsprechend dem realen Tabellenlayout
+# (Förderhinweis als status-handy Makro, Textspalten im content-wrapper)
+ROW_TEMPLATE = (
+    '<tr>'
+    '<td><p>%s</p></td>'
+    '<td><p>%s</p></td>'
+    '<td>%s</td>'
+    '<td><p>%s</p></td>'
+    '<td><div class="content-wrapper"><p>'
+    '<ac:structured-macro ac:name="status-handy" ac:schema-version="1">'
+    '<ac:parameter ac:name="Status">%s</ac:parameter>'
+    '</ac:structured-macro></p></div></td>'
+    '<td><div class="content-wrapper"><p>%s</p></div></td>'
+    '</tr>'
+)
+
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;'
+})
+
+def escape_html(text):
+    """Escaped HTML-Sonderzeichen in einem Durchlauf (str.translate)"""
+    return str(text).translate(_HTML_ESCAPE_TABLE)
+
+class RacoonPubMedMapper:
+    """Mapping zwischen PubMed und RACOON Publikationsformat"""
+    
+    def __init__(self, institutions=(), min_standort_confidence=0.5):
+        self.month_mapping = {
+            'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+            'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+            'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12',
+            'January': '01', 'February': '02', 'March': '03', 'April': '04',
+            'May': '05', 'June': '06', 'July': '07', 'August': '08',
+            'September': '09', 'October': '10', 'November': '11', 'December': '12'
+        }
+        
+        # RACOON-spezifische Standorte
+        self.racoon_standorte = [
+            "UK Jena", "UK Magdeburg", "UK Dresden", "UK Leipzig",
+            "UK Berlin", "UK Hamburg", "UK München", "UK Köln",
+            "UK Düsseldorf", "UK Frankfurt", "UK Heidelberg"
+        ]
+        
+        # Vorkompilierter Index für die Affiliation-basierte Standort-Erkennung
+        self.standort_resolver = StandortResolver(self.racoon_standorte, institutions)
+        self.min_standort_confidence = min_standort_confidence
+    
+    def pubmed_to_racoon(self, pubmed_data, nummer, standort="TBD", foerder_num="AUTO"):
+        """
+        Konvertiert PubMed-Publikationsdaten in RACOON-Tabellenformat
+        
+        Args:
+            pubmed_data: Dict mit PubMed-Daten
+            nummer: Fortlaufende Nummer für RACOON-Tabelle
+            standort: RACOON-Standort (falls bekannt)
+            foerder_num: Fördernummer (AUTO für automatische Generierung)
+        
+        Returns:
+            Dict mit RACOON-formatierten Daten
+        """
+        
+        # 1. Nummer (fortlaufend)
+        racoon_nummer = str(nummer)
+        
+        # 2. Jahr/Monat formatieren
+        racoon_jahr_monat = self._format_year_month(
+            pubmed_data.get('year', 'N/A'),
+            pubmed_data.get('month', 'N/A')
+        )
+        
+        # 3. Standort (manuell oder aus Affiliation ableiten)
+        racoon_standort, standort_confidence = self._determine_standort(pubmed_data, standort)
+        
+        # 4. Personen (Autoren formatieren)
+        racoon_personen = self._format_authors(pubmed_data.get('authors', []))
+        
+        # 5. Förderhinweis
+        racoon_foerderhinweis = self._format_foerderhinweis(foerder_num, nummer)
+        
+        # 6. PubMed DOI (Titel + Links)
+        racoon_pubmed_doi = self._format_pubmed_doi_field(pubmed_data)
+        
+        return {
+            'nummer': racoon_nummer,
+            'jahr_monat': racoon_jahr_monat,
+            'standort': racoon_standort,
+            'personen': racoon_personen,
+            'foerderhinweis': racoon_foerderhinweis,
+            'pubmed_doi': racoon_pubmed_doi,
+            '_metadata': {
+                'original_pmid': pubmed_data.get('pmid', 'N/A'),
+                'original_doi': pubmed_data.get('doi', 'N/A'),
+                'journal': pubmed_data.get('journal', 'N/A'),
+                'standort_confidence': standort_confidence
+            }
+        }
+    
+    def map_many(self, publications, start_number, standort="TBD", foerder_num="AUTO", errors=None):
+        """
+        Konvertiert einen ganzen Batch von PubMed-Publikationen
+        
+        Args:
+            publications: Liste von Dicts mit PubMed-Daten
+            start_number: Nummer des ersten Eintrags (fortlaufend)
+            standort: RACOON-Standort für alle Einträge (TBD = aus Affiliationen)
+            foerder_num: Fördernummer (AUTO für automatische Generierung)
+            errors: Optional Liste - fehlerhafte Publikationen werden dann übersprungen
+                und als (Publikation, Exception) angehängt, statt den Batch abzubrechen
+        
+        Returns:
+            Liste von RACOON-formatierten Dicts (gleiche Reihenfolge)
+        """
+        convert = self.pubmed_to_racoon
+        if errors is None:
+            return [
+                convert(pub, start_number + i, standort, foerder_num)
+                for i, pub in enumerate(publications)
+            ]
+        
+        entries = []
+        for i, pub in enumerate(publications):
+            try:
+                entries.append(convert(pub, start_number + i, standort, foerder_num))
+            except Exception as e:
+                errors.append((pub, e))
+        return entries
+    
+    def iter_rows(self, racoon_entries):
+        """Erzeugt die Storage-Format Tabellenzeilen für RACOON-Einträge"""
+        template = ROW_TEMPLATE
+        
+        for entry in racoon_entries:
+            # pubmed_doi ist bereits escaped (siehe _format_pubmed_doi_field)
+            yield template % (
+                escape_html(entry['nummer']),
+                escape_html(entry['jahr_monat']),
+                escape_html(entry['standort']),
+                escape_html(entry['personen']),
+                escape_html(entry['foerderhinweis']),
+                entry['pubmed_doi']
+            )
+    
+    def render_rows(self, racoon_entries):
+        """Rendert alle Einträge in einen einzigen String (ein join)"""
+        return ''.join(self.iter_rows(racoon_entries))
+    
+    def _format_year_month(self, year, month):
+        """Formatiert Jahr/Monat im RACOON-Format (YYYY/MM)"""
+        if year == 'N/A':
+            return "????/??"
+        
+        if month == 'N/A':
+            return f"{year}/??"
+        
+        # Monat konvertieren
+        month_num = self.month_mapping.get(month, month)
+        
+        # Falls schon numerisch
+        if month_num.isdigit() and len(month_num) <= 2:
+            month_num = month_num.zfill(2)
+        else:
+            month_num = "??"
+        
+        return f"{year}/{month_num}"
+    
+    def _determine_standort(self, pubmed_data, provided_standort):
+        """Bestimmt RACOON-Standort aus Daten oder nutzt vorgegebenen
+        
+        Returns:
+            Tuple (Standort, Konfidenz 0.0-1.0)
+        """
+        if provided_standort != "TBD":
+            return provided_standort, 1.0
+        
+        # Affiliation-basierte Standort-Erkennung
+        result = self.standort_resolver.resolve(pubmed_data.get('author_affiliations', []))
+        
+        # Unsichere Zuordnungen bleiben zur manuellen Prüfung auf TBD
+        if result['confidence'] < self.min_standort_confidence:
+            return "TBD", result['confidence']
+        
+        return result['standort'], result['confidence']
+    
+    def _format_authors(self, authors):
+        """Formatiert Autorenliste im RACOON-Format"""
+        if not authors:
+            return "N/A"
+        
+        # RACOON nutzt: "Nachname Initialen, Nachname Initialen, ..."
+        # (normalisiert auch "Nachname, Vorname" und "Nachname H.J.")
+        return ", ".join(parse_author(author).display for author in authors)
+    
+    def _format_foerderhinweis(self, foerder_num, nummer):
+        """Formatiert Förderhinweis"""
+        if foerder_num == "AUTO":
+            # Automatische Generierung basierend auf Nummer
+            auto_num = 70000 + int(nummer)  # Basierend auf beobachtetes Muster
+            return f"JA {auto_num}"
+        
+        return f"JA {foerder_num}"
+    
+    def _format_pubmed_doi_field(self, pubmed_data):
+        """Formatiert die PubMed DOI Spalte mit Titel und Links"""
+        title = pubmed_data.get('title', 'N/A')
+        doi = pubmed_data.get('doi', 'N/A')
+        pmid = pubmed_data.get('pmid', 'N/A')
+        
+        # Basis: Titel (als Storage-Format escaped)
+        result = escape_html(title)
+        
+        # DOI hinzufügen (wenn vorhanden)
+        if doi != 'N/A':
+            result += f". DOI: {escape_html(doi)}"
+        
+        # PubMed Link hinzufügen
+        if pmid != 'N/A':
+            result += f" &lt;https://pubmed.ncbi.nlm.nih.gov/{pmid}/&gt;"
+        
+        return result
+    
+    def validate_racoon_entry(self, racoon_data):
+        """Validiert RACOON-Eintrag auf Vollständigkeit"""
+        required_fields = ['nummer', 'jahr_monat', 'standort', 'personen', 'foerderhinweis', 'pubmed_doi']
+        
+        validation_result = {
+            'valid': True,
+            'warnings': [],
+            'errors': []
+        }
+        
+        # Pflichtfelder prüfen
+        for field in required_fields:
+            if field not in racoon_data or not racoon_data[field]:
+                validation_result['errors'].append(f"Fehlendes Feld: {field}")
+                validation_result['valid'] = False
+        
+        # Spezifische Validierungen
+        if racoon_data.get('standort') == 'TBD':
+            validation_result['warnings'].append("Standort muss manuell gesetzt werden")
+        elif racoon_data.get('_metadata', {}).get('standort_confidence', 1.0) < 0.8:
+            validation_result['warnings'].append("Standort automatisch erkannt - bitte prüfen")
+        
+        if '????' in racoon_data.get('jahr_monat', ''):
+            validation_result['warnings'].append("Unvollständiges Datum")
+        
+        if racoon_data.get('personen') == 'N/A':
+            validation_result['warnings'].append("Keine Autoren gefunden")
+        
+        return validation_result
+
+def demo_mapping():
+    """Demo der Mapping-Funktionalität"""
+    print("🧪 RACOON-PubMed Schema Mapping Demo")
+    print("=" * 50)
+    
+    # Beispiel PubMed-Daten
+    example_pubmed = {
+        'pmid': '12345678',
+        'title': 'COVID-19 chest CT findings in pediatric patients',
+        'authors': ['Schmidt M', 'Müller K', 'Wagner S'],
+        'journal': 'European Radiology',
+        'year': '2023',
+        'month': 'Mar',
+        'doi': '10.1007/s00330-023-09234-x',
+        'abstract': 'This study analyzes chest CT findings...'
+    }
+    
+    # Mapper erstellen
+    mapper = RacoonPubMedMapper()
+    
+    # Konvertierung
+    racoon_entry = mapper.pubmed_to_racoon(
+        example_pubmed, 
+        nummer=63,  # Nächste Nummer in RACOON-Tabelle
+        standort="UK Magdeburg"
+    )
+    
+    print("📊 Konvertierungs-Beispiel:")
+    print("-" * 30)
+    print(f"📚 PMID: {example_pubmed['pmid']}")
+    print(f"📖 Titel: {example_pubmed['title']}")
+    print(f"👥 Autoren: {example_pubmed['authors']}")
+    print(f"📅 Datum: {example_pubmed['year']}/{example_pubmed['month']}")
+    
+    print("\n➡️ RACOON Format:")
+    print("-" * 30)
+    for field, value in racoon_entry.items():
+        if not field.startswith('_'):
+            print(f"  {field}: {value}")
+    
+    # Validierung
+    validation = mapper.validate_racoon_entry(racoon_entry)
+    print(f"\n✅ Validierung: {'Erfolgreich' if validation['valid'] else 'Fehlgeschlagen'}")
+    
+    if validation['warnings']:
+        print("⚠️ Warnungen:")
+        for warning in validation['warnings']:
+            print(f"  - {warning}")
+    
+    if validation['errors']:
+        print("❌ Fehler:")
+        for error in validation['errors']:
+            print(f"  - {error}")
+
+if __name__ == "__main__":
     demo_mapping()
\ No newline at end of file
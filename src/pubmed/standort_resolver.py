@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Standort-Erkennung
+Leitet den RACOON-Standort aus den PubMed-Affiliationen der Autoren ab
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Bekannte Schreibweisen der Standort-Institutionen (zusätzlich zu den Städtenamen)
+STANDORT_ALIASES = {
+    "UK Magdeburg": [
+        "Otto-von-Guericke University", "Otto-von-Guericke-Universität",
+        "University Hospital Magdeburg", "Universitätsklinikum Magdeburg",
+    ],
+    "UK Jena": [
+        "Friedrich Schiller University", "Friedrich-Schiller-Universität",
+        "Jena University Hospital", "University Hospital Jena", "Universitätsklinikum Jena",
+    ],
+    "UK Dresden": [
+        "Carl Gustav Carus", "Technische Universität Dresden", "TU Dresden",
+        "Dresden University of Technology",
+    ],
+    "UK Leipzig": [
+        "University of Leipzig", "Leipzig University", "Universität Leipzig",
+        "University Hospital Leipzig", "Universitätsklinikum Leipzig",
+    ],
+    "UK Berlin": [
+        "Charité", "Charité Universitätsmedizin Berlin", "Berlin Institute of Health",
+    ],
+    "UK Hamburg": [
+        "University Medical Center Hamburg-Eppendorf", "Universitätsklinikum Hamburg-Eppendorf",
+        "Hamburg-Eppendorf",
+    ],
+    "UK München": [
+        "Ludwig-Maximilians-Universität", "Ludwig Maximilians University", "LMU Munich",
+        "Klinikum rechts der Isar", "Technical University of Munich",
+    ],
+    "UK Köln": [
+        "University of Cologne", "Universität zu Köln", "University Hospital Cologne",
+    ],
+    "UK Düsseldorf": [
+        "Heinrich Heine University", "Heinrich-Heine-Universität", "University Hospital Düsseldorf",
+    ],
+    "UK Frankfurt": [
+        "Goethe University", "Goethe-Universität", "University Hospital Frankfurt",
+    ],
+    "UK Heidelberg": [
+        "Heidelberg University", "Ruprecht-Karls-Universität", "University Hospital Heidelberg",
+    ],
+}
+
+# Weitere Schreibweisen der Städtenamen (englisch), gewichtet wie der Stadtname selbst
+CITY_ALIASES = {
+    "UK München": ["Munich"],
+    "UK Köln": ["Cologne"],
+}
+
+# Gewichte je Treffer-Art: Institutionsname ist aussagekräftiger als ein Städtename
+INSTITUTION_WEIGHT = 1.0
+CITY_WEIGHT = 0.6
+
+# Erst- und Letztautor bestimmen in der Regel den federführenden Standort
+LEAD_AUTHOR_FACTOR = 1.5
+
+_TRANSLIT = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_MATCH = None  # Schlüssel für Treffer-Einträge im Trie
+
+
+def _strip_accents(text):
+    """Entfernt diakritische Zeichen (é -> e, ü -> u)"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def normalize_tokens(text):
+    """Normalisiert Text zu Tokens (Kleinschreibung, Umlaute transliteriert)"""
+    text = _strip_accents(text.casefold().translate(_TRANSLIT))
+    return _TOKEN_RE.findall(text)
+
+
+def _alias_variants(alias):
+    """Token-Varianten eines Alias: 'Köln' -> ['koeln'] und ['koln']"""
+    variants = {tuple(normalize_tokens(alias))}
+    variants.add(tuple(_TOKEN_RE.findall(_strip_accents(alias.casefold()))))
+    return [v for v in variants if v]
+
+
+class StandortResolver:
+    """Ordnet Affiliationen über einen vorkompilierten Token-Trie RACOON-Standorten zu"""
+
+    def __init__(self, standorte, institutions=(), aliases=None, city_aliases=None, cache_size=4096):
+        self.standorte = list(standorte)
+        self._trie = {}
+        self._max_depth = 0
+
+        aliases = STANDORT_ALIASES if aliases is None else aliases
+        city_aliases = CITY_ALIASES if city_aliases is None else city_aliases
+
+        for standort in self.standorte:
+            # Stadtname aus "UK <Stadt>" ableiten
+            city = standort[3:] if standort.startswith("UK ") else standort
+            self._add(city, standort, CITY_WEIGHT)
+            for city_alias in city_aliases.get(standort, []):
+                self._add(city_alias, standort, CITY_WEIGHT)
+
+            for alias in aliases.get(standort, []):
+                self._add(alias, standort, INSTITUTION_WEIGHT)
+
+        # Institutionen ohne eigenen Alias über den enthaltenen Stadtnamen zuordnen
+        for institution in institutions:
+            standort = self._match_city(institution)
+            if standort:
+                self._add(institution, standort, INSTITUTION_WEIGHT)
+
+        # Affiliationen wiederholen sich innerhalb eines Batches sehr häufig
+        self._match_cached = lru_cache(maxsize=cache_size)(self._match_affiliation)
+
+    def _add(self, alias, standort, weight):
+        """Fügt einen Alias (alle Schreibvarianten) in den Trie ein"""
+        for tokens in _alias_variants(alias):
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+
+            # Bei mehrfach registrierten Aliassen gewinnt das höhere Gewicht
+            existing = node.get(_MATCH)
+            if existing is None or existing[1] < weight:
+                node[_MATCH] = (standort, weight)
+
+            self._max_depth = max(self._max_depth, len(tokens))
+
+    def _match_city(self, text):
+        """Findet den Standort, dessen Stadtname in einem Text vorkommt"""
+        for standort, weight in self.scan(text):
+            if weight == CITY_WEIGHT:
+                return standort
+        return None
+
+    def scan(self, text):
+        """
+        Liefert alle (Standort, Gewicht)-Treffer in einem Text
+
+        Longest-Match von links; da Aliasse höchstens _max_depth Tokens lang sind,
+        bleibt der Aufwand linear in der Textlänge.
+        """
+        tokens = normalize_tokens(text)
+        matches = []
+        i = 0
+
+        while i < len(tokens):
+            node = self._trie
+            best = None
+            best_end = i
+
+            for j in range(i, min(len(tokens), i + self._max_depth)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if _MATCH in node:
+                    best = node[_MATCH]
+                    best_end = j + 1
+
+            if best:
+                matches.append(best)
+                i = best_end
+            else:
+                i += 1
+
+        return matches
+
+    def _match_affiliation(self, affiliation):
+        """Bester Treffer je Standort innerhalb einer Affiliation"""
+        scores = {}
+        for standort, weight in self.scan(affiliation):
+            scores[standort] = max(scores.get(standort, 0.0), weight)
+        return tuple(scores.items())
+
+    def resolve(self, author_affiliations):
+        """
+        Bestimmt den Standort einer Publikation
+
+        Args:
+            author_affiliations: Liste von Dicts {'author': ..., 'affiliations': [...]}
+
+        Returns:
+            Dict mit 'standort' (oder "TBD"), 'confidence' (0.0-1.0) und 'scores'
+        """
+        scores = {}
+        strength = {}
+        last_index = len(author_affiliations) - 1
+
+        for index, entry in enumerate(author_affiliations):
+            factor = LEAD_AUTHOR_FACTOR if index in (0, last_index) else 1.0
+
+            for affiliation in entry.get('affiliations', []):
+                for standort, weight in self._match_cached(affiliation):
+                    scores[standort] = scores.get(standort, 0.0) + weight * factor
+                    strength[standort] = max(strength.get(standort, 0.0), weight)
+
+        if not scores:
+            return {'standort': "TBD", 'confidence': 0.0, 'scores': {}}
+
+        best = max(scores, key=scores.get)
+
+        # Anteil am Gesamt-Score, gedämpft falls nur der Stadtname getroffen wurde
+        confidence = scores[best] / sum(scores.values()) * strength[best]
+
+        return {
+            'standort': best,
+            'confidence': round(confidence, 2),
+            'scores': {s: round(v, 2) for s, v in sorted(scores.items(), key=lambda x: -x[1])}
+        }
+
+    def resolve_many(self, publications):
+        """Bestimmt Standorte für einen ganzen Batch von Publikationen"""
+        return [self.resolve(pub.get('author_affiliations', [])) for pub in publications]
+
+
+def demo_resolver():
+    """Demo der Standort-Erkennung"""
+    print("🧪 RACOON Standort-Erkennung Demo")
+    print("=" * 50)
+
+    resolver = StandortResolver(list(STANDORT_ALIASES))
+
+    example = [
+        {'author': 'Thormann M', 'affiliations': [
+            'Department of Radiology, Otto-von-Guericke University, Magdeburg, Germany'
+        ]},
+        {'author': 'Meyer HJ', 'affiliations': [
+            'Department of Diagnostic and Interventional Radiology, University of Leipzig, Leipzig, Germany'
+        ]},
+        {'author': 'Surov A', 'affiliations': [
+            'Universitätsklinikum Magdeburg, Klinik für Radiologie und Nuklearmedizin'
+        ]},
+    ]
+
+    result = resolver.resolve(example)
+    print(f"🏥 Standort: {result['standort']} (Konfidenz {result['confidence']:.0%})")
+    for standort, score in result['scores'].items():
+        print(f"  - {standort}: {score}")
+
+
+if __name__ == "__main__":
+    demo_resolver()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Kommandozeile
+Ein Einstiegspunkt für alle Tools: racoon <befehl> [optionen]
+
+Die Befehls-Module werden erst beim Aufruf importiert - 'racoon status' lädt
+weder requests noch die PubMed-Module, solange es sie nicht braucht.
+"""
+
+import sys
+from importlib import import_module
+
+# Befehl -> (Modul mit main(), Kurzbeschreibung)
+COMMANDS = {
+    'status': ('tools.table_status', "Tabellen-Health-Check (Exit-Code 1 bei Befunden)"),
+    'cleanup': ('tools.table_cleanup', "TEST- und Leerzeilen entfernen (mit Rückfrage)"),
+    'analyze': ('tools.table_analyzer', "Muster und Feldstatistik der Tabelle"),
+    'integrate': ('pubmed.integrator', "PubMed-Discovery und Integration (Simulation)"),
+    'restore': ('tools.emergency_restore', "Backup wiederherstellen (mit Rückfrage)"),
+    'backup': ('tools.page_backup', "Aktuellen Stand nach backups/ sichern"),
+    'history': ('tools.backup_analyzer', "Backups parallel analysieren (Verlauf, Katalog)"),
+    'export': ('tools.table_export', "Spaltenorientierter Export (Parquet/Arrow/CSV/JSONL)"),
+    'watch': ('tools.page_watcher', "Seite auf Änderungen überwachen"),
+    'shard': ('tools.sharding', "Tabelle auf Unterseiten verteilen (nach Jahr/Nummern)"),
+    'index': ('tools.publication_index', "Seitenübergreifender Publikations-Index (SQLite)"),
+    'daemon': ('tools.daemon', "Dauerbetrieb mit Scheduler"),
+    'bench': ('tools.benchmark', "Benchmark-Suite"),
+}
+
+
+def print_usage():
+    print("Verwendung: racoon <befehl> [optionen]\n")
+    print("Befehle:")
+    for name, (_, summary) in COMMANDS.items():
+        print(f"  {name:<10} {summary}")
+    print("\nHilfe zu einem Befehl: racoon <befehl> --help")
+
+
+def main(argv=None):
+    """Leitet an das main() des Befehls weiter (Optionen gehen unverändert an dessen argparse)"""
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print_usage()
+        return 0
+
+    command = argv[0]
+    if command not in COMMANDS:
+        print(f"❌ Unbekannter Befehl: {command}\n")
+        print_usage()
+        return 2
+
+    module_name = COMMANDS[command][0]
+    sys.argv = [f"racoon {command}"] + argv[1:]
+    result = import_module(module_name).main()
+
+    # Die Tools liefern Erfolg als True/False (oder nichts) - als Exit-Code 0/1
+    if result is None or result is True:
+        return 0
+    if result is False:
+        return 1
+    return result
+
+if __name__ == "__main__":
+    sys.exit(main())
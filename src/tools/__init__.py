@@ -1,4 +1,4 @@
-# Tools und Utilities
-"""
-Utility-Tools für RACOON Confluence Management
+# Tools und Utilities
+"""
+Utility-Tools für RACOON Confluence Management
 """
\ No newline at end of file
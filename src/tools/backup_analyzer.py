@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Backup-Analyse
+Parst alle Stände in backups/ parallel (ein Prozess pro Kern, Dateien per mmap gelesen)
+und schreibt je Stand eine Zusammenfassung in den Katalog backups/catalog.jsonl.
+Bereits analysierte Inhalte einer Seite (gleicher Inhalts-Hash) werden nicht erneut
+geparst; daraus entstehen Zeilenzahl-Verlauf, Änderungen pro Stand und das erste
+Auftreten einer Zeile. Wer eine Version bearbeitet hat, steht nicht in den Backups
+(sie enthalten nur den Body) - dafür bleibt die Seitenhistorie in Confluence maßgeblich.
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from contextlib import nullcontext, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import PAGE_ID
+
+CATALOG_NAME = "catalog.jsonl"
+
+# <präfix>[_<seiten-id>][_v<version>]_<JJJJMMTT_HHMMSS>.html (siehe ConfluenceSSO.create_backup)
+BACKUP_NAME_RE = re.compile(
+    r'^(?P<prefix>.+?)(?:_(?P<page_id>\d{6,}))?(?:_v(?P<version>\d+))?_(?P<timestamp>\d{8}_\d{6})\.html$'
+)
+
+# Ergebnisfelder der Analyse - für einen bekannten Inhalt aus dem Katalog übernommen
+ANALYSIS_FIELDS = ('rows', 'data_rows', 'issues', 'healthy', 'keys')
+
+# Pro Worker-Prozess einmal angelegt (siehe _init_worker)
+_WORKER = {}
+
+
+def parse_backup_name(name):
+    """Präfix, Seiten-ID, Version und Zeitstempel aus dem Dateinamen (fehlende Teile als None)"""
+    match = BACKUP_NAME_RE.match(name)
+    if not match:
+        return {'prefix': Path(name).stem, 'page_id': PAGE_ID, 'version': None, 'timestamp': None}
+    timestamp = datetime.strptime(match.group('timestamp'), '%Y%m%d_%H%M%S').isoformat()
+    return {
+        'prefix': match.group('prefix'),
+        'page_id': match.group('page_id') or PAGE_ID,
+        'version': int(match.group('version')) if match.group('version') else None,
+        'timestamp': timestamp,
+    }
+
+
+def _init_worker(known_contents, with_records):
+    """Initialisiert Parser, Scanner und bekannte (Seiten-ID, Hash) einmal pro Worker-Prozess"""
+    from tools.table_health import TableHealthScanner
+
+    _WORKER['scanner'] = TableHealthScanner()
+    _WORKER['known'] = known_contents
+    _WORKER['with_records'] = with_records
+
+
+def analyze_snapshot(path):
+    """
+    Analysiert einen Stand (läuft im Worker-Prozess)
+
+    Die Datei wird per mmap gelesen: Hash und Dekodierung arbeiten direkt auf dem
+    Mapping, ohne zusätzliche bytes-Kopie.
+
+    Returns:
+        Katalog-Eintrag (Dict); bei bekanntem Inhalt derselben Seite ohne Analysefelder
+        und mit reused=True (die Felder übernimmt analyze_backups aus dem Katalog)
+    """
+    from core.table_parser import parse_table
+    from tools.page_watcher import keyed_rows
+
+    started = time.perf_counter()
+    path = Path(path)
+    stat = path.stat()
+    record = {'file': path.name, 'size': stat.st_size, 'mtime': stat.st_mtime}
+    record.update(parse_backup_name(path.name))
+
+    # Bekannter Inhalt: nur neu parsen, wenn die Zeilen für den Export gebraucht werden
+    needs_records = _WORKER.get('with_records') and record['version'] is not None
+
+    if stat.st_size == 0:
+        content = ''
+        record['hash'] = hashlib.sha256(b'').hexdigest()
+    else:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            record['hash'] = hashlib.sha256(mapped).hexdigest()
+            if (record['page_id'], record['hash']) in _WORKER.get('known', ()) and not needs_records:
+                record['reused'] = True
+                return record
+            content = str(mapped, 'utf-8', errors='replace')
+
+    table = parse_table(content)
+    report = _WORKER['scanner'].scan(table) if 'scanner' in _WORKER else None
+    rows = keyed_rows(table)
+
+    record.update({
+        'rows': len(table.rows),
+        'data_rows': len(rows),
+        'issues': len(report['issues']) if report else None,
+        'healthy': report['healthy'] if report else None,
+        # Zeilenschlüssel -> Inhalts-Hash: genügt für Diffs zwischen Ständen ohne erneutes Parsen
+        'keys': {key: hashlib.sha1('\x1f'.join(row.texts).encode('utf-8')).hexdigest()[:10]
+                 for key, row in rows.items()},
+    })
+
+    if needs_records:
+        from tools.table_export import table_records
+        record['records'] = table_records(table, record['page_id'], record['version'], record['timestamp'])
+
+    record['seconds'] = round(time.perf_counter() - started, 4)
+    return record
+
+
+class BackupCatalog:
+    """
+    Katalog der analysierten Stände (JSON-Lines, ein Eintrag pro Stand)
+
+    Ein Stand ist (Seiten-ID, Inhalts-Hash, Version bzw. Zeitstempel): kehrt eine Seite
+    zu einem früheren Inhalt zurück oder haben zwei Seiten denselben Body, sind das
+    eigene Stände. Nur dieselbe Version unter zwei Dateinamen gilt als Duplikat.
+
+    Einträge werden sofort angehängt - ein abgebrochener Lauf setzt beim nächsten
+    Aufruf an derselben Stelle fort.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.records = {}   # Stand -> Eintrag
+        self.contents = {}  # (Seiten-ID, Hash) -> erster Eintrag mit diesem Inhalt
+        self.files = {}     # Dateiname -> (Größe, mtime, Hash)
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # abgeschnittene letzte Zeile eines abgebrochenen Laufs
+                    self._remember(record)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def snapshot_key(record):
+        """Identität eines Stands: Seite, Inhalt und Version (ohne Version: Zeitstempel)"""
+        version = record['version'] if record['version'] is not None else record['timestamp']
+        return (record['page_id'], record['hash'], version)
+
+    def _remember(self, record):
+        if not record.get('duplicate'):
+            self.records[self.snapshot_key(record)] = record
+            self.contents.setdefault((record['page_id'], record['hash']), record)
+        self.files[record['file']] = (record['size'], record['mtime'], record['hash'])
+
+    def is_duplicate(self, record):
+        return self.snapshot_key(record) in self.records
+
+    def is_current(self, path):
+        """Datei unverändert seit der letzten Analyse (Name, Größe, mtime)"""
+        stat = path.stat()
+        known = self.files.get(path.name)
+        return known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime
+
+    def append(self, record):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._remember(record)
+
+    def snapshots(self, page_id=None):
+        """Analysierte Stände in zeitlicher Reihenfolge (optional nur einer Seite)"""
+        records = [r for r in self.records.values() if page_id is None or r['page_id'] == str(page_id)]
+        return sorted(records, key=lambda r: (r['timestamp'] or '', r['version'] or 0, r['file']))
+
+
+def analyze_backups(backup_dir="backups", catalog_path=None, workers=None, exporter=None, verbose=True):
+    """
+    Analysiert alle neuen Stände parallel und schreibt sie in den Katalog
+
+    Args:
+        backup_dir: Verzeichnis mit *.html Ständen
+        catalog_path: Katalog-Datei (Standard: <backup_dir>/catalog.jsonl)
+        workers: Anzahl Prozesse (Standard: alle Kerne)
+        exporter: Optional PublicationExporter für Stände mit Versionsnummer
+
+    Returns:
+        (BackupCatalog, Anzahl neu analysierter Stände)
+    """
+    backup_dir = Path(backup_dir)
+    catalog = BackupCatalog(catalog_path or backup_dir / CATALOG_NAME)
+    pending = [path for path in sorted(backup_dir.glob('*.html')) if not catalog.is_current(path)]
+
+    if verbose:
+        print(f"📁 {len(pending)} neue Dateien in {backup_dir}/ ({len(catalog.records)} Stände bereits im Katalog)")
+    if not pending:
+        return catalog, 0
+
+    workers = workers or os.cpu_count() or 1
+    analyzed = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(pending)), initializer=_init_worker,
+                             initargs=(frozenset(catalog.contents), exporter is not None)) as pool:
+        futures = {pool.submit(analyze_snapshot, str(path)): path for path in pending}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                print(f"❌ {futures[future].name}: {e}")
+                continue
+
+            records = record.pop('records', None)
+            if records is not None and exporter is not None:
+                exporter.append_records(records, record['page_id'], record['version'])
+
+            # Inhalt dieser Seite schon analysiert: Ergebnis übernehmen, der Stand zählt trotzdem
+            if record.pop('reused', False):
+                known = catalog.contents[(record['page_id'], record['hash'])]
+                record.update({key: known[key] for key in ANALYSIS_FIELDS})
+
+            # Derselbe Stand unter einem zweiten Dateinamen
+            if catalog.is_duplicate(record):
+                record = {key: record[key] for key in ('file', 'size', 'mtime', 'hash')}
+                record['duplicate'] = True
+
+            catalog.append(record)
+            if not record.get('duplicate'):
+                analyzed += 1
+
+    if verbose:
+        elapsed = time.perf_counter() - started
+        print(f"✅ {analyzed} Stände analysiert in {elapsed:.1f}s ({workers} Prozesse)")
+    return catalog, analyzed
+
+
+def trend(snapshots):
+    """
+    Verlauf über aufeinanderfolgende Stände einer Seite
+
+    Returns:
+        Liste {file, timestamp, version, data_rows, added, removed, edited}
+    """
+    result = []
+    previous = None
+    for snapshot in snapshots:
+        keys = snapshot['keys']
+        entry = {
+            'file': snapshot['file'], 'timestamp': snapshot['timestamp'], 'version': snapshot['version'],
+            'data_rows': snapshot['data_rows'], 'added': None, 'removed': None, 'edited': None
+        }
+        if previous is not None:
+            entry['added'] = sum(1 for key in keys if key not in previous)
+            entry['removed'] = sum(1 for key in previous if key not in keys)
+            entry['edited'] = sum(1 for key, digest in keys.items()
+                                  if key in previous and previous[key] != digest)
+        result.append(entry)
+        previous = keys
+    return result
+
+
+def first_seen(snapshots, key):
+    """Erster Stand, der eine Zeile (Schlüssel wie im Watcher, z.B. doi:10.1/x) enthält"""
+    for snapshot in snapshots:
+        if key in snapshot['keys']:
+            return snapshot
+    return None
+
+
+def main():
+    """Backups analysieren und Verlauf ausgeben"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RACOON Backups parallel analysieren")
+    parser.add_argument('--dir', default="backups", help="Backup-Verzeichnis")
+    parser.add_argument('--catalog', help=f"Katalog-Datei (Standard: <dir>/{CATALOG_NAME})")
+    parser.add_argument('--workers', type=int, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument('--export', metavar='DIR', help="Zeilen versionierter Stände zusätzlich exportieren")
+    parser.add_argument('--format', default='parquet', help="Format für --export (parquet/arrow/csv/jsonl)")
+    parser.add_argument('--no-pubmed', action='store_true', help="--export ohne PubMed-Anreicherung (journal)")
+    parser.add_argument('--page', default=None, help="Verlauf nur für diese Seite")
+    parser.add_argument('--row', metavar='KEY', help="Erstes Auftreten einer Zeile (z.B. doi:10.1234/abc)")
+    parser.add_argument('--json', action='store_true', help="Verlauf als JSON ausgeben")
+    args = parser.parse_args()
+
+    exporter = None
+    if args.export:
+        from tools.table_export import PublicationExporter
+        exporter = PublicationExporter(args.export, args.format, pubmed=not args.no_pubmed)
+
+    if not args.json:
+        print("🗄️ RACOON Publikationen - Backup-Analyse")
+        print("=" * 50)
+
+    # Mit --json gehört stdout allein dem Verlauf (z.B. Meldungen der PubMed-Abfragen nach stderr)
+    with redirect_stdout(sys.stderr) if args.json else nullcontext():
+        catalog, _ = analyze_backups(args.dir, args.catalog, args.workers, exporter, verbose=not args.json)
+    snapshots = catalog.snapshots(args.page)
+
+    if args.row:
+        snapshot = first_seen(snapshots, args.row)
+        if snapshot is None:
+            print(f"❌ {args.row} in keinem Stand gefunden")
+            sys.exit(1)
+        print(f"🔎 {args.row} zuerst in {snapshot['file']} ({snapshot['timestamp'] or 'ohne Zeitstempel'})")
+        return
+
+    history = trend(snapshots) if args.page else [
+        entry for page_id in sorted({s['page_id'] for s in snapshots})
+        for entry in trend(catalog.snapshots(page_id))
+    ]
+    if args.json:
+        print(json.dumps(history, indent=2, ensure_ascii=False))
+        return
+
+    print(f"\n📈 Verlauf ({len(history)} Stände)")
+    for entry in history:
+        delta = '' if entry['added'] is None else f"  +{entry['added']} -{entry['removed']} ~{entry['edited']}"
+        version = f"v{entry['version']}" if entry['version'] is not None else '   '
+        print(f"   {entry['timestamp'] or '????-??-??':<19} {version:>5} {entry['data_rows']:>6} Zeilen{delta}  {entry['file']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Benchmark-Suite
+Misst Parsing, Health-Check, Bereinigung, Rendering, Duplikat-Abgleich und Backup
+auf synthetischen Tabellen und vergleicht mit dem vorherigen Lauf (pro Commit)
+"""
+
+import io
+import gc
+import sys
+import json
+import time
+import platform
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from contextlib import redirect_stdout
+sys.path.append(str(Path(__file__).parent.parent))
+from fakes.table_generator import generate_table, generate_candidates
+
+RESULTS_DIR = Path(__file__).parent.parent.parent / "benchmarks" / "results"
+CLI = Path(__file__).parent.parent / "racoon_cli.py"
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Name -> Factory(context) -> Funktion ohne Argumente, deren Laufzeit gemessen wird
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registriert eine Benchmark-Factory"""
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+class BenchmarkContext:
+    """Testdaten einer Tabellengröße (einmal erzeugt, von allen Benchmarks geteilt)"""
+
+    def __init__(self, rows, seed=0):
+        self.rows = rows
+        self.seed = seed
+        self.content = generate_table(rows, seed)
+        self.candidates = generate_candidates(max(rows // 10, 10), seed, table_rows=rows)
+        self.tmp_dir = tempfile.TemporaryDirectory(prefix="racoon_bench_")
+        self._mapper = None
+
+    @property
+    def mapper(self):
+        if self._mapper is None:
+            from pubmed.schema_mapper import RacoonPubMedMapper
+            self._mapper = RacoonPubMedMapper()
+        return self._mapper
+
+    def close(self):
+        self.tmp_dir.cleanup()
+
+
+@benchmark('parse')
+def bench_parse(ctx):
+    from core.table_parser import parse_table
+    return lambda: parse_table(ctx.content)
+
+
+@benchmark('health')
+def bench_health(ctx):
+    # Parsen gehört dazu: Zelltexte werden pro Zeile gecacht
+    from tools.table_health import TableHealthScanner
+    scanner = TableHealthScanner()
+    return lambda: scanner.scan_content(ctx.content)
+
+
+@benchmark('cleanup')
+def bench_cleanup(ctx):
+    from tools.cleanup_rules import CleanupEngine
+    engine = CleanupEngine()
+    return lambda: engine.clean(ctx.content)
+
+
+@benchmark('stats')
+def bench_stats(ctx):
+    from core.table_parser import parse_table
+    from tools.field_stats import compute_statistics
+    return lambda: compute_statistics(parse_table(ctx.content))
+
+
+@benchmark('minify')
+def bench_minify(ctx):
+    from core.storage_minifier import minify_storage
+    return lambda: minify_storage(ctx.content)
+
+
+@benchmark('render')
+def bench_render(ctx):
+    # Eine komplette Tabelle neu rendern: so viele Einträge wie Zeilen
+    candidates = (ctx.candidates * (ctx.rows // len(ctx.candidates) + 1))[:ctx.rows]
+    entries = ctx.mapper.map_many(candidates, 1)
+    return lambda: ctx.mapper.render_rows(entries)
+
+
+@benchmark('dedup')
+def bench_dedup(ctx):
+    from core.table_parser import parse_table, publication_identifiers
+    from pubmed.integrator import RacoonPubMedIntegrator
+    exclude_existing = RacoonPubMedIntegrator.exclude_existing
+
+    def run():
+        known_dois, known_pmids = publication_identifiers(parse_table(ctx.content))
+        table_info = {'known_dois': known_dois, 'known_pmids': known_pmids}
+        return exclude_existing(ctx.candidates, table_info)
+
+    return run
+
+
+@benchmark('backup')
+def bench_backup(ctx):
+    from core.confluence_sso import ConfluenceSSO
+    sso = ConfluenceSSO("http://localhost/")
+
+    def run():
+        with redirect_stdout(io.StringIO()):
+            return sso.create_backup(ctx.content, "benchmark", backup_dir=ctx.tmp_dir.name)
+
+    return run
+
+
+@benchmark('json_read')
+def bench_json_read(ctx):
+    # Content-Antwort wie von GET /rest/api/content/{id}?expand=body.storage,version
+    from requests.models import Response
+    from core import json_codec
+    payload = json_codec.dumps({
+        'id': '1', 'type': 'page', 'title': 'Benchmark', 'version': {'number': 1},
+        'body': {'storage': {'value': ctx.content, 'representation': 'storage'}},
+        '_links': {'webui': '/pages/viewpage.action?pageId=1'}
+    })
+
+    def run():
+        response = Response()
+        response.status_code = 200
+        response._content = payload
+        return json_codec.extract_page(response)
+
+    return run
+
+
+@benchmark('json_write')
+def bench_json_write(ctx):
+    # PUT-Payload eines Updates (gestreamt, hier komplett durchlaufen)
+    from core.body_buffer import JsonStringPayload
+    return lambda: sum(len(chunk) for chunk in JsonStringPayload('{"value": ', ctx.content, '}'))
+
+
+@benchmark('cli_startup')
+def bench_cli_startup(ctx):
+    # Kaltstart: Interpreter + Import des status-Befehls, ohne Arbeit
+    command = [sys.executable, str(CLI), 'status', '--help']
+    return lambda: subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+
+
+@benchmark('cli_status')
+def bench_cli_status(ctx):
+    # Kompletter Cron-/pre-commit-Lauf auf einer lokalen Datei
+    path = Path(ctx.tmp_dir.name) / "table.html"
+    path.write_text(ctx.content, encoding='utf-8')
+    command = [sys.executable, str(CLI), 'status', '--file', str(path)]
+    return lambda: subprocess.run(command, stdout=subprocess.DEVNULL)
+
+
+def measure(func, min_rounds=3, max_rounds=50, min_time=0.5, max_time=5.0):
+    """
+    Misst eine Funktion mehrfach (GC während der Messung aus, wie timeit)
+
+    Returns:
+        Dict mit min, median, mean, rounds (Sekunden)
+    """
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(timings) < max_rounds:
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+            total = sum(timings)
+            if total >= max_time or (len(timings) >= min_rounds and total >= min_time):
+                break
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'rounds': len(timings)
+    }
+
+
+def git_revision():
+    """Kurzer Commit-Hash (mit -dirty bei lokalen Änderungen) oder 'unknown'"""
+    repo = Path(__file__).parent
+    try:
+        rev = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=repo, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no', '--', '.'],
+            cwd=repo.parent, capture_output=True, text=True
+        ).stdout.strip()
+        return f"{rev}-dirty" if dirty else rev
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def json_backend():
+    from core import json_codec
+    return json_codec.backend()
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, names=None, seed=0, verbose=True):
+    """Führt die Benchmarks für alle Größen aus und liefert das Ergebnis-Dict"""
+    names = names or list(BENCHMARKS)
+    results = {name: {} for name in names}
+
+    for rows in sizes:
+        ctx = BenchmarkContext(rows, seed)
+        if verbose:
+            print(f"\n📏 {rows:,} Zeilen ({len(ctx.content):,} Zeichen)")
+
+        try:
+            for name in names:
+                func = BENCHMARKS[name](ctx)
+                func()  # Warm-up (Imports, Caches)
+                result = measure(func)
+                results[name][str(rows)] = result
+                if verbose:
+                    print(f"  {name:<10} {result['median'] * 1000:>10.2f} ms  (min {result['min'] * 1000:.2f} ms, "
+                          f"{result['rounds']} Runden)")
+        finally:
+            ctx.close()
+
+    return {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'json': json_backend(),
+        'results': results
+    }
+
+
+def save_results(report, results_dir=RESULTS_DIR):
+    """Speichert einen Lauf als benchmarks/results/<zeitstempel>_<revision>.json"""
+    results_dir = Path(results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    stamp = report['timestamp'].replace(':', '').replace('-', '')
+    target = results_dir / f"{stamp}_{report['revision']}.json"
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return target
+
+
+def load_previous(results_dir=RESULTS_DIR, revision=None, exclude=None):
+    """Letzter gespeicherter Lauf (optional einer bestimmten Revision)"""
+    results_dir = Path(results_dir)
+    if not results_dir.exists():
+        return None
+
+    for path in sorted(results_dir.glob("*.json"), reverse=True):
+        if exclude and path == exclude:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        if revision is None or report['revision'].startswith(revision):
+            return report
+    return None
+
+
+def compare(current, previous, threshold=0.2, min_delta=0.001):
+    """
+    Vergleicht Mediane zweier Läufe
+
+    Returns:
+        Liste von Dicts (name, rows, before, after, ratio, regression)
+    """
+    rows = []
+    for name, by_size in current['results'].items():
+        for size, result in by_size.items():
+            before = previous['results'].get(name, {}).get(size)
+            if not before:
+                continue
+
+            ratio = result['median'] / before['median'] if before['median'] else float('inf')
+            delta = result['median'] - before['median']
+            rows.append({
+                'name': name,
+                'rows': int(size),
+                'before': before['median'],
+                'after': result['median'],
+                'ratio': ratio,
+                'regression': ratio > 1 + threshold and delta > min_delta
+            })
+    return rows
+
+
+def print_comparison(comparison, previous):
+    print(f"\n📊 Vergleich mit {previous['revision']} ({previous['timestamp']})")
+    print("-" * 64)
+    for row in comparison:
+        marker = "❌" if row['regression'] else ("🚀" if row['ratio'] < 0.8 else "  ")
+        print(f"{marker} {row['name']:<10} {row['rows']:>7,}  {row['before'] * 1000:>9.2f} ms -> "
+              f"{row['after'] * 1000:>9.2f} ms  ({row['ratio']:.2f}x)")
+
+
+def main():
+    """Benchmark-Lauf mit Speicherung und Regressionsvergleich"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RACOON Benchmark-Suite")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Tabellengrößen, z.B. 100,1000,10000,100000")
+    parser.add_argument('--only', help=f"Komma-Liste aus: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--baseline', help="Vergleich mit dieser Revision statt dem letzten Lauf")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Erlaubte Verlangsamung (0.2 = 20%%)")
+    parser.add_argument('--no-save', action='store_true', help="Ergebnis nicht speichern")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit-Code 1 bei Regressionen")
+    parser.add_argument('--output', default=str(RESULTS_DIR))
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    names = [n.strip() for n in args.only.split(',')] if args.only else None
+    unknown = set(names or []) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unbekannte Benchmarks: {', '.join(sorted(unknown))}")
+
+    print("⏱️ RACOON Benchmark-Suite")
+    print("=" * 50)
+
+    report = run_benchmarks(sizes, names)
+    target = None if args.no_save else save_results(report, args.output)
+    if target:
+        print(f"\n💾 Ergebnis gespeichert: {target}")
+
+    previous = load_previous(args.output, args.baseline, exclude=target)
+    if not previous:
+        print("ℹ️ Kein vorheriger Lauf zum Vergleich")
+        return
+
+    comparison = compare(report, previous, args.threshold)
+    print_comparison(comparison, previous)
+
+    regressions = [row for row in comparison if row['regression']]
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} Regression(en) über {args.threshold:.0%}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print("\n✅ Keine Regressionen")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Bereinigungsregeln
+Deklarative Zeilen-Regeln, die in einem Durchlauf über das Zeilenmodell ausgewertet werden
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core.instrumentation import timed
+from core.table_parser import FIELD_NAMES, parse_table
+
+# Die Standardregeln greifen nur in Zeilen mit der Spaltenzahl der Publikationstabelle -
+# Layout- oder Nebentabellen derselben Seite bleiben unberührt
+PUBLICATION_CELLS = len(FIELD_NAMES)
+
+
+class RowFeatures:
+    """Einmal pro Zeile berechnete Merkmale, auf denen alle Regeln arbeiten"""
+
+    __slots__ = ('row', 'texts', 'values', 'cell_count')
+
+    def __init__(self, row):
+        self.row = row
+        self.texts = row.texts
+        self.values = frozenset(self.texts)
+        self.cell_count = len(self.texts)
+
+    @property
+    def is_empty(self):
+        """Alle Zellen leer (Tags, &nbsp; und Leerzeichen zählen als leer)"""
+        return not self.values or self.values == {''}
+
+    def all_cells_equal(self, value):
+        """Alle Zellen haben denselben Klartext (Attribute wie ac:macro-id spielen keine Rolle)"""
+        return self.values == {value}
+
+
+class CleanupRule:
+    """Eine Regel: Prädikat über RowFeatures plus Begründung"""
+
+    def __init__(self, name, predicate, reason):
+        self.name = name
+        self.predicate = predicate
+        self.reason = reason
+
+    def __repr__(self):
+        return f"CleanupRule({self.name!r})"
+
+
+def empty_row_rule(cell_count=PUBLICATION_CELLS):
+    """Leere Zeilen mit cell_count Zellen (None = jede Zellenzahl)"""
+    return CleanupRule(
+        'empty_row',
+        lambda f: cell_count in (None, f.cell_count) and f.is_empty,
+        "Alle Zellen leer"
+    )
+
+
+def test_row_rule(marker="TEST", cell_count=PUBLICATION_CELLS):
+    """Zeilen mit cell_count Zellen, die alle nur den Marker enthalten (None = jede Zellenzahl)"""
+    return CleanupRule(
+        'test_row',
+        lambda f: cell_count in (None, f.cell_count) and f.all_cells_equal(marker),
+        f"Alle Zellen enthalten nur '{marker}'"
+    )
+
+
+DEFAULT_RULES = (empty_row_rule(), test_row_rule())
+
+
+class CleanupEngine:
+    """Wertet alle Regeln in einem Durchlauf über die Datenzeilen aus"""
+
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = list(rules)
+
+    def add_rule(self, name, predicate, reason):
+        """Ergänzt eine eigene Regel (Prädikat erhält RowFeatures)"""
+        self.rules.append(CleanupRule(name, predicate, reason))
+
+    @timed('cleanup.evaluate')
+    def evaluate(self, table):
+        """
+        Findet die zu entfernenden Zeilen
+
+        Returns:
+            Liste von Dicts mit row_index, start, end, rule, reason, preview
+        """
+        drops = []
+
+        for row in table.rows:
+            if row.is_header:
+                continue
+
+            features = RowFeatures(row)
+
+            # Erste zutreffende Regel gewinnt
+            for rule in self.rules:
+                if rule.predicate(features):
+                    drops.append({
+                        'row_index': row.index,
+                        'start': row.start,
+                        'end': row.end,
+                        'rule': rule.name,
+                        'reason': rule.reason,
+                        'preview': ' | '.join(features.texts)[:100]
+                    })
+                    break
+
+        return drops
+
+    def apply(self, content, drops):
+        """
+        Entfernt die Zeilen-Spans aus dem Body (ein Join über die verbleibenden Abschnitte)
+
+        Für einen BodyBuffer entsteht kein neuer String, sondern ein BodyRope mit
+        Verweisen auf die verbleibenden Abschnitte.
+        """
+        from core.body_buffer import BodyBuffer, BodyRope
+
+        if not drops:
+            return content
+        if isinstance(content, BodyBuffer):
+            return BodyRope.without(content, [(drop['start'], drop['end']) for drop in drops])
+
+        parts = []
+        position = 0
+        for drop in sorted(drops, key=lambda d: d['start']):
+            parts.append(content[position:drop['start']])
+            position = drop['end']
+        parts.append(content[position:])
+
+        return ''.join(parts)
+
+    def clean(self, content):
+        """Parst, bewertet und bereinigt einen Body - liefert (neuer Inhalt, entfernte Zeilen)"""
+        drops = self.evaluate(parse_table(content))
+        return self.apply(content, drops), drops
+
+
+def summarize_drops(drops):
+    """Anzahl entfernter Zeilen je Regel"""
+    summary = {}
+    for drop in drops:
+        summary[drop['rule']] = summary.get(drop['rule'], 0) + 1
+    return summary
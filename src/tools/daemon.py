@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Daemon-Modus
+Hält eine angemeldete Session und warme Caches und führt Health-Checks,
+inkrementelle PubMed-Discovery und Backups periodisch aus (nur lesend)
+"""
+
+import sys
+import time
+import heapq
+import random
+import signal
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+sys.path.append(str(Path(__file__).parent.parent))
+from core.instrumentation import METRICS
+from core.page_cache import PageCache
+from core.config import PAGE_IDS, PAGE_CQL
+from core.page_set import PageSet, backup_prefix, resolve_page_ids
+from core.table_parser import publication_identifiers
+from tools.table_health import TableHealthScanner
+
+# Ein Job darf höchstens diesen Anteil der Zeit belegen - sonst wird sein Intervall gestreckt
+MAX_DUTY_CYCLE = 0.5
+
+
+class Job:
+    """
+    Periodische Aufgabe
+
+    Args:
+        name: Name (für Logs und Metriken)
+        func: Funktion ohne Argumente
+        interval: Sekunden zwischen zwei Läufen
+        jitter: Relative Streuung des Intervalls (0.1 = ±10%)
+        max_backoff: Obergrenze der Wartezeit nach Fehlern
+    """
+
+    def __init__(self, name, func, interval, jitter=0.1, max_backoff=None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff or max(interval * 4, 60)
+        self.failures = 0
+        self.runs = 0
+        self.last_duration = 0.0
+
+    def next_delay(self, rng):
+        """Wartezeit bis zum nächsten Lauf (Jitter, Backoff nach Fehlern, Gegendruck bei langen Läufen)"""
+        if self.failures:
+            # Exponentieller Backoff ab 30s, gedeckelt
+            delay = min(30 * 2 ** (self.failures - 1), self.max_backoff)
+        else:
+            delay = max(self.interval, self.last_duration / MAX_DUTY_CYCLE)
+        return delay * (1 + rng.uniform(-self.jitter, self.jitter))
+
+
+class Scheduler:
+    """Heap-basierter Scheduler: ein Worker, Jobs laufen nie parallel und holen verpasste Läufe nicht nach"""
+
+    def __init__(self, seed=None):
+        self._heap = []
+        self._seq = 0
+        self._rng = random.Random(seed)
+        self.stop_event = threading.Event()
+
+    def add(self, job, delay=0.0):
+        heapq.heappush(self._heap, (time.monotonic() + delay, self._seq, job))
+        self._seq += 1
+
+    def run_once(self, job):
+        """Führt einen Job aus und plant ihn neu ein"""
+        start = time.perf_counter()
+        try:
+            with METRICS.timer('daemon.job', job=job.name):
+                job.func()
+            job.failures = 0
+            METRICS.gauge('daemon.last_success', round(time.time()), job=job.name)
+        except Exception as e:
+            job.failures += 1
+            METRICS.count('daemon.job_failures', job=job.name)
+            print(f"❌ [{job.name}] Fehler ({job.failures}. in Folge): {e}")
+        job.runs += 1
+        job.last_duration = time.perf_counter() - start
+
+        delay = job.next_delay(self._rng)
+        self.add(job, delay)
+        return delay
+
+    def run(self, max_runs=None):
+        """Arbeitet die Jobs bis stop() (oder max_runs Läufe) ab"""
+        runs = 0
+        while self._heap and not self.stop_event.is_set():
+            due, _, job = self._heap[0]
+            wait = due - time.monotonic()
+            if wait > 0:
+                # Unterbrechbar warten (SIGTERM/Strg+C)
+                if self.stop_event.wait(wait):
+                    break
+                continue
+
+            heapq.heappop(self._heap)
+            lag = -wait
+            if lag > 1:
+                METRICS.observe('daemon.schedule_lag', lag, job=job.name)
+
+            delay = self.run_once(job)
+            print(f"🕒 [{job.name}] nächster Lauf in {delay / 60:.1f} min")
+
+            runs += 1
+            if max_runs and runs >= max_runs:
+                break
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class RacoonDaemon:
+    """
+    Langlebiger Prozess für die RACOON-Seite(n)
+
+    Eine ConfluenceSSO- und eine PubMed-Session (über den Integrator), ein PageCache
+    und die warmen Parser-/Autoren-/Standort-Caches werden über alle Läufe geteilt.
+    Health-Checks und Backups laufen parallel über alle Seiten der Seitenmenge.
+    """
+
+    def __init__(self, integrator=None, backup_dir="backups", textfile=None, page_ids=None):
+        if integrator is None:
+            from pubmed.integrator import RacoonPubMedIntegrator
+            integrator = RacoonPubMedIntegrator()
+
+        self.integrator = integrator
+        self.confluence_sso = integrator.confluence_sso
+        self.page_id = integrator.page_id
+        self.pages = PageCache(self.confluence_sso)
+        self.page_set = PageSet(self.confluence_sso, page_ids or [self.page_id], page_cache=self.pages)
+        self.scanner = TableHealthScanner()
+        self.backup_dir = backup_dir
+        self.textfile = textfile
+        self.scheduler = Scheduler()
+        self.jobs = []
+
+        self.last_health = {}  # Seite -> (Version, Report)
+        self.last_backup_version = {}  # Seite -> gesicherte Version
+        self.last_discovery = None
+        self.reported_pmids = set()  # Kandidaten nur einmal melden
+
+    def authenticate(self):
+        """Einmalige Anmeldung mit gespeicherter Session/Cookies (kein interaktiver Prompt)"""
+        return self.confluence_sso.login(interactive=False)
+
+    # --- Jobs ---
+
+    def health_job(self):
+        """Health-Check aller Seiten; ohne neue Version wird der letzte Report wiederverwendet"""
+        self._expand_shards()
+        loaded = self.page_set.prefetch()
+        outcomes = self.page_set.map(lambda page_id: self._check_page(page_id, loaded.get(page_id)))
+        reports = [outcome['result'] for outcome in outcomes if outcome['error'] is None]
+        for outcome in outcomes:
+            if outcome['error']:
+                print(f"❌ [health] Seite {outcome['page_id']}: {outcome['error']}")
+
+        METRICS.gauge('table.rows', sum(report['data_rows'] for report in reports))
+        METRICS.gauge('table.issues', sum(len(report['issues']) for report in reports))
+        if len(self.page_set) == 1 and reports:
+            METRICS.gauge('table.version', self.last_health[self.page_set.page_ids[0]][0])
+        self._export()
+
+        if len(reports) < len(outcomes):
+            raise RuntimeError(f"{len(outcomes) - len(reports)} Seite(n) nicht erreichbar")
+
+    def _expand_shards(self):
+        """Aufgeteilte Seiten durch ihre Unterseiten ersetzen (vor jedem Job, neue Teile kommen hinzu)"""
+        before = list(self.page_set.page_ids)
+        self.page_set.expand_shards()
+        if self.page_set.page_ids != before:
+            for index, shard_ids in self.page_set.shard_indexes.items():
+                print(f"🗂️ Seite {index} ist aufgeteilt: {len(shard_ids)} Unterseiten")
+
+    def _check_page(self, page_id, page=None):
+        page = page or self.pages.get(page_id)
+        last = self.last_health.get(page_id)
+        if last and last[0] == page.version:
+            return last[1]
+
+        report = self.scanner.scan(page.table)
+        self.last_health[page_id] = (page.version, report)
+        status = "✅ gesund" if report['healthy'] else f"⚠️ {len(report['issues'])} Befunde"
+        print(f"🔍 [health] Seite {page_id} Version {page.version}: {report['data_rows']} Zeilen, {status}")
+        if len(self.page_set) > 1:
+            METRICS.gauge('table.rows', report['data_rows'], page_id=page_id)
+            METRICS.gauge('table.issues', len(report['issues']), page_id=page_id)
+            METRICS.gauge('table.version', page.version, page_id=page_id)
+        return report
+
+    def discovery_job(self):
+        """Inkrementelle Discovery: nur seit dem letzten Lauf eingegangene Artikel"""
+        # Überlappung von einem Tag, da PubMed das Eingangsdatum tagesgenau führt
+        since = self.last_discovery - timedelta(days=1) if self.last_discovery else None
+        started = datetime.now()
+
+        # Eine Publikation gilt als bekannt, wenn sie auf irgendeiner Seite der Menge steht
+        known_dois, known_pmids = set(), set()
+        self._expand_shards()
+        for outcome in self.page_set.load():
+            if outcome['error']:
+                raise RuntimeError(f"Seite {outcome['page_id']}: {outcome['error']}")
+            dois, pmids = publication_identifiers(outcome['result'].table)
+            known_dois.update(dois)
+            known_pmids.update(pmids)
+
+        publications = self.integrator.discover_new_publications(max_per_query=20, since=since)
+        candidates = self.integrator.exclude_existing(
+            publications, {'known_dois': known_dois, 'known_pmids': known_pmids}
+        )
+        candidates = [pub for pub in candidates if pub['pmid'] not in self.reported_pmids]
+        relevant = self.integrator.filter_and_score_publications(candidates, min_score=60) if candidates else []
+
+        self.reported_pmids.update(pub['pmid'] for pub in candidates)
+        self.last_discovery = started
+
+        METRICS.gauge('integrator.candidates', len(relevant))
+        if relevant:
+            print(f"📚 [discovery] {len(relevant)} neue Kandidaten:")
+            for pub in relevant:
+                print(f"   - {pub['pmid']}: {pub['title'][:70]}")
+        self._export()
+
+    def backup_job(self):
+        """Snapshot je Seite, nur bei neuer Version"""
+        self._expand_shards()
+        loaded = self.page_set.prefetch()
+        outcomes = self.page_set.map(lambda page_id: self._backup_page(page_id, loaded.get(page_id)))
+        failed = [outcome for outcome in outcomes if outcome['error']]
+        for outcome in failed:
+            print(f"❌ [backup] Seite {outcome['page_id']}: {outcome['error']}")
+        if failed:
+            raise RuntimeError(f"{len(failed)} Backup(s) fehlgeschlagen")
+
+    def _backup_page(self, page_id, page=None):
+        page = page or self.pages.get(page_id)
+        if page.version == self.last_backup_version.get(page_id):
+            print(f"💾 [backup] Seite {page_id} Version {page.version} bereits gesichert")
+            return None
+
+        name = f"{backup_prefix('racoon_daemon', page_id)}_v{page.version}"
+        path = self.confluence_sso.create_backup(page.content, name, self.backup_dir)
+        self.last_backup_version[page_id] = page.version
+        METRICS.count('daemon.backups')
+        return path
+
+    def _export(self):
+        if self.textfile:
+            from core.metrics_export import write_textfile
+            write_textfile(self.textfile, labels={'tool': 'daemon'})
+
+    # --- Ablauf ---
+
+    def schedule(self, health_interval, discovery_interval, backup_interval, jitter=0.1):
+        """Plant die Jobs ein (versetzt, damit sie nicht gleichzeitig fällig werden)"""
+        self.jobs = [
+            Job('health', self.health_job, health_interval, jitter),
+            Job('backup', self.backup_job, backup_interval, jitter),
+            Job('discovery', self.discovery_job, discovery_interval, jitter),
+        ]
+        for offset, job in enumerate(self.jobs):
+            self.scheduler.add(job, offset * 5)
+
+    def run(self, max_runs=None):
+        self.scheduler.run(max_runs)
+
+    def run_all_once(self):
+        """Jeden Job sofort einmal ausführen (z.B. zum Testen der Konfiguration)"""
+        for job in self.jobs:
+            self.scheduler.run_once(job)
+
+    def stop(self, *args):
+        print("\n🛑 Daemon wird beendet...")
+        self.scheduler.stop()
+
+
+def main():
+    """Startet den Daemon"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RACOON Daemon: Health-Checks, Discovery und Backups")
+    parser.add_argument('--health-interval', type=float, default=15, help="Minuten (Standard: 15)")
+    parser.add_argument('--discovery-interval', type=float, default=360, help="Minuten (Standard: 360)")
+    parser.add_argument('--backup-interval', type=float, default=1440, help="Minuten (Standard: 1440)")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Relative Streuung der Intervalle")
+    parser.add_argument('--backup-dir', default="backups")
+    parser.add_argument('--metrics-port', type=int, help="Prometheus /metrics Endpunkt auf diesem Port")
+    parser.add_argument('--prometheus-textfile', help="Metriken nach jedem Lauf in diese *.prom Datei")
+    parser.add_argument('--once', action='store_true', help="Jeden Job einmal ausführen und beenden")
+    parser.add_argument('--page', action='append', metavar='ID',
+                        help="Seiten für Health-Check und Backup (mehrfach oder kommagetrennt)")
+    parser.add_argument('--cql', help="CQL-Selektor für die Seitenmenge (einmal beim Start aufgelöst)")
+    args = parser.parse_args()
+
+    print("🦝 RACOON Daemon")
+    print("=" * 50)
+
+    daemon = RacoonDaemon(backup_dir=args.backup_dir, textfile=args.prometheus_textfile)
+    if not daemon.authenticate():
+        sys.exit(1)
+
+    if args.page or args.cql or len(PAGE_IDS) > 1 or PAGE_CQL:
+        page_ids = resolve_page_ids(daemon.confluence_sso, args.page, args.cql)
+        if not page_ids:
+            print("❌ Keine Seiten gefunden (--page/--cql prüfen)")
+            sys.exit(1)
+        daemon.page_set = PageSet(daemon.confluence_sso, page_ids, page_cache=daemon.pages)
+        print(f"📚 {len(page_ids)} Seiten: {', '.join(page_ids)}")
+
+    if args.metrics_port:
+        from core.metrics_export import serve_metrics, render_prometheus
+        serve_metrics(lambda: render_prometheus(labels={'tool': 'daemon'}), port=args.metrics_port)
+        print(f"📈 Metriken unter http://127.0.0.1:{args.metrics_port}/metrics")
+
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+
+    daemon.schedule(args.health_interval * 60, args.discovery_interval * 60, args.backup_interval * 60,
+                    args.jitter)
+    if args.once:
+        daemon.run_all_once()
+    else:
+        daemon.run()
+
+    print("👋 Daemon beendet")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Feldstatistik
+Einmaliger Durchlauf über das Zeilenmodell mit speicherbegrenzten Sketches
+"""
+
+import re
+import sys
+import math
+from hashlib import blake2b
+from functools import lru_cache
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core.instrumentation import timed
+from core.table_parser import FIELD_NAMES, PLACEHOLDERS, YEAR_MONTH_RE, FOERDER_RE
+
+_LETTERS_RE = re.compile(r'[^\W\d_]+')
+_DIGITS = str.maketrans('0123456789', '9999999999')
+
+
+def _hash64(value):
+    """Stabiler 64-Bit Hash (unabhängig von PYTHONHASHSEED, Sketches bleiben mergebar)"""
+    return int.from_bytes(blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+# Formklassen haben nur wenige verschiedene Werte
+_hash64_cached = lru_cache(maxsize=1024)(_hash64)
+
+
+def pattern_class(text, max_length=24):
+    """Formklasse eines Werts: Buchstabenfolgen -> 'a', Ziffern -> '9' ('2025/09' -> '9999/99')"""
+    return _LETTERS_RE.sub('a', text[:max_length * 4]).translate(_DIGITS)[:max_length]
+
+
+class HyperLogLog:
+    """Kardinalitäts-Schätzer mit fester Speichergröße (2^p Register)"""
+
+    def __init__(self, p=12):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, value, h=None):
+        h = _hash64(value) if h is None else h
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        # Korrektur für kleine Kardinalitäten (Linear Counting)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+
+class CountMinSketch:
+    """Häufigkeits-Schätzer mit fester Speichergröße (depth x width Zähler)"""
+
+    def __init__(self, width=1024, depth=4):
+        self.width = width
+        self.depth = depth
+        self.tables = [[0] * width for _ in range(depth)]
+        self.total = 0
+
+    def _indexes(self, h):
+        # Double Hashing: ein 64-Bit Hash liefert alle depth Positionen
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        width = self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, value, count=1, h=None):
+        """Zählt einen Wert und liefert die neue Schätzung"""
+        h = _hash64(value) if h is None else h
+        self.total += count
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        width = self.width
+        estimate = None
+        for table in self.tables:
+            index = h1 % width
+            table[index] += count
+            if estimate is None or table[index] < estimate:
+                estimate = table[index]
+            h1 += h2
+        return estimate
+
+    def estimate(self, value):
+        h = _hash64(value)
+        return min(table[index] for table, index in zip(self.tables, self._indexes(h)))
+
+    def error_bound(self):
+        """Additive Fehlerschranke (e/width * N), mit hoher Wahrscheinlichkeit eingehalten"""
+        return math.e / self.width * self.total
+
+
+class TopK:
+    """Top-k Werte über Count-Min-Schätzungen (begrenzte Kandidatenmenge)"""
+
+    def __init__(self, k=5, width=1024, depth=4):
+        self.k = k
+        self.capacity = k * 4
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = {}
+        self._floor = 0  # kleinste Schätzung unter den Kandidaten
+
+    def add(self, value, h=None):
+        estimate = self.sketch.add(value, h=h)
+        candidates = self.candidates
+
+        if value in candidates or len(candidates) < self.capacity:
+            candidates[value] = estimate
+            return
+
+        if estimate <= self._floor:
+            return
+
+        weakest = min(candidates, key=candidates.get)
+        if estimate > candidates[weakest]:
+            del candidates[weakest]
+            candidates[value] = estimate
+        self._floor = min(candidates.values())
+
+    def top(self):
+        """Top-k Werte, deren Schätzung über der Fehlerschranke des Sketches liegt"""
+        bound = self.sketch.error_bound()
+        ranked = sorted(
+            (item for item in self.candidates.items() if item[1] > bound),
+            key=lambda item: (-item[1], item[0])
+        )
+        return ranked[:self.k]
+
+
+class ColumnStatistics:
+    """Statistik einer Tabellenspalte"""
+
+    def __init__(self, name, top_k=5):
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        self.placeholders = 0
+        self.cardinality = HyperLogLog()
+        self.top_values = TopK(top_k)
+        self.patterns = TopK(top_k, width=256)
+
+    def update(self, text):
+        self.count += 1
+
+        if not text:
+            self.nulls += 1
+            return
+        if text.lower() in PLACEHOLDERS:
+            self.placeholders += 1
+
+        # Ein Hash pro Wert für HyperLogLog und Count-Min
+        value = text[:120]
+        h = _hash64(value)
+        self.cardinality.add(value, h)
+        self.top_values.add(value, h)
+
+        pattern = pattern_class(text)
+        self.patterns.add(pattern, _hash64_cached(pattern))
+
+    def to_dict(self):
+        count = self.count or 1
+        return {
+            'count': self.count,
+            'nulls': self.nulls,
+            'null_rate': round(self.nulls / count, 4),
+            'placeholders': self.placeholders,
+            'placeholder_rate': round(self.placeholders / count, 4),
+            'cardinality': self.cardinality.estimate() if self.count > self.nulls else 0,
+            'top_values': self.top_values.top(),
+            'patterns': self.patterns.top(),
+        }
+
+
+class TableStatistics:
+    """Feldstatistik einer kompletten Publikationstabelle (ein Durchlauf)"""
+
+    def __init__(self, field_names=FIELD_NAMES, top_k=5):
+        self.field_names = list(field_names)
+        self.columns = [ColumnStatistics(name, top_k) for name in self.field_names]
+        self.rows = 0
+        self.column_count_mismatches = 0
+
+        # Histogramme über kleine, fachlich begrenzte Wertebereiche
+        self.year_histogram = {}
+        self.site_histogram = {}
+        self.funding_prefix_histogram = {}
+
+    def update(self, row):
+        texts = row.texts
+        self.rows += 1
+
+        if len(texts) != len(self.columns):
+            self.column_count_mismatches += 1
+
+        for column, text in zip(self.columns, texts):
+            column.update(text)
+
+        if len(texts) > 1:
+            match = YEAR_MONTH_RE.search(texts[1])
+            year = match.group(1) if match else "?"
+            self.year_histogram[year] = self.year_histogram.get(year, 0) + 1
+
+        if len(texts) > 2:
+            site = texts[2] or "?"
+            self.site_histogram[site] = self.site_histogram.get(site, 0) + 1
+
+        if len(texts) > 4:
+            match = FOERDER_RE.search(texts[4])
+            if match:
+                prefix = match.group(1).upper()
+                if match.group(2):
+                    prefix += " " + match.group(2)[:2] + "…"
+            else:
+                prefix = "?"
+            self.funding_prefix_histogram[prefix] = self.funding_prefix_histogram.get(prefix, 0) + 1
+
+    def to_dict(self):
+        return {
+            'rows': self.rows,
+            'column_count_mismatches': self.column_count_mismatches,
+            'columns': {c.name: c.to_dict() for c in self.columns},
+            'histograms': {
+                'year': dict(sorted(self.year_histogram.items())),
+                'site': dict(sorted(self.site_histogram.items(), key=lambda x: -x[1])),
+                'funding_prefix': dict(sorted(self.funding_prefix_histogram.items(), key=lambda x: -x[1])),
+            }
+        }
+
+
+@timed('stats.compute', items=lambda stats: stats.rows)
+def compute_statistics(table, top_k=5):
+    """Berechnet die Feldstatistik aller Datenzeilen einer geparsten Tabelle"""
+    stats = TableStatistics(top_k=top_k)
+    for row in table.rows:
+        if not row.is_header:
+            stats.update(row)
+    return stats
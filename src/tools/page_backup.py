@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Backup
+Sichert den aktuellen Storage-Format Body einer oder mehrerer Seiten nach backups/
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import CONFLUENCE_URL, PAGE_ID
+from core.page_set import add_page_arguments, page_set_from_args, print_page_summary
+
+
+def backup_page(page_id=PAGE_ID, prefix="racoon_publications_backup", backup_dir="backups"):
+    """
+    Lädt eine Seite und speichert ihren Body als Backup
+
+    Returns:
+        Pfad der Backup-Datei oder None bei Fehlern
+    """
+    from core.confluence_sso import ConfluenceSSO
+
+    confluence_sso = ConfluenceSSO(CONFLUENCE_URL)
+    if not confluence_sso.login(interactive=False):
+        return None
+
+    try:
+        page, body = confluence_sso.get_page_body(page_id)
+    except Exception as e:
+        print(f"❌ Fehler beim Laden der Seite: {e}")
+        return None
+
+    version = page['version']['number']
+    print(f"✅ Seite geladen: Version {version}")
+    with body:
+        return confluence_sso.create_backup(body, f"{prefix}_v{version}", backup_dir)
+
+
+def main():
+    """Backup der Publikationsseiten (parallel, ein Präfix pro Seite)"""
+    import argparse
+    from core.confluence_sso import ConfluenceSSO
+
+    parser = argparse.ArgumentParser(description="RACOON Publikationsseiten sichern")
+    parser.add_argument('--page-id', dest='page', action='append', help=argparse.SUPPRESS)
+    parser.add_argument('--prefix', default="racoon_publications_backup")
+    parser.add_argument('--output', default="backups", help="Zielverzeichnis")
+    add_page_arguments(parser)
+    args = parser.parse_args()
+
+    confluence_sso = ConfluenceSSO(CONFLUENCE_URL)
+    if not confluence_sso.login(interactive=False):
+        sys.exit(1)
+
+    try:
+        page_set = page_set_from_args(args, confluence_sso)
+    except Exception as e:
+        print(f"❌ Fehler: {e}")
+        sys.exit(1)
+
+    print(f"💾 Sichere {len(page_set)} Seite(n) nach {args.output}/")
+    outcomes = page_set.backup(args.prefix, args.output)
+    print_page_summary(outcomes, lambda path: Path(path).name)
+
+    if any(outcome['error'] for outcome in outcomes):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Änderungs-Watcher
+Fragt nur die Versionsnummer der Seite ab (adaptives Intervall), lädt den Body
+erst bei einer neuen Version und meldet Zeilen-Änderungen (added/removed/edited)
+an registrierte Handler
+"""
+
+import sys
+import json
+import random
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import CONFLUENCE_URL, PAGE_ID
+from core.instrumentation import METRICS
+from core.page_cache import PageCache
+from core.page_set import resolve_page_ids
+from core.table_parser import DOI_RE, PMID_RE, FIELD_NAMES
+
+EVENT_KINDS = ('added', 'removed', 'edited')
+
+
+def row_key(row):
+    """
+    Stabile Identität einer Zeile: DOI, sonst PMID, sonst Nummer, sonst Inhalts-Hash
+
+    Die Nummer allein taugt nicht - beim Einfügen oben wird neu nummeriert.
+    """
+    if len(row.cells) > 5:
+        raw = row.cell_raw(5)
+        match = DOI_RE.search(raw)
+        if match:
+            return 'doi:' + match.group(1).rstrip('.,;').lower()
+        match = PMID_RE.search(raw)
+        if match:
+            return 'pmid:' + match.group(1)
+
+    number = row.text(0)
+    if number.isdigit():
+        return 'nr:' + number
+
+    digest = hashlib.sha1('\x1f'.join(row.texts).encode('utf-8')).hexdigest()[:12]
+    return 'hash:' + digest
+
+
+def keyed_rows(table):
+    """{Schlüssel: Zeile}; mehrfach vorkommende Schlüssel bekommen ein #n-Suffix"""
+    rows = {}
+    for row in table.data_rows:
+        key = row_key(row)
+        if key in rows:
+            n = 2
+            while f"{key}#{n}" in rows:
+                n += 1
+            key = f"{key}#{n}"
+        rows[key] = row
+    return rows
+
+
+def _row_dict(row):
+    return dict(zip(FIELD_NAMES, row.texts))
+
+
+def diff_tables(old_table, new_table):
+    """
+    Zeilen-Diff zweier Tabellenstände
+
+    Returns:
+        Liste von Events {kind, key, number, before, after, columns}
+        (before/after als Dict Spaltenname -> Text, columns = geänderte Spalten)
+    """
+    old_rows = keyed_rows(old_table)
+    new_rows = keyed_rows(new_table)
+    events = []
+
+    for key, row in new_rows.items():
+        previous = old_rows.get(key)
+        if previous is None:
+            events.append({'kind': 'added', 'key': key, 'number': row.text(0),
+                           'before': None, 'after': _row_dict(row), 'columns': []})
+            continue
+
+        if previous.texts != row.texts:
+            before, after = _row_dict(previous), _row_dict(row)
+            columns = [name for name in FIELD_NAMES if before.get(name) != after.get(name)]
+            events.append({'kind': 'edited', 'key': key, 'number': row.text(0),
+                           'before': before, 'after': after, 'columns': columns})
+
+    for key, row in old_rows.items():
+        if key not in new_rows:
+            events.append({'kind': 'removed', 'key': key, 'number': row.text(0),
+                           'before': _row_dict(row), 'after': None, 'columns': []})
+
+    return events
+
+
+class PageWatcher:
+    """
+    Überwacht eine Seite auf neue Versionen
+
+    Args:
+        page_cache: PageCache einer angemeldeten Session
+        page_id: Zu überwachende Seite
+        min_interval: Sekunden zwischen Abfragen direkt nach einer Änderung
+        max_interval: Obergrenze, auf die das Intervall ohne Änderungen wächst
+        backoff: Faktor, um den das Intervall pro Abfrage ohne Änderung wächst
+    """
+
+    def __init__(self, page_cache, page_id=PAGE_ID, min_interval=30, max_interval=900, backoff=1.5):
+        self.pages = page_cache
+        self.page_id = str(page_id)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.current = None  # Zuletzt gesehener Stand (CachedPage)
+        self.stop_event = threading.Event()
+        self._handlers = []
+        self._rng = random.Random()
+
+    def add_handler(self, handler, kinds=EVENT_KINDS):
+        """Registriert handler(event, change) für die angegebenen Event-Arten"""
+        self._handlers.append((handler, set(kinds)))
+        return handler
+
+    def _emit(self, change):
+        for event in change['events']:
+            METRICS.count('watcher.events', kind=event['kind'])
+            for handler, kinds in self._handlers:
+                if event['kind'] in kinds:
+                    handler(event, change)
+
+    def check(self):
+        """
+        Eine Abfrage: bedingter GET (bzw. Versions-Probe), bei Änderung diffen
+
+        Returns:
+            Change-Dict {page_id, old_version, new_version, events} oder None
+        """
+        if self.current is None:
+            # Erster Lauf: Ausgangsstand, keine Events
+            self.current = self.pages.get(self.page_id)
+            return None
+
+        previous = self.current
+        self.current = self.pages.revalidate(self.page_id)
+        if self.current.version == previous.version:
+            return None
+
+        change = {
+            'page_id': self.page_id,
+            'old_version': previous.version,
+            'new_version': self.current.version,
+            'detected': datetime.now().isoformat(timespec='seconds'),
+            'events': diff_tables(previous.table, self.current.table)
+        }
+        METRICS.count('watcher.changes')
+        self._emit(change)
+        return change
+
+    def next_interval(self, changed):
+        """Nach Änderungen kurz, sonst wachsend bis max_interval (±10% Jitter)"""
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return self.interval * (1 + self._rng.uniform(-0.1, 0.1))
+
+    def run(self, max_checks=None):
+        """Abfrage-Schleife bis stop() (Fehler werden gemeldet, die Schleife läuft weiter)"""
+        checks = 0
+        while not self.stop_event.is_set():
+            try:
+                changed = self.check() is not None
+            except Exception as e:
+                print(f"❌ Abfrage fehlgeschlagen: {e}")
+                METRICS.count('watcher.errors')
+                changed = False
+
+            checks += 1
+            if max_checks and checks >= max_checks:
+                break
+            self.stop_event.wait(self.next_interval(changed))
+
+    def stop(self, *args):
+        self.stop_event.set()
+
+
+def print_event(event, change):
+    """Standard-Handler: eine Zeile pro Event"""
+    icon = {'added': '➕', 'removed': '➖', 'edited': '✏️'}[event['kind']]
+    detail = f" ({', '.join(event['columns'])})" if event['columns'] else ''
+    print(f"{icon} {change['page_id']} v{change['new_version']} Nr. {event['number'] or '?'} {event['key']}{detail}")
+
+
+def jsonl_handler(path):
+    """Handler, der Events als JSON-Lines anhängt (für inkrementelle Weiterverarbeitung)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock = threading.Lock()  # mehrere Watcher-Threads schreiben in dieselbe Datei
+
+    def handler(event, change):
+        record = dict(event, page_id=change['page_id'], version=change['new_version'],
+                      detected=change['detected'])
+        with lock, open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    return handler
+
+
+def main():
+    """Watcher für die Publikationsseite(n) - ein Thread pro Seite, ein gemeinsamer Cache"""
+    import argparse
+    import signal
+    from core.confluence_sso import ConfluenceSSO
+
+    parser = argparse.ArgumentParser(description="RACOON Seite auf Änderungen überwachen")
+    parser.add_argument('--page', action='append', metavar='ID',
+                        help="Seiten-ID (mehrfach oder kommagetrennt; Standard: RACOON_PAGE_IDS)")
+    parser.add_argument('--cql', help="CQL-Selektor für die Seitenmenge (einmal beim Start aufgelöst)")
+    parser.add_argument('--min-interval', type=float, default=30, help="Sekunden nach einer Änderung")
+    parser.add_argument('--max-interval', type=float, default=900, help="Obergrenze in Sekunden")
+    parser.add_argument('--events', help="Events zusätzlich als JSON-Lines in diese Datei schreiben")
+    parser.add_argument('--index', metavar='DB', help="Publikations-Index (SQLite) aus den Events fortschreiben")
+    args = parser.parse_args()
+
+    print("👀 RACOON Änderungs-Watcher")
+    print("=" * 50)
+
+    confluence_sso = ConfluenceSSO(CONFLUENCE_URL)
+    if not confluence_sso.login(interactive=False):
+        sys.exit(1)
+
+    page_ids = resolve_page_ids(confluence_sso, args.page, args.cql)
+    if not page_ids:
+        print("❌ Keine Seiten gefunden (--page/--cql prüfen)")
+        sys.exit(1)
+
+    page_cache = PageCache(confluence_sso, max_pages=max(64, len(page_ids)))
+    events_handler = jsonl_handler(args.events) if args.events else None
+
+    index = None
+    if args.index:
+        from core.page_set import PageSet
+        from tools.publication_index import PublicationIndex
+
+        # Ausgangsstand einmal indizieren, danach nur noch Events übernehmen
+        index = PublicationIndex(args.index)
+        index.sync(PageSet(confluence_sso, page_ids, page_cache=page_cache))
+    watchers = []
+    for page_id in page_ids:
+        watcher = PageWatcher(page_cache, page_id, args.min_interval, args.max_interval)
+        watcher.add_handler(print_event)
+        if events_handler:
+            watcher.add_handler(events_handler)
+        if index:
+            watcher.add_handler(index.handler)
+        watchers.append(watcher)
+
+    def stop(*_):
+        for watcher in watchers:
+            watcher.stop()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"🔁 Überwache {', '.join(page_ids)} (Intervall {args.min_interval:.0f}-{args.max_interval:.0f}s)")
+    threads = [threading.Thread(target=watcher.run, name=f"watch-{watcher.page_id}", daemon=True)
+               for watcher in watchers]
+    for thread in threads:
+        thread.start()
+    # join mit Timeout, damit Signale im Hauptthread ankommen
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(0.5)
+    print("\n👋 Watcher beendet")
+
+if __name__ == "__main__":
+    main()
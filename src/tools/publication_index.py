@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Seitenübergreifender Index
+Konsolidiert die Zeilen aller Publikationsseiten in einer SQLite-Datenbank
+(Schlüssel: DOI, sonst PMID, sonst normalisierter Titel). Der Index wird aus den
+Zeilen-Diffs des Watchers fortgeschrieben; Abfragen nach Autor, Standort, Jahr und
+Fördernummer sowie Widersprüche bei Nummerierung und Förderhinweis brauchen
+keinen Seitenabruf.
+"""
+
+import re
+import sys
+import json
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from datetime import datetime
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import CONFLUENCE_URL
+from core.instrumentation import METRICS
+from core.table_parser import FIELD_NAMES, fields_from_texts, publication_fields
+from pubmed.author_normalizer import normalize, match_keys
+from tools.page_watcher import keyed_rows
+
+INDEX_PATH = Path('index') / 'publications.sqlite'
+
+# Kürzere Titel sind als Schlüssel zu unspezifisch
+MIN_TITLE_KEY_LENGTH = 20
+
+_TITLE_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_PERSON_SEPARATORS = re.compile(r'[;,]')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page_id TEXT PRIMARY KEY,
+    title TEXT,
+    version INTEGER,
+    indexed TEXT
+);
+CREATE TABLE IF NOT EXISTS entries (
+    page_id TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    pub_key TEXT NOT NULL,
+    nummer INTEGER,
+    year INTEGER,
+    month INTEGER,
+    standort TEXT,
+    personen TEXT,
+    foerder_flag TEXT,
+    foerder_nummer INTEGER,
+    doi TEXT,
+    pmid INTEGER,
+    title TEXT,
+    PRIMARY KEY (page_id, row_key)
+);
+CREATE TABLE IF NOT EXISTS authors (
+    page_id TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    author_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_pub_key ON entries (pub_key);
+CREATE INDEX IF NOT EXISTS entries_year ON entries (year);
+CREATE INDEX IF NOT EXISTS entries_standort ON entries (standort COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS entries_foerder ON entries (foerder_nummer);
+CREATE INDEX IF NOT EXISTS authors_key ON authors (author_key);
+CREATE INDEX IF NOT EXISTS authors_row ON authors (page_id, row_key);
+"""
+
+ENTRY_COLUMNS = ('nummer', 'year', 'month', 'standort', 'personen', 'foerder_flag',
+                 'foerder_nummer', 'doi', 'pmid', 'title')
+
+
+def normalize_title(title):
+    """Vergleichsform eines Titels (Akzente entfernt, nur Buchstaben und Ziffern)"""
+    text = unicodedata.normalize('NFKD', (title or '').casefold())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return _TITLE_NON_ALNUM.sub(' ', text).strip()
+
+
+def publication_key(fields, row_key=None):
+    """
+    Seitenübergreifender Schlüssel einer Zeile: doi:, pmid:, title: oder None
+
+    Args:
+        fields: Felder aus publication_fields/fields_from_texts
+        row_key: Zeilenschlüssel des Watchers (liefert DOI/PMID aus Links nach)
+    """
+    if fields.get('doi'):
+        return 'doi:' + fields['doi'].lower()
+    if fields.get('pmid'):
+        return f"pmid:{fields['pmid']}"
+    if row_key and row_key.split('#')[0].startswith(('doi:', 'pmid:')):
+        return row_key.split('#')[0]
+    title = normalize_title(fields.get('title'))
+    if len(title) >= MIN_TITLE_KEY_LENGTH:
+        return 'title:' + title
+    return None
+
+
+def author_keys(personen):
+    """Kanonische Autorenschlüssel der Personen-Spalte ('Meyer HJ, Surov A')"""
+    keys = []
+    for name in _PERSON_SEPARATORS.split(personen or ''):
+        name = name.strip()
+        if name:
+            key = normalize(name)
+            if key not in keys:
+                keys.append(key)
+    return keys
+
+
+class PublicationIndex:
+    """
+    Konsolidierter Publikations-Index (SQLite, thread-safe)
+
+    Args:
+        path: Datenbankdatei (Standard: index/publications.sqlite, ':memory:' für Tests)
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        if str(path) != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self._lock = threading.RLock()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Fortschreiben ---
+
+    def page_version(self, page_id):
+        """Indizierte Version einer Seite (None = unbekannt oder veraltet)"""
+        with self._lock:
+            row = self.db.execute("SELECT version FROM pages WHERE page_id = ?", (str(page_id),)).fetchone()
+        return row['version'] if row else None
+
+    def _set_page(self, page_id, version, title=None):
+        self.db.execute(
+            "INSERT INTO pages (page_id, title, version, indexed) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(page_id) DO UPDATE SET title = COALESCE(excluded.title, title), "
+            "version = excluded.version, indexed = excluded.indexed",
+            (str(page_id), title, version, datetime.now().isoformat(timespec='seconds'))
+        )
+
+    def _delete_row(self, page_id, row_key):
+        self.db.execute("DELETE FROM entries WHERE page_id = ? AND row_key = ?", (page_id, row_key))
+        self.db.execute("DELETE FROM authors WHERE page_id = ? AND row_key = ?", (page_id, row_key))
+
+    def _insert_row(self, page_id, row_key, fields):
+        pub_key = publication_key(fields, row_key) or f"row:{page_id}:{row_key}"
+        self.db.execute(
+            f"INSERT OR REPLACE INTO entries (page_id, row_key, pub_key, {', '.join(ENTRY_COLUMNS)}) "
+            f"VALUES (?, ?, ?{', ?' * len(ENTRY_COLUMNS)})",
+            (page_id, row_key, pub_key) + tuple(fields.get(column) for column in ENTRY_COLUMNS)
+        )
+        self.db.executemany(
+            "INSERT INTO authors (page_id, row_key, author_key) VALUES (?, ?, ?)",
+            [(page_id, row_key, key) for key in author_keys(fields.get('personen'))]
+        )
+
+    def index_page(self, page):
+        """
+        Indiziert eine Seite vollständig neu (erster Lauf oder Versionslücke)
+
+        Args:
+            page: CachedPage
+
+        Returns:
+            Anzahl indizierter Zeilen
+        """
+        rows = keyed_rows(page.table)
+        with self._lock, self.db:
+            self.db.execute("DELETE FROM entries WHERE page_id = ?", (page.page_id,))
+            self.db.execute("DELETE FROM authors WHERE page_id = ?", (page.page_id,))
+            for row_key, row in rows.items():
+                self._insert_row(page.page_id, row_key, publication_fields(row))
+            self._set_page(page.page_id, page.version, page.title)
+        METRICS.count('index.pages_rebuilt')
+        return len(rows)
+
+    def apply_event(self, event, change):
+        """
+        Übernimmt ein Zeilen-Event des Watchers (added/removed/edited)
+
+        Passt die indizierte Version nicht zum Diff (Events verpasst), wird die Seite
+        als veraltet markiert; der nächste sync() indiziert sie dann neu.
+
+        Returns:
+            True, wenn das Event übernommen wurde
+        """
+        page_id = str(change['page_id'])
+        with self._lock, self.db:
+            version = self.page_version(page_id)
+            if version not in (change['old_version'], change['new_version']):
+                self._set_page(page_id, None)
+                METRICS.count('index.stale_pages')
+                return False
+
+            self._delete_row(page_id, event['key'])
+            if event['after'] is not None:
+                texts = [event['after'].get(name, '') for name in FIELD_NAMES]
+                self._insert_row(page_id, event['key'], fields_from_texts(texts))
+            self._set_page(page_id, change['new_version'])
+        METRICS.count('index.events', kind=event['kind'])
+        return True
+
+    def handler(self, event, change):
+        """Handler für PageWatcher.add_handler"""
+        if not self.apply_event(event, change):
+            print(f"⚠️ Index für Seite {change['page_id']} veraltet - wird beim nächsten sync neu aufgebaut")
+
+    def sync(self, page_set):
+        """
+        Bringt alle Seiten einer PageSet auf den aktuellen Stand
+
+        Seiten mit unveränderter Version kosten nur einen Versions-Probe; geänderte
+        werden parallel geladen und geparst, geschrieben wird nacheinander.
+
+        Returns:
+            Dict page_id -> 'current' | Anzahl indizierter Zeilen | Fehlertext
+        """
+        def load_if_changed(page_id):
+            if self.page_version(page_id) == page_set.pages.probe_version(page_id):
+                return None
+            page = page_set.pages.fetch(page_id)
+            page.table  # Parsen im Worker-Thread
+            return page
+
+        result = {}
+        for outcome in page_set.map(load_if_changed):
+            if outcome['error']:
+                result[outcome['page_id']] = outcome['error']
+            elif outcome['result'] is None:
+                result[outcome['page_id']] = 'current'
+            else:
+                result[outcome['page_id']] = self.index_page(outcome['result'])
+        return result
+
+    def drop_page(self, page_id):
+        """Entfernt eine Seite aus dem Index"""
+        with self._lock, self.db:
+            for table in ('entries', 'authors', 'pages'):
+                self.db.execute(f"DELETE FROM {table} WHERE page_id = ?", (str(page_id),))
+
+    # --- Abfragen ---
+
+    def query(self, author=None, site=None, year=None, funding=None, limit=None):
+        """
+        Publikationen nach Autor, Standort (Teilstring), Jahr und/oder Fördernummer
+
+        Returns:
+            Liste {pub_key, title, doi, pmid, year, entries: [{page_id, nummer, standort, foerder}]}
+        """
+        conditions, params = [], []
+        if author:
+            # 'Müller H' findet auch Zeilen mit 'Mueller H' (Umschrift nur bei echten Umlauten)
+            keys = match_keys(author)
+            conditions.append("EXISTS (SELECT 1 FROM authors a WHERE a.page_id = e.page_id "
+                              f"AND a.row_key = e.row_key AND a.author_key IN ({', '.join('?' * len(keys))}))")
+            params.extend(keys)
+        if site:
+            conditions.append("e.standort LIKE ?")
+            params.append(f"%{site}%")
+        if year:
+            conditions.append("e.year = ?")
+            params.append(int(year))
+        if funding:
+            conditions.append("e.foerder_nummer = ?")
+            params.append(int(funding))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        sql = (f"SELECT * FROM entries WHERE pub_key IN (SELECT DISTINCT e.pub_key FROM entries e {where}) "
+               "ORDER BY year DESC, pub_key, page_id")
+        with self._lock:
+            rows = self.db.execute(sql, params).fetchall()
+
+        publications = self._group(rows)
+        return publications[:limit] if limit else publications
+
+    @staticmethod
+    def _group(rows):
+        publications = {}
+        for row in rows:
+            publication = publications.setdefault(row['pub_key'], {
+                'pub_key': row['pub_key'], 'title': row['title'], 'doi': row['doi'],
+                'pmid': row['pmid'], 'year': row['year'], 'entries': []
+            })
+            for field in ('title', 'doi', 'pmid', 'year'):
+                publication[field] = publication[field] or row[field]
+            publication['entries'].append({
+                'page_id': row['page_id'], 'nummer': row['nummer'], 'standort': row['standort'],
+                'foerder': _funding_label(row['foerder_flag'], row['foerder_nummer'])
+            })
+        return list(publications.values())
+
+    def conflicts(self):
+        """
+        Widersprüche zwischen Einträgen derselben Publikation
+
+        Returns:
+            Dict mit
+              numbering: Publikation mit unterschiedlichen Nummern (auch auf verschiedenen Seiten)
+              duplicate_numbers: Nummer auf einer Seite für mehrere Publikationen vergeben
+              funding: Publikation mit unterschiedlichem Förderhinweis
+        """
+        with self._lock:
+            numbering = self.db.execute(
+                "SELECT * FROM entries WHERE pub_key IN (SELECT pub_key FROM entries "
+                "WHERE nummer IS NOT NULL GROUP BY pub_key HAVING COUNT(DISTINCT nummer) > 1) "
+                "ORDER BY pub_key, page_id"
+            ).fetchall()
+            funding = self.db.execute(
+                "SELECT * FROM entries WHERE pub_key IN (SELECT pub_key FROM entries GROUP BY pub_key "
+                "HAVING COUNT(DISTINCT COALESCE(foerder_flag, '') || ':' || COALESCE(foerder_nummer, '')) > 1) "
+                "ORDER BY pub_key, page_id"
+            ).fetchall()
+            duplicates = self.db.execute(
+                "SELECT page_id, nummer, GROUP_CONCAT(pub_key, ' | ') AS publications FROM entries "
+                "WHERE nummer IS NOT NULL GROUP BY page_id, nummer HAVING COUNT(DISTINCT pub_key) > 1 "
+                "ORDER BY page_id, nummer"
+            ).fetchall()
+
+        return {
+            'numbering': self._group(numbering),
+            'duplicate_numbers': [dict(row) for row in duplicates],
+            'funding': self._group(funding),
+        }
+
+    def stats(self):
+        """Seiten, Zeilen, Publikationen und seitenübergreifende Publikationen"""
+        with self._lock:
+            pages = [dict(row) for row in self.db.execute("SELECT * FROM pages ORDER BY page_id")]
+            entries = self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            publications = self.db.execute("SELECT COUNT(DISTINCT pub_key) FROM entries").fetchone()[0]
+            shared = self.db.execute(
+                "SELECT COUNT(*) FROM (SELECT pub_key FROM entries GROUP BY pub_key "
+                "HAVING COUNT(DISTINCT page_id) > 1)"
+            ).fetchone()[0]
+        return {'pages': pages, 'entries': entries, 'publications': publications, 'shared': shared}
+
+
+def _funding_label(flag, nummer):
+    if not flag:
+        return None
+    return f"{flag} {nummer}" if nummer is not None else flag
+
+
+def print_publications(publications, heading):
+    """Eine Zeile pro Publikation, darunter ihre Einträge"""
+    print(f"\n{heading} ({len(publications)})")
+    for publication in publications:
+        ident = publication['doi'] or (f"PMID {publication['pmid']}" if publication['pmid'] else publication['pub_key'])
+        print(f"📄 {publication['year'] or '????'} {ident} - {(publication['title'] or '')[:70]}")
+        for entry in publication['entries']:
+            print(f"   • Seite {entry['page_id']} Nr. {entry['nummer'] or '?'} | "
+                  f"{entry['standort'] or '-'} | Förderung: {entry['foerder'] or '-'}")
+
+
+def main():
+    """Index aktualisieren und abfragen"""
+    import argparse
+    from core.page_set import add_page_arguments, page_set_from_args
+
+    parser = argparse.ArgumentParser(description="RACOON seitenübergreifender Publikations-Index")
+    parser.add_argument('--db', default=str(INDEX_PATH), help="SQLite-Datei des Index")
+    parser.add_argument('--sync', action='store_true', help="Geänderte Seiten neu indizieren (Versions-Probe)")
+    parser.add_argument('--author', help="Autor, z.B. 'Meyer HJ'")
+    parser.add_argument('--site', help="Standort (Teilstring)")
+    parser.add_argument('--year', type=int)
+    parser.add_argument('--funding', type=int, help="Fördernummer")
+    parser.add_argument('--limit', type=int)
+    parser.add_argument('--conflicts', action='store_true', help="Widersprüche bei Nummerierung und Förderung")
+    parser.add_argument('--json', action='store_true', help="Ergebnis als JSON ausgeben")
+    add_page_arguments(parser)
+    args = parser.parse_args()
+
+    index = PublicationIndex(args.db)
+    output = {}
+
+    if args.sync:
+        from core.confluence_sso import ConfluenceSSO
+
+        confluence_sso = ConfluenceSSO(CONFLUENCE_URL)
+        if not confluence_sso.login(interactive=False):
+            sys.exit(1)
+        try:
+            page_set = page_set_from_args(args, confluence_sso)
+        except Exception as e:
+            print(f"❌ Fehler: {e}")
+            sys.exit(1)
+
+        print(f"🔄 Synchronisiere {len(page_set)} Seite(n)...")
+        output['sync'] = index.sync(page_set)
+        if not args.json:
+            for page_id, state in output['sync'].items():
+                if state == 'current':
+                    print(f"   ✅ {page_id}: aktuell")
+                elif isinstance(state, int):
+                    print(f"   🔁 {page_id}: {state} Zeilen neu indiziert")
+                else:
+                    print(f"   ❌ {page_id}: {state}")
+
+    if args.author or args.site or args.year or args.funding:
+        output['publications'] = index.query(args.author, args.site, args.year, args.funding, args.limit)
+        if not args.json:
+            print_publications(output['publications'], "🔎 Treffer")
+
+    if args.conflicts:
+        output['conflicts'] = index.conflicts()
+        if not args.json:
+            conflicts = output['conflicts']
+            print_publications(conflicts['numbering'], "🔢 Unterschiedliche Nummern")
+            print_publications(conflicts['funding'], "💶 Unterschiedliche Förderhinweise")
+            print(f"\n♊ Doppelt vergebene Nummern ({len(conflicts['duplicate_numbers'])})")
+            for row in conflicts['duplicate_numbers']:
+                print(f"   • Seite {row['page_id']} Nr. {row['nummer']}: {row['publications']}")
+
+    output['stats'] = index.stats()
+    if args.json:
+        print(json.dumps(output, indent=2, ensure_ascii=False, default=str))
+    else:
+        stats = output['stats']
+        print(f"\n📚 Index: {len(stats['pages'])} Seiten, {stats['entries']} Einträge, "
+              f"{stats['publications']} Publikationen ({stats['shared']} auf mehreren Seiten)")
+    index.close()
+
+if __name__ == "__main__":
+    main()
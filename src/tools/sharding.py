@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Aufteilung auf Unterseiten
+Verteilt die Publikationstabelle nach Jahr (oder je N Nummern) auf Unterseiten und
+macht die Hauptseite zur Index-Seite. Neue Einträge ändern nur die betroffene
+Unterseite - Schreibvolumen, Speicherzeit und Konfliktrisiko wachsen nicht mit der
+Gesamtliste.
+"""
+
+import re
+import sys
+import time
+import html
+from pathlib import Path
+from collections import OrderedDict
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import CONFLUENCE_URL, PAGE_ID
+from core.instrumentation import METRICS
+from core.page_set import PageLock, PageSet, backup_prefix, shard_pages, SHARD_MODE_RE, SHARD_TITLE_SEPARATOR
+from core.table_parser import parse_table, publication_fields
+
+SHARD_MODES = ('year', 'rows')
+DEFAULT_SHARD_SIZE = 500
+
+# Titel der Unterseiten: "<Titel der Hauptseite> – <Teil>" (Titel sind pro Space eindeutig)
+TITLE_SEPARATOR = SHARD_TITLE_SEPARATOR
+
+# Die Index-Seite vermerkt die Aufteilung im Klartext, damit Folgeläufe (und PageSet) sie erkennen
+MODE_RE = SHARD_MODE_RE
+
+NO_YEAR = 'ohne Jahr'
+NO_NUMBER = 'ohne Nummer'
+
+# Wiederholungen bei Versionskonflikten (409) einer Unterseite
+MAX_CONFLICT_RETRIES = 3
+
+
+def shard_key(fields, by='year', size=DEFAULT_SHARD_SIZE):
+    """
+    Teil, in den eine Zeile gehört
+
+    Nummernbereiche statt Positionen: neue (höhere) Nummern landen immer im
+    jüngsten Teil, ältere Teile bleiben beim Einfügen unverändert.
+    """
+    if by == 'year':
+        return str(fields['year']) if fields['year'] else NO_YEAR
+    if fields['nummer'] is None:
+        return NO_NUMBER
+    low = (fields['nummer'] - 1) // size * size + 1
+    return f"Nr. {low}-{low + size - 1}"
+
+
+def _sort_key(key):
+    """Neueste Teile zuerst, Teile ohne Jahr/Nummer am Ende"""
+    numbers = re.findall(r'\d+', key)
+    return (0, -int(numbers[0])) if numbers else (1, key)
+
+
+def plan_shards(table, by='year', size=DEFAULT_SHARD_SIZE):
+    """
+    Ordnet die Datenzeilen den Teilen zu (Reihenfolge innerhalb eines Teils bleibt erhalten)
+
+    Nur die erste Tabelle der Seite wird aufgeteilt; weitere Tabellen bleiben wie
+    der übrige Seiteninhalt auf der Hauptseite.
+
+    Returns:
+        OrderedDict Teil -> Liste von TableRow (neueste Teile zuerst)
+    """
+    shards = {}
+    for row in first_table_rows(table):
+        if row.is_header:
+            continue
+        shards.setdefault(shard_key(publication_fields(row), by, size), []).append(row)
+    return OrderedDict((key, shards[key]) for key in sorted(shards, key=_sort_key))
+
+
+def first_table_rows(table):
+    """Zeilen der ersten Tabelle (Header und Daten)"""
+    if not table.rows:
+        return []
+    return [row for row in table.rows if row.table_index == table.rows[0].table_index]
+
+
+def table_span(table):
+    """(Anfang, Ende) der ersten Tabelle von <table bis einschließlich </table>"""
+    content = table.content
+    rows = first_table_rows(table)
+    if not rows:
+        raise ValueError("Keine Tabelle auf der Seite gefunden")
+    start = content.rfind('<table', 0, rows[0].start)
+    end = content.find('</table>', rows[-1].end)
+    if start < 0 or end < 0:
+        raise ValueError("Tabellengrenzen nicht gefunden")
+    return start, end + len('</table>')
+
+
+def table_frame(table):
+    """
+    Rahmen der ersten Tabelle ohne Datenzeilen: (Anfang bis Header-Ende, Ende ab letzter Zeile)
+
+    Jede Unterseite bekommt denselben Tabellenkopf (colgroup, Header-Zeile).
+    """
+    content = table.content
+    first_table = first_table_rows(table)
+    header_end = max((row.end for row in first_table if row.is_header), default=None)
+    data_rows = [row for row in first_table if not row.is_header]
+
+    table_start = content.rfind('<table', 0, first_table[0].start)
+    body_start = header_end if header_end is not None else data_rows[0].start
+    body_end = data_rows[-1].end if data_rows else body_start
+    table_end = content.find('</table>', body_end)
+    return content[table_start:body_start], content[body_end:table_end + len('</table>')]
+
+
+def render_index_table(parent_title, shards):
+    """Tabelle der Teile auf der Index-Seite (Teil -> Link auf die Unterseite)"""
+    rows = ''.join(
+        f'<tr><td><p>{html.escape(key)}</p></td><td><p><ac:link><ri:page ri:content-title="'
+        f'{html.escape(shard_title(parent_title, key), quote=True)}" /></ac:link></p></td></tr>'
+        for key in sorted(shards, key=_sort_key)
+    )
+    return f'<table><tbody><tr><th><p>Teil</p></th><th><p>Seite</p></th></tr>{rows}</tbody></table>'
+
+
+def render_index(parent_title, shards, by, size):
+    """Index-Block, der die Publikationstabelle auf der Hauptseite ersetzt (Teile plus children-Makro)"""
+    mode = "nach Jahr" if by == 'year' else f"je {size} Nummern"
+    return (
+        '<p>Die Publikationsliste ist auf Unterseiten verteilt. Neue Einträge bitte in der '
+        'passenden Unterseite oben ergänzen.</p>'
+        f'<p><em>Aufteilung: {mode}</em></p>'
+        f'{render_index_table(parent_title, shards)}'
+        '<ac:structured-macro ac:name="children" ac:schema-version="2">'
+        '<ac:parameter ac:name="sort">title</ac:parameter>'
+        '<ac:parameter ac:name="reverse">true</ac:parameter>'
+        '</ac:structured-macro>'
+    )
+
+
+def replace_index_table(content, index_table):
+    """
+    Ersetzt nur die Tabelle der Teile (erste Tabelle nach dem Aufteilungs-Vermerk)
+
+    Einleitung, Fußnoten und sonstiger Inhalt der Index-Seite bleiben unverändert.
+    """
+    match = MODE_RE.search(content)
+    start = content.find('<table', match.end()) if match else -1
+    end = content.find('</table>', start) if start >= 0 else -1
+    if end < 0:
+        raise ValueError("Tabelle der Teile auf der Index-Seite nicht gefunden")
+    return content[:start] + index_table + content[end + len('</table>'):]
+
+
+def shard_title(parent_title, key):
+    return f"{parent_title}{TITLE_SEPARATOR}{key}"
+
+
+def _insert_rows(content, rows_html):
+    """Fügt Zeilen oben in die Tabelle ein (nach der letzten Header-Zeile)"""
+    table = parse_table(content)
+    header_rows = table.header_rows
+    if header_rows:
+        position = header_rows[-1].end
+    elif table.rows:
+        position = table.rows[0].start
+    else:
+        raise ValueError("Keine Tabelle auf der Unterseite gefunden")
+    return content[:position] + ''.join(rows_html) + content[position:]
+
+
+class ShardedTable:
+    """
+    Publikationstabelle, verteilt auf Unterseiten einer Index-Seite
+
+    Args:
+        confluence_sso: Angemeldete ConfluenceSSO-Instanz
+        parent_id: Index-Seite (bisher die Seite mit der ganzen Tabelle)
+        by: 'year' oder 'rows' (je size Nummern); bei bereits aufgeteilten Seiten
+            gilt die auf der Index-Seite vermerkte Aufteilung
+        size: Nummern pro Teil für by='rows'
+    """
+
+    def __init__(self, confluence_sso, parent_id=PAGE_ID, by='year', size=DEFAULT_SHARD_SIZE):
+        if by not in SHARD_MODES:
+            raise ValueError(f"Unbekannte Aufteilung: {by}")
+        self.confluence_sso = confluence_sso
+        self.parent_id = str(parent_id)
+        self.by = by
+        self.size = size
+        self.parent = None
+        self.shards = OrderedDict()  # Teil -> {'id', 'title'}
+
+    # --- Zustand ---
+
+    def load(self):
+        """Lädt Index-Seite und Unterseiten; erkennt eine vorhandene Aufteilung"""
+        self.parent = self.confluence_sso.get_page(self.parent_id, "body.storage,version,space")
+        match = MODE_RE.search(self.parent['body']['storage']['value'])
+        if match:
+            self.by = 'year' if match.group(1) == "nach Jahr" else 'rows'
+            self.size = int(match.group(2)) if match.group(2) else self.size
+
+        shards = shard_pages(self.confluence_sso, self.parent_id, self.parent['title'])
+        self.shards = OrderedDict((key, shards[key]) for key in sorted(shards, key=_sort_key))
+        return self
+
+    @property
+    def is_sharded(self):
+        return self.parent is not None and bool(MODE_RE.search(self.parent['body']['storage']['value']))
+
+    @property
+    def space_key(self):
+        return self.parent['space']['key']
+
+    def page_set(self, max_workers=8):
+        """PageSet über alle Unterseiten (Status, Backup, Export wie bei mehreren Seiten)"""
+        return PageSet(self.confluence_sso, [shard['id'] for shard in self.shards.values()], max_workers)
+
+    # --- Aufteilen ---
+
+    def split(self, dry_run=False, backup_dir="backups"):
+        """
+        Verteilt die Tabelle der Hauptseite auf Unterseiten und ersetzt sie durch den Index
+
+        Bereits vorhandene Unterseiten (abgebrochener Lauf) werden überschrieben statt
+        doppelt angelegt. Die Hauptseite wird erst zuletzt umgeschrieben.
+
+        Returns:
+            Dict Teil -> Anzahl Zeilen
+        """
+        if self.parent is None:
+            self.load()
+        if self.is_sharded:
+            raise ValueError(f"Seite {self.parent_id} ist bereits aufgeteilt")
+
+        content = self.parent['body']['storage']['value']
+        table = parse_table(content)
+        if not any(not row.is_header for row in first_table_rows(table)):
+            raise ValueError("Keine Datenzeilen auf der Hauptseite")
+
+        plan = plan_shards(table, self.by, self.size)
+        summary = OrderedDict((key, len(rows)) for key, rows in plan.items())
+        if dry_run:
+            return summary
+
+        head, tail = table_frame(table)
+        start, end = table_span(table)
+        self.confluence_sso.create_backup(content, backup_prefix("racoon_publications_before_sharding", self.parent_id),
+                                          backup_dir)
+
+        with PageLock(self.parent_id):
+            for key, rows in plan.items():
+                body = head + ''.join(row.raw for row in rows) + tail
+                self._write_shard(key, body)
+                print(f"   📄 {key}: {len(rows)} Zeilen ({len(body):,} Zeichen)")
+
+            # Nur die Tabelle wird durch den Index ersetzt, der übrige Seiteninhalt bleibt
+            index = render_index(self.parent['title'], self.shards, self.by, self.size)
+            self.confluence_sso.update_page(
+                self.parent_id, self.parent['title'], content[:start] + index + content[end:],
+                self.parent['version']['number']
+            )
+        METRICS.count('shards.splits')
+        self.load()
+        return summary
+
+    def _write_shard(self, key, body):
+        title = shard_title(self.parent['title'], key)
+        if key in self.shards:
+            shard_id = self.shards[key]['id']
+            page = self.confluence_sso.get_page(shard_id, "version")
+            self.confluence_sso.update_page(shard_id, title, body, page['version']['number'])
+        else:
+            page = self.confluence_sso.create_page(self.space_key, title, body, self.parent_id)
+            self.shards[key] = {'id': str(page['id']), 'title': title}
+            METRICS.count('shards.created')
+
+    # --- Fortschreiben ---
+
+    def update_shard(self, key, transform):
+        """
+        Ändert genau eine Unterseite: laden, transform(content), speichern
+
+        Bei einem Versionskonflikt wird neu geladen und transform erneut angewendet.
+
+        Returns:
+            Neue Versionsnummer oder None, wenn transform nichts geändert hat
+        """
+        shard = self.shards[key]
+        with PageLock(shard['id'], timeout=30), METRICS.timer('shards.update') as span:
+            for attempt in range(MAX_CONFLICT_RETRIES + 1):
+                page = self.confluence_sso.get_page(shard['id'], "body.storage,version")
+                content = page['body']['storage']['value']
+                updated = transform(content)
+                if updated == content:
+                    return None
+                try:
+                    result = self.confluence_sso.update_page(shard['id'], shard['title'], updated,
+                                                             page['version']['number'])
+                except Exception as e:
+                    if '409' not in str(e) or attempt == MAX_CONFLICT_RETRIES:
+                        raise
+                    METRICS.count('shards.conflict_retries')
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                span.items = 1
+                span.size = len(updated)
+                METRICS.gauge('shards.write_size', len(updated), shard=key)
+                return result['version']['number']
+
+    def route_rows(self, rows_html):
+        """
+        Ordnet neue Zeilen (Storage-Format <tr>...</tr>) ihren Teilen zu, ohne zu schreiben
+
+        Returns:
+            OrderedDict Teil -> Liste der Zeilen
+        """
+        grouped = OrderedDict()
+        for row_html in rows_html:
+            rows = parse_table(f"<table><tbody>{row_html}</tbody></table>").data_rows
+            if len(rows) != 1:
+                raise ValueError(f"Erwartet genau eine Tabellenzeile: {row_html[:80]}")
+            grouped.setdefault(shard_key(publication_fields(rows[0]), self.by, self.size), []).append(row_html)
+        return grouped
+
+    def insert_rows(self, rows_html):
+        """
+        Fügt neue Zeilen (Storage-Format <tr>...</tr>) in die passenden Unterseiten ein
+
+        Nur betroffene Unterseiten werden geschrieben; ein neuer Teil (z.B. neues Jahr)
+        wird als Unterseite angelegt und im Index ergänzt.
+
+        Returns:
+            Dict Teil -> Anzahl eingefügter Zeilen
+        """
+        if self.parent is None:
+            self.load()
+        if not self.is_sharded:
+            raise ValueError(f"Seite {self.parent_id} ist nicht aufgeteilt (zuerst --split)")
+
+        grouped = self.route_rows(rows_html)
+        for key, rows in grouped.items():
+            if key not in self.shards:
+                self._create_shard(key, rows)
+            else:
+                self.update_shard(key, lambda content, rows=rows: _insert_rows(content, rows))
+            print(f"   ✏️ {shard_title(self.parent['title'], key)}: {len(rows)} Zeile(n)")
+
+        return OrderedDict((key, len(rows)) for key, rows in grouped.items())
+
+    def _create_shard(self, key, rows_html):
+        """Neuer Teil mit dem Tabellenkopf eines vorhandenen Teils; danach Index aktualisieren"""
+        if not self.shards:
+            raise ValueError("Keine Unterseite als Vorlage für den Tabellenkopf vorhanden")
+        template = self.confluence_sso.get_page(next(iter(self.shards.values()))['id'], "body.storage")
+        head, tail = table_frame(parse_table(template['body']['storage']['value']))
+        self._write_shard(key, head + ''.join(rows_html) + tail)
+
+        with PageLock(self.parent_id, timeout=30):
+            parent = self.confluence_sso.get_page(self.parent_id, "body.storage,version")
+            content = replace_index_table(parent['body']['storage']['value'],
+                                          render_index_table(self.parent['title'], self.shards))
+            self.confluence_sso.update_page(self.parent_id, parent['title'], content, parent['version']['number'])
+
+
+def print_shard_status(sharded, max_workers=8):
+    """Eine Zeile pro Unterseite (parallel geladen)"""
+    page_set = sharded.page_set(max_workers)
+    titles = {shard['id']: key for key, shard in sharded.shards.items()}
+
+    total_rows = total_size = 0
+    for outcome in page_set.load():
+        key = titles[outcome['page_id']]
+        if outcome['error']:
+            print(f"   ❌ {key:<16} {outcome['error']}")
+            continue
+        page = outcome['result']
+        rows = len(page.table.data_rows)
+        total_rows += rows
+        total_size += len(page.content)
+        print(f"   📄 {key:<16} Seite {page.page_id} v{page.version}: {rows:>5} Zeilen, {len(page.content):>10,} Zeichen")
+    print(f"\n📊 {len(sharded.shards)} Unterseiten, {total_rows} Zeilen, {total_size:,} Zeichen gesamt")
+
+
+def main():
+    """Aufteilen, Status und Einfügen über die Kommandozeile"""
+    import argparse
+    from core.confluence_sso import ConfluenceSSO
+
+    parser = argparse.ArgumentParser(description="RACOON Publikationstabelle auf Unterseiten verteilen")
+    parser.add_argument('--parent', default=PAGE_ID, help="Hauptseite (wird zur Index-Seite)")
+    parser.add_argument('--by', choices=SHARD_MODES, default='year', help="Aufteilung nach Jahr oder Nummern")
+    parser.add_argument('--size', type=int, default=DEFAULT_SHARD_SIZE, help="Nummern pro Unterseite (--by rows)")
+    parser.add_argument('--split', action='store_true', help="Tabelle der Hauptseite aufteilen")
+    parser.add_argument('--dry-run', action='store_true', help="Nur die Aufteilung anzeigen")
+    parser.add_argument('--add', metavar='FILE', help="Datei mit neuen <tr>-Zeilen einfügen")
+    args = parser.parse_args()
+
+    print("🗂️ RACOON Publikationen - Unterseiten")
+    print("=" * 50)
+
+    confluence_sso = ConfluenceSSO(CONFLUENCE_URL)
+    if not confluence_sso.login(interactive=False):
+        sys.exit(1)
+
+    try:
+        sharded = ShardedTable(confluence_sso, args.parent, args.by, args.size).load()
+
+        if args.split:
+            print(f"✂️ Teile Seite {args.parent} auf ({'nach Jahr' if sharded.by == 'year' else f'je {sharded.size} Nummern'})"
+                  f"{' - Simulation' if args.dry_run else ''}")
+            summary = sharded.split(dry_run=args.dry_run)
+            if args.dry_run:
+                for key, count in summary.items():
+                    print(f"   📄 {key}: {count} Zeilen")
+                return
+            print(f"✅ {sum(summary.values())} Zeilen auf {len(summary)} Unterseiten verteilt")
+
+        if args.add:
+            rows_html = re.findall(r'<tr\b.*?</tr>', Path(args.add).read_text(encoding='utf-8'), re.DOTALL)
+            inserted = sharded.insert_rows(rows_html)
+            print(f"✅ {sum(inserted.values())} Zeile(n) in {len(inserted)} Unterseite(n) eingefügt")
+
+        if not sharded.is_sharded:
+            print(f"ℹ️ Seite {args.parent} ist nicht aufgeteilt (--split --dry-run zeigt die Aufteilung)")
+            return
+        print_shard_status(sharded)
+
+    except Exception as e:
+        print(f"❌ Fehler: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Tabellen-Bereinigung
+Entfernt Test-Zeilen und leere Zeilen aus der Publikationstabelle
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import CONFLUENCE_URL, PAGE_ID
+from core.confluence_sso import ConfluenceSSO
+from core.page_set import PageSet, add_page_arguments, backup_prefix, resolve_page_ids, print_page_summary
+from core.storage_minifier import minify_storage
+from tools.cleanup_rules import CleanupEngine, summarize_drops
+
+def clean_table(page_ids=None, cql=None, workers=1):
+    """
+    Bereinigt die Publikationstabellen von Test-Zeilen und leeren Zeilen
+
+    Mehrere Seiten werden parallel bereinigt, jede unter ihrer eigenen Sperre.
+
+    Returns:
+        True, wenn alle Seiten bereinigt (oder bereits sauber) sind
+    """
+    print("=== RACOON Publikationen - Tabellen-Bereinigung ===")
+    print("Entferne Test-Zeilen und leere Zeilen...")
+    
+    # SSO-Session erstellen
+    confluence_sso = ConfluenceSSO(CONFLUENCE_URL)
+    
+    if not confluence_sso.login():
+        print("❌ Cookie-Login fehlgeschlagen!")
+        return False
+    
+    try:
+        page_set = PageSet(confluence_sso, resolve_page_ids(confluence_sso, page_ids, cql), workers)
+        # Aufgeteilte Tabellen: die Unterseiten bereinigen, nicht die Index-Seite
+        for index, shard_ids in page_set.expand_shards().items():
+            print(f"🗂️ Seite {index} ist aufgeteilt: {len(shard_ids)} Unterseiten")
+    except Exception as e:
+        print(f"❌ Fehler beim Ermitteln der Seiten: {e}")
+        return False
+    
+    if not len(page_set):
+        print("❌ Keine Seiten gefunden")
+        return False
+    if len(page_set) > 1:
+        print(f"📚 {len(page_set)} Seiten, {page_set.max_workers} parallel")
+    
+    # Jede Seite unter ihrer Sperre (verhindert parallele Updates durch andere Läufe)
+    outcomes = page_set.map(lambda page_id: clean_page(confluence_sso, page_id), lock=True)
+    if len(page_set) > 1:
+        print("\n📊 Ergebnis pro Seite:")
+        print_page_summary(outcomes, lambda ok: "bereinigt" if ok else "fehlgeschlagen")
+    elif outcomes[0]['error']:
+        print(f"❌ {outcomes[0]['error']}")
+    return all(outcome['result'] for outcome in outcomes)
+
+def clean_page(confluence_sso, page_id=PAGE_ID):
+    """Bereinigt eine Seite (mit Backups vorher/nachher)"""
+    try:
+        # Aktuelle Seite laden (Body einmal in einer gemappten Temp-Datei statt mehrfach als String)
+        print(f"📖 Lade Seite {page_id}...")
+        page, current_content = confluence_sso.get_page_body(page_id)
+        current_version = page['version']['number']
+        
+        with current_content:
+            print(f"✅ Seite geladen: Version {current_version}")
+            print(f"Original Content-Länge: {len(current_content)} Bytes")
+            
+            # Backup vor Änderungen erstellen
+            confluence_sso.create_backup(current_content, backup_prefix("racoon_publications_before_cleanup", page_id))
+            
+            # 1./2. Test-Zeilen und leere Zeilen in einem Durchlauf über alle Zeilen entfernen
+            print("🧹 Entferne Test-Zeilen und leere Zeilen...")
+            engine = CleanupEngine()
+            remaining, drops = engine.clean(current_content)
+            
+            for drop in drops:
+                print(f"  📝 Zeile {drop['row_index']} ({drop['reason']}): {drop['preview'][:60]}")
+            for rule, count in summarize_drops(drops).items():
+                print(f"  🗑️ {rule}: {count} Zeile(n)")
+            
+            # 3. Überflüssigen Whitespace entfernen (Code-Makros, <pre> und CDATA bleiben unverändert)
+            updated_content, minify_report = minify_storage(remaining, report=True)
+            print(f"  🗜️ Whitespace: {minify_report['bytes_saved']:,} Bytes gespart")
+            
+            with updated_content:
+                print(f"📊 Bereinigte Content-Länge: {len(updated_content)} Bytes")
+                print(f"📉 Differenz: {len(current_content) - len(updated_content)} Bytes entfernt")
+                
+                if not drops and minify_report['bytes_saved'] == 0:
+                    print("ℹ️  Keine Änderungen erforderlich - Tabelle ist bereits sauber!")
+                    return True
+                
+                # 4. Seite aktualisieren (Body wird direkt aus der Datei in den PUT gestreamt)
+                print("🚀 Aktualisiere Confluence-Seite...")
+                result = confluence_sso.update_page_stream(
+                    page_id=page_id,
+                    title=page['title'],
+                    body=updated_content,
+                    version=current_version
+                )
+                
+                print(f"✅ Tabelle erfolgreich bereinigt!")
+                print(f"Neue Version: {result['version']['number']}")
+                print(f"URL: https://wms.diz-ag.med.ovgu.de{result['_links']['webui']}")
+                
+                # Backup nach Bereinigung erstellen
+                confluence_sso.create_backup(updated_content, backup_prefix("racoon_publications_after_cleanup", page_id))
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Fehler bei der Bereinigung von Seite {page_id}: {e}")
+        return False
+
+def main():
+    """Hauptfunktion"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="TEST- und Leerzeilen aus den Publikationstabellen entfernen")
+    add_page_arguments(parser)
+    args = parser.parse_args()
+    
+    print("🧹 RACOON Publikationen Tabellen-Bereinigung")
+    print("=" * 50)
+    print("Dieses Script entfernt:")
+    print("  - Test-Zeilen mit 'TEST'-Inhalten")
+    print("  - Komplett leere Tabellenzeilen")
+    print("  - Zeilen mit nur Leerzeichen")
+    print()
+    
+    confirm = input("Möchten Sie die Bereinigung starten? (j/N): ").strip().lower()
+    
+    if confirm in ['j', 'ja', 'y', 'yes']:
+        return clean_table(args.page, args.cql, args.workers)
+    else:
+        print("❌ Bereinigung abgebrochen.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
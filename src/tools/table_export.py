@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Spaltenorientierter Export
+Exportiert die Tabelle (plus PubMed-Anreicherung) als Parquet/Arrow, CSV oder JSONL
+"""
+
+import sys
+import csv
+import json
+from pathlib import Path
+from datetime import datetime
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import CONFLUENCE_URL
+from core.page_set import add_page_arguments, page_set_from_args
+from core.table_parser import parse_table, publication_fields
+
+# pyarrow ist optional - ohne pyarrow stehen nur CSV/JSONL zur Verfügung
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as pa_ipc
+except ImportError:
+    pa = None
+
+# Spalten mit festen Typen (Arrow-Typnamen)
+COLUMNS = [
+    ('page_id', 'string'),
+    ('page_version', 'int32'),
+    ('snapshot', 'string'),
+    ('row_index', 'int32'),
+    ('nummer', 'int32'),
+    ('year', 'int16'),
+    ('month', 'int8'),
+    ('standort', 'string'),
+    ('personen', 'string'),
+    ('foerder_flag', 'string'),
+    ('foerder_nummer', 'int32'),
+    ('doi', 'string'),
+    ('pmid', 'int64'),
+    ('title', 'string'),
+    ('journal', 'string'),
+]
+
+COLUMN_NAMES = [name for name, _ in COLUMNS]
+
+FORMATS = ('parquet', 'arrow', 'csv', 'jsonl')
+MANIFEST_NAME = "export_manifest.json"
+
+# PubMed-Daten je PMID (im Export-Verzeichnis) - jede PMID wird nur einmal abgefragt
+PUBMED_CACHE_NAME = "pubmed_cache.json"
+PUBMED_BATCH_SIZE = 200
+
+
+def table_to_records(content, page_id, page_version, snapshot=None, enrichment=None):
+    """
+    Wandelt einen Storage-Format Body in typisierte Datensätze um
+
+    Args:
+        content: Storage-Format Body der Seite
+        page_id: Confluence Page-ID
+        page_version: Versionsnummer der Seite
+        snapshot: Zeitstempel/Bezeichner des Stands (Standard: jetzt)
+        enrichment: Optional Dict PMID -> PubMed-Daten (für journal/title)
+    """
+    return table_records(parse_table(content), page_id, page_version, snapshot, enrichment)
+
+
+def table_records(table, page_id, page_version, snapshot=None, enrichment=None):
+    """Wie table_to_records, aber für eine bereits geparste Tabelle"""
+    snapshot = snapshot or datetime.now().isoformat(timespec='seconds')
+    records = [
+        {
+            'page_id': str(page_id),
+            'page_version': int(page_version),
+            'snapshot': snapshot,
+            'row_index': row.index,
+            **publication_fields(row),
+            'journal': None,
+        }
+        for row in table.data_rows
+    ]
+    return enrich_records(records, enrichment) if enrichment else records
+
+
+def enrich_records(records, enrichment):
+    """Ergänzt journal (und fehlende Titel) aus einem Dict PMID (str) -> PubMed-Daten"""
+    for record in records:
+        pubmed = enrichment.get(str(record['pmid'])) if record['pmid'] else None
+        if not pubmed:
+            continue
+        journal = pubmed.get('journal')
+        record['journal'] = journal if journal != 'N/A' else None
+        if not record['title']:
+            record['title'] = pubmed.get('title')
+    return records
+
+
+class PubMedLookup:
+    """PMID -> PubMed-Daten (journal, title) mit Datei-Cache; fehlende PMIDs per EFetch in Blöcken"""
+
+    def __init__(self, cache_path, explorer=None):
+        self.cache_path = Path(cache_path)
+        self.explorer = explorer
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.cache = {}
+
+    def lookup(self, pmids):
+        """Dict PMID (str) -> {'journal', 'title'} für alle gefundenen PMIDs"""
+        pmids = {str(pmid) for pmid in pmids if pmid}
+        missing = sorted(pmids - self.cache.keys())
+
+        if missing:
+            if self.explorer is None:
+                from pubmed.api_client import PubMedExplorer
+                self.explorer = PubMedExplorer()
+
+            # Nicht gefundene PMIDs bleiben ungecacht und werden beim nächsten Export erneut versucht
+            for start in range(0, len(missing), PUBMED_BATCH_SIZE):
+                for pub in self.explorer.get_publication_details(missing[start:start + PUBMED_BATCH_SIZE]):
+                    self.cache[pub['pmid']] = {'journal': pub['journal'], 'title': pub['title']}
+            self._save()
+
+        return {pmid: self.cache[pmid] for pmid in pmids if pmid in self.cache}
+
+    def _save(self):
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f, ensure_ascii=False)
+        tmp_path.replace(self.cache_path)
+
+
+class PublicationExporter:
+    """
+    Schreibt Tabellenstände inkrementell in ein Export-Verzeichnis
+
+    Args:
+        pubmed: journal (und fehlende Titel) über PubMed ergänzen (PMIDs im Verzeichnis gecacht)
+    """
+
+    def __init__(self, output_dir="exports", fmt="parquet", pubmed=False):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unbekanntes Format: {fmt} (erlaubt: {', '.join(FORMATS)})")
+
+        if fmt in ('parquet', 'arrow') and pa is None:
+            print(f"⚠️ pyarrow nicht installiert - verwende CSV statt {fmt}")
+            fmt = 'csv'
+
+        self.output_dir = Path(output_dir)
+        self.format = fmt
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+        self.manifest = self._load_manifest()
+        self.pubmed = PubMedLookup(self.output_dir / PUBMED_CACHE_NAME) if pubmed else None
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'exports': []}
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(self.manifest_path)
+
+    def is_exported(self, page_id, page_version):
+        """Prüft, ob ein Seitenstand bereits in diesem Format exportiert wurde"""
+        return any(
+            e['page_id'] == str(page_id) and e['page_version'] == int(page_version)
+            and e.get('format') == self.format
+            for e in self.manifest['exports']
+        )
+
+    def export(self, content, page_id, page_version, snapshot=None, enrichment=None):
+        """
+        Exportiert einen Seitenstand (Anhängen, bereits exportierte Versionen werden übersprungen)
+
+        Returns:
+            Anzahl geschriebener Zeilen (0 falls bereits exportiert)
+        """
+        if self.is_exported(page_id, page_version):
+            return 0
+
+        records = table_to_records(content, page_id, page_version, snapshot, enrichment)
+        return self.append_records(records, page_id, page_version)
+
+    def append_records(self, records, page_id, page_version):
+        """Hängt bereits extrahierte Datensätze eines Seitenstands an"""
+        if self.is_exported(page_id, page_version):
+            return 0
+
+        if self.pubmed:
+            enrich_records(records, self.pubmed.lookup(r['pmid'] for r in records))
+
+        if self.format == 'parquet':
+            target = self._write_arrow_file(records, page_id, page_version, 'parquet')
+        elif self.format == 'arrow':
+            target = self._write_arrow_file(records, page_id, page_version, 'arrow')
+        elif self.format == 'csv':
+            target = self._append_csv(records)
+        else:
+            target = self._append_jsonl(records)
+
+        self.manifest['exports'].append({
+            'page_id': str(page_id),
+            'page_version': int(page_version),
+            'format': self.format,
+            'rows': len(records),
+            'file': target.name,
+            'exported_at': datetime.now().isoformat(timespec='seconds')
+        })
+        self._save_manifest()
+        return len(records)
+
+    def _arrow_table(self, records):
+        schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in COLUMNS])
+        columns = {name: [r.get(name) for r in records] for name in COLUMN_NAMES}
+        return pa.Table.from_pydict(columns, schema=schema)
+
+    def _write_arrow_file(self, records, page_id, page_version, suffix):
+        """Eine Datei pro Seitenstand - das Verzeichnis ist als Dataset lesbar"""
+        target = self.output_dir / f"publications_{page_id}_v{page_version}.{suffix}"
+        table = self._arrow_table(records)
+
+        if suffix == 'parquet':
+            pq.write_table(table, target, compression='zstd')
+        else:
+            with pa_ipc.new_file(str(target), table.schema) as writer:
+                writer.write_table(table)
+
+        return target
+
+    def _append_csv(self, records):
+        target = self.output_dir / "publications.csv"
+        write_header = not target.exists()
+
+        with open(target, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMN_NAMES, extrasaction='ignore')
+            if write_header:
+                writer.writeheader()
+            writer.writerows(records)
+
+        return target
+
+    def _append_jsonl(self, records):
+        target = self.output_dir / "publications.jsonl"
+
+        with open(target, 'a', encoding='utf-8') as f:
+            f.writelines(
+                json.dumps({name: r.get(name) for name in COLUMN_NAMES}, ensure_ascii=False) + '\n'
+                for r in records
+            )
+
+        return target
+
+
+def main():
+    """Exportiert einen lokalen Backup-Stand oder die Live-Seiten (--page/--cql)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RACOON Publikationstabelle spaltenorientiert exportieren")
+    parser.add_argument('--file', help="Storage-Format Datei (z.B. aus backups/) statt Live-Seite")
+    parser.add_argument('--version', type=int,
+                        help="Versionsnummer für --file (Standard: aus dem Backup-Namen, z.B. ..._v42_...)")
+    parser.add_argument('--format', choices=FORMATS, default='parquet')
+    parser.add_argument('--output', default="exports")
+    parser.add_argument('--no-pubmed', action='store_true', help="Ohne PubMed-Anreicherung (Spalte journal bleibt leer)")
+    add_page_arguments(parser)
+    args = parser.parse_args()
+
+    print("📦 RACOON Publikationen - Spalten-Export")
+    print("=" * 50)
+
+    exporter = PublicationExporter(args.output, args.format, pubmed=not args.no_pubmed)
+
+    if args.file:
+        from tools.backup_analyzer import parse_backup_name
+
+        # Das Manifest überspringt bereits exportierte Versionen - ohne echte Versionsnummer
+        # würde jeder weitere Stand als "bereits exportiert" verworfen
+        name = parse_backup_name(Path(args.file).name)
+        version = args.version if args.version is not None else name['version']
+        if version is None:
+            print(f"❌ Keine Versionsnummer im Dateinamen {Path(args.file).name} - bitte --version angeben")
+            return False
+
+        content = Path(args.file).read_text(encoding='utf-8')
+        snapshot = name['timestamp'] or datetime.fromtimestamp(Path(args.file).stat().st_mtime).isoformat(timespec='seconds')
+        page_id = args.page[0] if args.page else name['page_id']
+        report_export(exporter.export(content, page_id, version, snapshot), exporter, version)
+        return True
+
+    from core.confluence_sso import ConfluenceSSO
+
+    confluence_sso = ConfluenceSSO(CONFLUENCE_URL)
+    if not confluence_sso.login():
+        print("❌ Cookie-Login fehlgeschlagen!")
+        return False
+
+    try:
+        page_set = page_set_from_args(args, confluence_sso)
+    except Exception as e:
+        print(f"❌ Fehler: {e}")
+        return False
+
+    # Seiten parallel laden; geschrieben wird nacheinander (ein Manifest pro Export-Verzeichnis)
+    outcomes = page_set.load()
+    for outcome in outcomes:
+        if outcome['error']:
+            print(f"❌ Seite {outcome['page_id']}: {outcome['error']}")
+            continue
+        page = outcome['result']
+        if len(page_set) > 1:
+            print(f"📄 Seite {page.page_id}: {page.title}")
+        report_export(exporter.export(page.content, page.page_id, page.version), exporter, page.version)
+    return not any(outcome['error'] for outcome in outcomes)
+
+def report_export(written, exporter, version):
+    if written:
+        print(f"✅ {written} Zeilen exportiert ({exporter.format}) nach {exporter.output_dir}")
+    else:
+        print(f"ℹ️ Version {version} wurde bereits als {exporter.format} exportiert")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Tabellen-Health-Check
+Findet TEST-Zeilen, leere Zeilen, doppelte Nummern, Lücken und Formatfehler in einem Durchlauf
+"""
+
+import re
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core.instrumentation import timed
+from core.table_parser import parse_table
+from tools.cleanup_rules import RowFeatures, test_row_rule
+
+YEAR_MONTH_FORMAT = re.compile(r'^\d{4}/(\d{2}|\?\?)$')
+FOERDER_FORMAT = re.compile(r'^(JA|NEIN)(\s+\d+)?$', re.IGNORECASE)
+
+# Befunde, die eine Änderung blockieren sollen (z.B. als pre-commit Guard)
+ERROR_KINDS = {'test_row', 'empty_row', 'duplicate_number', 'column_count_mismatch', 'unclosed_row'}
+
+# Befunde, die nur als Warnung gelten
+WARNING_KINDS = {'numbering_gap', 'malformed_number', 'malformed_year_month', 'malformed_foerderhinweis'}
+
+
+class TableHealthScanner:
+    """Prüft das Zeilenmodell einer Publikationstabelle in einem linearen Durchlauf"""
+
+    def __init__(self, test_marker="TEST", expected_columns=None):
+        # Dieselbe Regel wie die Bereinigung: nur Zeilen, deren Zellen alle den Marker enthalten
+        self.test_rule = test_row_rule(test_marker)
+        self.expected_columns = expected_columns
+
+    @timed('health.scan', items=lambda report: report['rows'])
+    def scan(self, table):
+        """
+        Prüft eine geparste Tabelle
+
+        Returns:
+            Dict mit rows, data_rows, issues (kind, row_index, detail), counts, healthy
+        """
+        issues = []
+        expected = self.expected_columns
+        header_rows = table.header_rows
+
+        if expected is None and header_rows:
+            expected = len(header_rows[0].cells)
+
+        first_row_by_number = {}
+        data_row_count = 0
+
+        for row in table.rows:
+            if row.is_header:
+                continue
+
+            data_row_count += 1
+            texts = row.texts
+            index = row.index
+
+            if not row.raw.rstrip().lower().endswith('</tr>'):
+                issues.append(self._issue('unclosed_row', index, "Zeile ohne schließendes </tr>"))
+
+            if expected is not None and len(texts) != expected:
+                issues.append(self._issue(
+                    'column_count_mismatch', index, f"{len(texts)} statt {expected} Zellen"
+                ))
+
+            if not any(texts):
+                issues.append(self._issue('empty_row', index, "Alle Zellen leer"))
+                continue
+
+            if self.test_rule.predicate(RowFeatures(row)):
+                issues.append(self._issue('test_row', index, ' | '.join(texts)[:100]))
+                continue
+
+            # Nummer (Spalte 1)
+            nummer = texts[0] if texts else ''
+            if nummer.isdigit():
+                number = int(nummer)
+                if number in first_row_by_number:
+                    issues.append(self._issue(
+                        'duplicate_number', index,
+                        f"Nummer {number} bereits in Zeile {first_row_by_number[number]}"
+                    ))
+                else:
+                    first_row_by_number[number] = index
+            else:
+                issues.append(self._issue('malformed_number', index, f"Nummer '{nummer}'"))
+
+            # Jahr/Monat (Spalte 2) und Förderhinweis (Spalte 5)
+            if len(texts) > 1 and not YEAR_MONTH_FORMAT.match(texts[1]):
+                issues.append(self._issue('malformed_year_month', index, f"Jahr/Monat '{texts[1]}'"))
+
+            if len(texts) > 4 and not FOERDER_FORMAT.match(texts[4]):
+                issues.append(self._issue('malformed_foerderhinweis', index, f"Förderhinweis '{texts[4]}'"))
+
+        issues.extend(self._numbering_gaps(first_row_by_number))
+
+        counts = {}
+        for issue in issues:
+            counts[issue['kind']] = counts.get(issue['kind'], 0) + 1
+
+        return {
+            'rows': len(table.rows),
+            'data_rows': data_row_count,
+            'expected_columns': expected,
+            'issues': issues,
+            'counts': counts,
+            'healthy': not any(kind in ERROR_KINDS for kind in counts)
+        }
+
+    def scan_content(self, content):
+        """Parst und prüft einen Storage-Format Body"""
+        return self.scan(parse_table(content))
+
+    def _numbering_gaps(self, first_row_by_number):
+        """Fehlende Nummern zwischen kleinster und größter Nummer (als Bereiche)"""
+        gaps = []
+        numbers = sorted(first_row_by_number)
+
+        for previous, current in zip(numbers, numbers[1:]):
+            if current - previous > 1:
+                missing = f"{previous + 1}" if current - previous == 2 else f"{previous + 1}-{current - 1}"
+                gaps.append(self._issue(
+                    'numbering_gap', first_row_by_number[previous],
+                    f"Nummer(n) {missing} fehlen (nach {previous})"
+                ))
+
+        return gaps
+
+    @staticmethod
+    def _issue(kind, row_index, detail):
+        return {'kind': kind, 'row_index': row_index, 'detail': detail}
+
+
+def print_health_report(report, max_per_kind=3):
+    """Gibt einen Health-Report lesbar aus"""
+    print(f"📋 Zeilen: {report['rows']} (Daten: {report['data_rows']}, Spalten: {report['expected_columns']})")
+
+    if not report['issues']:
+        print("✨ Tabelle ist sauber!")
+        return
+
+    by_kind = {}
+    for issue in report['issues']:
+        by_kind.setdefault(issue['kind'], []).append(issue)
+
+    for kind, issues in by_kind.items():
+        icon = "❌" if kind in ERROR_KINDS else "⚠️"
+        print(f"\n{icon} {kind}: {len(issues)}")
+        for issue in issues[:max_per_kind]:
+            print(f"    Zeile {issue['row_index']}: {issue['detail']}")
+        if len(issues) > max_per_kind:
+            print(f"    ... und {len(issues) - max_per_kind} weitere")
+
+    if report['healthy']:
+        print("\n✅ Keine blockierenden Befunde (nur Warnungen)")
+    else:
+        print("\n⚠️ Bereinigung empfohlen")
@@ -1,101 +1,190 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-RACOON Publikationen - Status-Check
-Prüft den aktuellen Status der Tabelle
-"""
-
-import sys
-import re
-import json
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent))
-from confluence_sso import ConfluenceSSO
-
-def check_table_status():
-    """Prüft den aktuellen Status der Tabelle"""
-    print("🔍 RACOON Publikationen - Status-Check")
-    print("=" * 50)
-    
-    # SSO-Session erstellen
-    confluence_sso = ConfluenceSSO("https://wms.diz-ag.med.ovgu.de/")
-    
-    # Gespeicherte Cookies verwenden
-    try:
-        with open('confluence_credentials.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            cookie_header = data.get('cookies', '')
-    except:
-        cookie_header = input("🔑 Cookies eingeben: ").strip()
-    
-    if not confluence_sso.login_with_cookies(cookie_header):
-        print("❌ Cookie-Login fehlgeschlagen!")
-        return False
-    
-    try:
-        # Aktuelle Seite laden
-        print("📖 Lade aktuelle Seite...")
-        page = confluence_sso.get_page("165485055", "body.storage,version")
-        current_content = page['body']['storage']['value']
-        current_version = page['version']['number']
-        
-        print(f"✅ Seite geladen: Version {current_version}")
-        print(f"📊 Content-Größe: {len(current_content):,} Zeichen")
-        
-        # Nach TEST-Zeilen suchen
-        test_patterns = [
-            r'<tr[^>]*>.*?TEST.*?</tr>',
-            r'<p[^>]*>.*?TEST.*?</p>',
-            r'>TEST<',
-        ]
-        
-        total_test_matches = 0
-        print("\n🔍 Suche nach TEST-Inhalten:")
-        
-        for i, pattern in enumerate(test_patterns, 1):
-            matches = re.findall(pattern, current_content, re.DOTALL | re.IGNORECASE)
-            if matches:
-                print(f"  Pattern {i}: {len(matches)} Treffer")
-                total_test_matches += len(matches)
-                for j, match in enumerate(matches[:3]):  # Zeige nur die ersten 3
-                    preview = match[:100] + "..." if len(match) > 100 else match
-                    print(f"    {j+1}. {preview}")
-                if len(matches) > 3:
-                    print(f"    ... und {len(matches)-3} weitere")
-            else:
-                print(f"  Pattern {i}: Keine Treffer")
-        
-        # Nach leeren Zeilen suchen
-        empty_patterns = [
-            r'<tr>\s*<td[^>]*>\s*</td>\s*<td[^>]*>\s*</td>\s*<td[^>]*>\s*</td>\s*<td[^>]*>\s*</td>\s*<td[^>]*>\s*</td>\s*<td[^>]*>\s*</td>\s*</tr>',
-            r'<tr>\s*<td[^>]*>\s*<p>\s*</p>\s*</td>[^<]*</tr>',
-        ]
-        
-        total_empty_matches = 0
-        print("\n🗑️ Suche nach leeren Zeilen:")
-        
-        for i, pattern in enumerate(empty_patterns, 1):
-            matches = re.findall(pattern, current_content, re.DOTALL | re.IGNORECASE)
-            if matches:
-                print(f"  Pattern {i}: {len(matches)} leere Zeilen")
-                total_empty_matches += len(matches)
-            else:
-                print(f"  Pattern {i}: Keine leeren Zeilen")
-        
-        print(f"\n📋 Zusammenfassung:")
-        print(f"  🎯 TEST-Inhalte: {total_test_matches}")
-        print(f"  🗑️ Leere Zeilen: {total_empty_matches}")
-        
-        if total_test_matches == 0 and total_empty_matches == 0:
-            print("✨ Tabelle ist sauber!")
-        else:
-            print("⚠️ Bereinigung empfohlen")
-            
-        return True
-            
-    except Exception as e:
-        print(f"❌ Fehler: {e}")
-        return False
-
-if __name__ == "__main__":
-    check_table_status()
\ No newline at end of file
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RACOON Publikationen - Status-Check
+Prüft den aktuellen Status der Tabelle
+"""
+
+import sys
+import json
+from contextlib import nullcontext, redirect_stdout
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+from core.config import CONFLUENCE_URL, PAGE_ID
+from core.instrumentation import METRICS, profiling, add_instrumentation_arguments, finish_run
+from tools.table_health import TableHealthScanner, print_health_report
+
+def connect():
+    """Angemeldete ConfluenceSSO-Session oder None"""
+    from core.confluence_sso import ConfluenceSSO
+
+    # SSO-Session erstellen
+    confluence_sso = ConfluenceSSO(CONFLUENCE_URL)
+
+    # Gespeicherte Session bzw. Cookies verwenden
+    if not confluence_sso.login():
+        print("❌ Cookie-Login fehlgeschlagen!")
+        return None
+    return confluence_sso
+
+def load_page_content(page_id=PAGE_ID):
+    """Lädt den Storage-Format Body der Live-Seite (Inhalt, Version) oder (None, None)"""
+    confluence_sso = connect()
+    if confluence_sso is None:
+        return None, None
+
+    print("📖 Lade aktuelle Seite...")
+    page = confluence_sso.get_page(page_id, "body.storage,version")
+    return page['body']['storage']['value'], page['version']['number']
+
+def check_table_status(content=None, version=None, verbose=True):
+    """
+    Prüft den aktuellen Status der Tabelle
+
+    Args:
+        content: Storage-Format Body (Standard: Live-Seite laden)
+        version: Versionsnummer für die Ausgabe
+        verbose: Report ausgeben
+
+    Returns:
+        Health-Report (Dict) oder None bei Fehlern
+    """
+    if verbose:
+        print("🔍 RACOON Publikationen - Status-Check")
+        print("=" * 50)
+
+    try:
+        if content is None:
+            content, version = load_page_content()
+            if content is None:
+                return None
+
+        if verbose:
+            if version is not None:
+                print(f"✅ Seite geladen: Version {version}")
+            print(f"📊 Content-Größe: {len(content):,} Zeichen\n")
+
+        report = TableHealthScanner().scan_content(content)
+        METRICS.gauge('table.rows', report['data_rows'])
+        METRICS.gauge('table.issues', len(report['issues']))
+
+        if verbose:
+            print_health_report(report)
+
+        return report
+
+    except Exception as e:
+        print(f"❌ Fehler: {e}")
+        return None
+
+def check_page_set(page_set, verbose=True):
+    """
+    Status-Check mehrerer Seiten (parallel geladen und geprüft)
+
+    Returns:
+        Gesamt-Report {healthy, pages, data_rows, issues, reports: {page_id: Report}, errors}
+    """
+    from core.page_set import print_page_summary
+
+    def scan(page_id):
+        page = loaded.get(page_id) or page_set.pages.get(page_id)
+        report = TableHealthScanner().scan_content(page.content)
+        report['version'] = page.version
+        report['title'] = page.title
+        return report
+
+    if verbose:
+        print("🔍 RACOON Publikationen - Status-Check")
+        print("=" * 50)
+        print(f"📚 {len(page_set)} Seiten, {page_set.max_workers} parallel\n")
+
+    loaded = page_set.prefetch()
+    outcomes = page_set.map(scan)
+    reports = {o['page_id']: o['result'] for o in outcomes if o['error'] is None}
+    errors = {o['page_id']: o['error'] for o in outcomes if o['error']}
+
+    summary = {
+        'healthy': not errors and all(r['healthy'] for r in reports.values()),
+        'pages': len(page_set),
+        'data_rows': sum(r['data_rows'] for r in reports.values()),
+        'issues': sum(len(r['issues']) for r in reports.values()),
+        'reports': reports,
+        'errors': errors
+    }
+    METRICS.gauge('table.rows', summary['data_rows'])
+    METRICS.gauge('table.issues', summary['issues'])
+    for page_id, report in reports.items():
+        METRICS.gauge('table.rows', report['data_rows'], page_id=page_id)
+        METRICS.gauge('table.issues', len(report['issues']), page_id=page_id)
+
+    if verbose:
+        print_page_summary(outcomes, lambda r: (
+            f"v{r['version']} {r['data_rows']} Zeilen, {len(r['issues'])} Befunde"
+            f"{'' if r['healthy'] else ' ⚠️ blockierend'} - {r['title']}"
+        ))
+        print(f"\n📊 Gesamt: {summary['data_rows']} Zeilen, {summary['issues']} Befunde, "
+              f"{len(errors)} Fehler")
+        print("✅ Alle Tabellen in Ordnung" if summary['healthy'] else "❌ Blockierende Befunde oder Fehler")
+
+    return summary
+
+def check_live_pages(args, verbose=True):
+    """Status-Check der Seiten aus --page/--cql (eine Seite: ausführlicher Report)"""
+    from core.page_set import page_set_from_args
+
+    confluence_sso = connect()
+    if confluence_sso is None:
+        return None
+
+    try:
+        page_set = page_set_from_args(args, confluence_sso)
+        if len(page_set) > 1:
+            return check_page_set(page_set, verbose)
+
+        if verbose:
+            print("📖 Lade aktuelle Seite...")
+        page = page_set.pages.get(page_set.page_ids[0])
+    except Exception as e:
+        print(f"❌ Fehler: {e}")
+        return None
+    return check_table_status(page.content, page.version, verbose)
+
+def main():
+    """
+    Status-Check für Live-Seite oder lokale Datei
+
+    Exit-Code 1 bei blockierenden Befunden (TEST-/Leerzeilen, doppelte Nummern,
+    Spaltenfehler) - damit als pre-commit Guard nutzbar.
+    """
+    import argparse
+    from core.page_set import add_page_arguments
+
+    parser = argparse.ArgumentParser(description="RACOON Publikationstabelle prüfen")
+    parser.add_argument('--file', help="Storage-Format Datei (z.B. aus backups/) statt Live-Seite")
+    parser.add_argument('--json', action='store_true', help="Report als JSON ausgeben")
+    parser.add_argument('--strict', action='store_true', help="Auch Warnungen führen zu Exit-Code 1")
+    add_page_arguments(parser)
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+
+    # Mit --json gehört stdout allein dem Report - Meldungen und --metrics nach stderr
+    with redirect_stdout(sys.stderr) if args.json else nullcontext():
+        with profiling(args.profile, args.profile_output):
+            if args.file:
+                report = check_table_status(Path(args.file).read_text(encoding='utf-8'), verbose=not args.json)
+            else:
+                report = check_live_pages(args, verbose=not args.json)
+        finish_run(args, "Status-Check - Laufzeit-Report", tool='status',
+                   success=report['healthy'] if report else False)
+
+    if report is None:
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if not report['healthy'] or (args.strict and report['issues']):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()